@@ -0,0 +1,162 @@
+"""
+Checklist import of a generated 5000 activity xlsx sheet.
+    python -m benchmarks.checklistImport [--activities N] [--iterations N]
+Reads the PG_* settings like the lambdas do and imports its checklists into that
+database, use a scratch database with the tables created. The imported checklists
+are deleted again after every iteration.
+Reports the time to read and validate the sheet, the whole import and its
+statement count.
+"""
+import argparse
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from openpyxl import Workbook
+from sqlalchemy import event
+
+from tests.factories import createUser
+from microservices.checklists.services.checklistsService import Checklist
+from models.checklistModels import Activity as ActivityModel
+from models.checklistModels import Area as AreaModel
+from models.checklistModels import Checklist as ChecklistModel
+from models.checklistModels import Item as ItemModel
+from models.checklistModels import Subarea as SubareaModel
+from models.database.dbConnection import get_engine, session
+
+AREAS = 5
+SUBAREAS_PER_AREA = 4
+ITEMS_PER_SUBAREA = 5
+IMPORTANCES = ["MH", "MIMH", "GH"]
+
+
+def _writeSheet(file_path, activities, prefix):
+    """
+    Checklist sheet laid out like the reference one, node names are prefixed so
+    that every iteration imports names which do not exist yet
+    """
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet("Checklist")
+    worksheet.append(
+        [
+            "Area",
+            "Area Weightage",
+            "Sub-Areas",
+            "Subarea Weightage",
+            "Item",
+            "Item Weightage",
+            "Activity",
+            "Importance of priority",
+        ]
+    )
+    item_count = AREAS * SUBAREAS_PER_AREA * ITEMS_PER_SUBAREA
+    for index in range(activities):
+        item_index = index % item_count
+        area_index = item_index // (SUBAREAS_PER_AREA * ITEMS_PER_SUBAREA)
+        subarea_index = item_index // ITEMS_PER_SUBAREA
+        worksheet.append(
+            [
+                f"{prefix} Area {area_index}",
+                100 / AREAS,
+                f"{prefix} Subarea {subarea_index}",
+                100 / SUBAREAS_PER_AREA,
+                f"{prefix} Item {item_index}",
+                100 / ITEMS_PER_SUBAREA,
+                f"Activity {index}",
+                IMPORTANCES[index % len(IMPORTANCES)],
+            ]
+        )
+    workbook.save(file_path)
+
+
+def _deleteChecklist(checklist_id):
+    area_ids = session.query(AreaModel.id).filter(
+        AreaModel.checklist_id == checklist_id
+    )
+    subarea_ids = session.query(SubareaModel.id).filter(
+        SubareaModel.area_id.in_(area_ids)
+    )
+    item_ids = session.query(ItemModel.id).filter(
+        ItemModel.subarea_id.in_(subarea_ids)
+    )
+    session.query(ActivityModel).filter(ActivityModel.item_id.in_(item_ids)).delete(
+        synchronize_session=False
+    )
+    session.query(ItemModel).filter(ItemModel.id.in_(item_ids)).delete(
+        synchronize_session=False
+    )
+    session.query(SubareaModel).filter(SubareaModel.id.in_(subarea_ids)).delete(
+        synchronize_session=False
+    )
+    session.query(AreaModel).filter(AreaModel.id.in_(area_ids)).delete(
+        synchronize_session=False
+    )
+    session.query(ChecklistModel).filter(ChecklistModel.id == checklist_id).delete(
+        synchronize_session=False
+    )
+    session.commit()
+
+
+def _timeImport(file_path, admin_id):
+    checklist_object = Checklist()
+    started_at = time.perf_counter()
+    checklist_object._buildTree(checklist_object._readRows(str(file_path)))
+    read_time = time.perf_counter() - started_at
+
+    statements = []
+
+    def _record(connection, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(get_engine(), "before_cursor_execute", _record)
+    started_at = time.perf_counter()
+    try:
+        checklist = checklist_object.importChecklist(
+            file_path=str(file_path),
+            name=f"Benchmark {file_path.stem}",
+            authenticated_user_id=admin_id,
+            authenticated_user_roles=["Admin"],
+        )
+    finally:
+        event.remove(get_engine(), "before_cursor_execute", _record)
+    import_time = time.perf_counter() - started_at
+    return read_time, import_time, len(statements), checklist
+
+
+def runBenchmark(iterations, activities):
+    admin_id = createUser(name="Benchmark Admin")
+    read_timings, import_timings = [], []
+    with tempfile.TemporaryDirectory() as directory:
+        for _ in range(iterations):
+            prefix = uuid.uuid4().hex[:8]
+            file_path = Path(directory) / f"{prefix}.xlsx"
+            _writeSheet(file_path, activities, prefix)
+            read_time, import_time, statement_count, checklist = _timeImport(
+                file_path, admin_id
+            )
+            _deleteChecklist(checklist["id"])
+            read_timings.append(read_time)
+            import_timings.append(import_time)
+    print(
+        f"{checklist['activity_count']} activities, {checklist['item_count']} items,"
+        f" {iterations} iterations"
+    )
+    for name, timings in (
+        ("read and validate the sheet", read_timings),
+        ("whole import", import_timings),
+    ):
+        print(
+            f"{name:<30} median {statistics.median(timings) * 1000:8.2f} ms"
+            f"  max {max(timings) * 1000:8.2f} ms"
+        )
+    print(f"{statement_count} statements per import")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--activities", type=int, default=5000)
+    arguments = parser.parse_args()
+    runBenchmark(arguments.iterations, arguments.activities)
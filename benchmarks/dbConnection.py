@@ -0,0 +1,108 @@
+"""
+Cold start and per request connection cost of the database engine.
+    python -m benchmarks.dbConnection [--iterations N]
+Reads the PG_* settings like the lambdas do. The cold start compares the old
+import time setup (database_exists + engine + first query) with the lazy engine,
+the per request cost compares one session round trip on the old engine,
+the pooled lambda engine and the NullPool engine used behind RDS Proxy.
+"""
+import argparse
+import statistics
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from sqlalchemy_utils import database_exists
+
+from models.database.dbConnection import Database
+
+
+def _legacyColdStart(url):
+    if not database_exists(url):
+        raise SystemExit("Database does not exist, run the bootstrap command first")
+    engine = create_engine(url, pool_size=2, echo=False)
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    return engine
+
+
+def _lazyColdStart(database, url):
+    engine = database.get_engine(url)
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    return engine
+
+
+def _timeColdStart(iterations, cold_start):
+    timings = []
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        engine = cold_start()
+        timings.append(time.perf_counter() - started_at)
+        engine.dispose()
+    return timings
+
+
+def _timeRequests(engine, iterations):
+    # one request: check out a connection, run a query, give the connection back
+    session = Session(bind=engine)
+    session.execute(text("SELECT 1"))
+    session.close()
+    timings = []
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        session.execute(text("SELECT 1"))
+        session.close()
+        timings.append(time.perf_counter() - started_at)
+    engine.dispose()
+    return timings
+
+
+def _report(name, timings):
+    print(
+        f"{name:<40} median {statistics.median(timings) * 1000:8.2f} ms"
+        f"  max {max(timings) * 1000:8.2f} ms"
+    )
+
+
+def runBenchmark(iterations):
+    database = Database()
+    url = database.get_url_from_settings()
+
+    print(f"Cold start, {iterations} containers")
+    _report(
+        "database_exists + engine (before)",
+        _timeColdStart(iterations, lambda: _legacyColdStart(url)),
+    )
+    _report(
+        "lazy engine",
+        _timeColdStart(iterations, lambda: _lazyColdStart(database, url)),
+    )
+
+    print(f"Per request, {iterations * 10} requests on a warm container")
+    _report(
+        "pool_size=2 engine (before)",
+        _timeRequests(create_engine(url, pool_size=2), iterations * 10),
+    )
+    _report(
+        "pooled engine, pre ping",
+        _timeRequests(
+            create_engine(url, **database.get_engine_options()), iterations * 10
+        ),
+    )
+    options = database.get_engine_options()
+    options.pop("pool_size", None)
+    options.pop("max_overflow", None)
+    options["poolclass"] = NullPool
+    _report(
+        "NullPool engine (RDS Proxy)",
+        _timeRequests(create_engine(url, **options), iterations * 10),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20)
+    arguments = parser.parse_args()
+    runBenchmark(arguments.iterations)
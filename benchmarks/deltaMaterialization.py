@@ -0,0 +1,214 @@
+"""
+Response delta materialization of an assessment on a 1000 activity checklist.
+    python -m benchmarks.deltaMaterialization [--iterations N] [--activities N]
+Reads the PG_* settings like the lambdas do and inserts its checklist, project and
+assessments into that database, use a scratch database with the tables created.
+Compares the old Python comparison loop, which added the deltas one ORM object at
+a time, with the INSERT ... SELECT of _storeReviewerDelta and _storeManagerDelta,
+and checks that both store the same deltas.
+"""
+import argparse
+import enum
+import statistics
+import time
+from datetime import date
+
+from sqlalchemy import event
+
+from tests.factories import (
+    createAssessment,
+    createChecklist,
+    createProject,
+    createResponses,
+    createUser,
+    getActivityIds,
+    randomResponses,
+)
+from microservices.assessments.services.assessmentsService import Assessment
+from models.assessmentModels import Assessment as AssessmentModel
+from models.assessmentModels import (
+    AssessmentResponseDelta as AssessmentResponseDeltaModel,
+)
+from models.assessmentModels import Response as ResponseModel
+from models.database.dbConnection import get_engine, session
+
+
+def _getResponses(assessment_id, response_type):
+    responses = session.query(
+        ResponseModel.activity_id, ResponseModel.value, ResponseModel.comments
+    ).filter(
+        ResponseModel.assessment_id == str(assessment_id),
+        ResponseModel.type == response_type,
+    )
+    return {
+        response.activity_id: [response.value, response.comments]
+        for response in responses
+    }
+
+
+def _legacyStoreDelta(
+    assessment, previous_assessment, delta_type, stored, compared, compare_comments
+):
+    # the comparison loop before the INSERT ... SELECT
+    stored_responses = _getResponses(*stored)
+    compared_responses = _getResponses(*compared)
+    final_delta_list = []
+    for activity_id, compared_value in compared_responses.items():
+        if activity_id not in stored_responses:
+            continue
+        stored_value = stored_responses[activity_id]
+        if str(compared_value[0]) == str(stored_value[0]) and (
+            not compare_comments or compared_value[1] == stored_value[1]
+        ):
+            continue
+        delta_model = AssessmentResponseDeltaModel()
+        delta_model.previous_assessment_id = str(previous_assessment.id)
+        value = stored_value[0]
+        if isinstance(value, enum.Enum):
+            value = value.value
+        delta_model.previous_value = str(value)
+        delta_model.previous_comments = str(stored_value[1] or "")
+        delta_model.type = delta_type
+        delta_model.activity_id = str(activity_id)
+        delta_model.assessment_id = str(assessment.id)
+        delta_model.created_by = str(assessment.created_by)
+        final_delta_list.append(delta_model)
+    session.add_all(final_delta_list)
+    session.commit()
+
+
+def _legacyStoreDeltas(assessment, previous_assessment):
+    _legacyStoreDelta(
+        assessment,
+        previous_assessment,
+        "ReviewerDelta",
+        (previous_assessment.id, "ReviewerResponse"),
+        (previous_assessment.id, "ManagerResponse"),
+        compare_comments=False,
+    )
+    _legacyStoreDelta(
+        assessment,
+        previous_assessment,
+        "ManagerDelta",
+        (previous_assessment.id, "ManagerResponse"),
+        (assessment.id, "ManagerResponse"),
+        compare_comments=True,
+    )
+
+
+def _storeDeltas(assessment, previous_assessment):
+    assessment_object = Assessment()
+    assessment_object._storeReviewerDelta(assessment)
+    assessment_object._storeManagerDelta(assessment)
+
+
+def _getStoredDeltas(assessment_id):
+    deltas = session.query(
+        AssessmentResponseDeltaModel.activity_id,
+        AssessmentResponseDeltaModel.type,
+        AssessmentResponseDeltaModel.previous_value,
+        AssessmentResponseDeltaModel.previous_comments,
+    ).filter(AssessmentResponseDeltaModel.assessment_id == assessment_id)
+    return sorted(
+        (
+            str(delta.activity_id),
+            delta.type.value,
+            delta.previous_value,
+            delta.previous_comments,
+        )
+        for delta in deltas
+    )
+
+
+def _clearDeltas(assessment_id):
+    session.query(AssessmentResponseDeltaModel).filter(
+        AssessmentResponseDeltaModel.assessment_id == assessment_id
+    ).delete(synchronize_session=False)
+    session.commit()
+
+
+def _createAssessments(activities):
+    """
+    Reviewed assessment of the project and the in progress assessment after it,
+    both fully answered
+    Output: assessment id, previous assessment id
+    """
+    admin_id = createUser(name="Benchmark Admin")
+    checklist_id = createChecklist(
+        admin_id, areas=5, subareas=4, items=5, activities=activities // 100
+    )
+    project_id = createProject(admin_id)
+    activity_ids = getActivityIds(checklist_id)
+    previous_assessment_id = createAssessment(
+        project_id,
+        checklist_id,
+        admin_id,
+        status="Reviewed",
+        start_date=date(2024, 1, 1),
+    )
+    createResponses(
+        previous_assessment_id, admin_id, randomResponses(activity_ids, seed=1)
+    )
+    assessment_id = createAssessment(
+        project_id, checklist_id, admin_id, start_date=date(2024, 2, 1)
+    )
+    manager_responses = {
+        key: value
+        for key, value in randomResponses(activity_ids, seed=2).items()
+        if key[1] == "ManagerResponse"
+    }
+    createResponses(assessment_id, admin_id, manager_responses)
+    return assessment_id, previous_assessment_id
+
+
+def _timeDeltas(store_deltas, assessment_id, previous_assessment_id, iterations):
+    timings = []
+    statements = []
+
+    def _record(connection, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for _ in range(iterations):
+        _clearDeltas(assessment_id)
+        assessment = session.query(AssessmentModel).get(assessment_id)
+        previous_assessment = session.query(AssessmentModel).get(previous_assessment_id)
+        statements.clear()
+        event.listen(get_engine(), "before_cursor_execute", _record)
+        started_at = time.perf_counter()
+        store_deltas(assessment, previous_assessment)
+        timings.append(time.perf_counter() - started_at)
+        event.remove(get_engine(), "before_cursor_execute", _record)
+    return timings, len(statements), _getStoredDeltas(assessment_id)
+
+
+def _report(name, timings, statement_count):
+    print(
+        f"{name:<40} median {statistics.median(timings) * 1000:8.2f} ms"
+        f"  max {max(timings) * 1000:8.2f} ms  {statement_count} statements"
+    )
+
+
+def runBenchmark(iterations, activities):
+    assessment_id, previous_assessment_id = _createAssessments(activities)
+    print(f"Deltas of a {activities} activity checklist, {iterations} iterations")
+    legacy_timings, legacy_statement_count, legacy_deltas = _timeDeltas(
+        _legacyStoreDeltas, assessment_id, previous_assessment_id, iterations
+    )
+    _report(
+        "comparison loop + ORM objects (before)", legacy_timings, legacy_statement_count
+    )
+    timings, statement_count, deltas = _timeDeltas(
+        _storeDeltas, assessment_id, previous_assessment_id, iterations
+    )
+    _report("INSERT ... SELECT", timings, statement_count)
+    if deltas != legacy_deltas:
+        raise SystemExit("The stored deltas differ from the comparison loop")
+    print(f"{len(deltas)} deltas stored by both")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--activities", type=int, default=1000)
+    arguments = parser.parse_args()
+    runBenchmark(arguments.iterations, arguments.activities)
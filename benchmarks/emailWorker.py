@@ -0,0 +1,124 @@
+"""
+Email worker on a batch of queued emails, against an SES stub with a fixed latency.
+    python -m benchmarks.emailWorker [--records N] [--latency-ms N]
+Nothing is sent and no database is needed, the users are looked up in memory.
+Compares the old worker, which sent one email per record, with the grouped Bcc
+emails of sendEmailToUser, with every address accepted and with one address
+rejected by SES, which sends the emails of that chunk one recipient at a time.
+"""
+import argparse
+import json
+import os
+import time
+
+from botocore.exceptions import ClientError
+
+from microservices.email.services import emailService
+
+
+class SesStub:
+    """
+    SES send_email with a fixed latency per call, emails to a rejected address
+    are refused as a whole
+    """
+
+    def __init__(self, latency, rejected_addresses=()):
+        self.latency = latency
+        self.rejected_addresses = set(rejected_addresses)
+        self.call_count = 0
+
+    def send_email(self, Destination, Message, Source):
+        self.call_count += 1
+        time.sleep(self.latency)
+        addresses = Destination.get("ToAddresses", []) + Destination.get(
+            "BccAddresses", []
+        )
+        if self.rejected_addresses & set(addresses):
+            raise ClientError(
+                {"Error": {"Code": "MessageRejected", "Message": "Not verified"}},
+                "SendEmail",
+            )
+        return {"MessageId": f"message-{self.call_count}"}
+
+
+def _getUsernames(user_ids):
+    return {user_id: f"{user_id}@example.com" for user_id in user_ids}
+
+
+def _legacySendEmailToUser(**kwargs):
+    # the worker before the grouped emails, one lookup and one email per record
+    batch_item_failures = []
+    for record in kwargs.get("event_data"):
+        body_dict = json.loads(record['body'])
+        username = _getUsernames([body_dict['user_id']])[body_dict['user_id']]
+        message_id = emailService.sendEmail(
+            os.getenv("NOTIFICATION_MAIL_SENDER"),
+            username,
+            body_dict['message'],
+            body_dict['description'],
+        )
+        if message_id is None:
+            batch_item_failures.append({"itemIdentifier": record['messageId']})
+    return {"batchItemFailures": batch_item_failures}
+
+
+def _records(count):
+    # an assessment notification sent to every user of the batch
+    return [
+        {
+            "messageId": f"m{index}",
+            "body": json.dumps(
+                {
+                    "user_id": f"user-{index}",
+                    "message": "Assessment reviewed",
+                    "description": "The assessment was reviewed",
+                }
+            ),
+        }
+        for index in range(count)
+    ]
+
+
+def _timeWorker(send_email_to_user, records, ses_stub):
+    emailService._ses_client = ses_stub
+    started_at = time.perf_counter()
+    response = send_email_to_user(event_data=records)
+    elapsed = time.perf_counter() - started_at
+    return elapsed, ses_stub.call_count, len(response["batchItemFailures"])
+
+
+def _report(name, elapsed, call_count, failure_count):
+    print(
+        f"{name:<44} {elapsed * 1000:9.2f} ms  {call_count:4} SES calls"
+        f"  {failure_count} redelivered"
+    )
+
+
+def runBenchmark(record_count, latency):
+    records = _records(record_count)
+    rejected_addresses = {"user-7@example.com"}
+    print(f"{record_count} queued emails, SES latency {latency * 1000:.0f} ms")
+    emailService._getUsernames = _getUsernames
+    try:
+        for name, send_email_to_user, rejected in (
+            ("one email per record (before)", _legacySendEmailToUser, ()),
+            ("one email per record, 1 rejected (before)", _legacySendEmailToUser,
+             rejected_addresses),
+            ("grouped Bcc emails", emailService.sendEmailToUser, ()),
+            ("grouped Bcc emails, 1 rejected", emailService.sendEmailToUser,
+             rejected_addresses),
+        ):
+            _report(
+                name,
+                *_timeWorker(send_email_to_user, records, SesStub(latency, rejected)),
+            )
+    finally:
+        emailService._ses_client = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    arguments = parser.parse_args()
+    runBenchmark(arguments.records, arguments.latency_ms / 1000)
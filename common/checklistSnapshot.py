@@ -0,0 +1,280 @@
+import json
+import os
+import tempfile
+from collections import OrderedDict, namedtuple
+
+from models.checklistModels import Activity as ActivityModel
+from models.checklistModels import Area as AreaModel
+from models.checklistModels import Checklist as ChecklistModel
+from models.checklistModels import Item as ItemModel
+from models.checklistModels import Subarea as SubareaModel
+from models.database.dbConnection import session
+
+CHECKLIST_SNAPSHOT_CACHE_SIZE = int(os.getenv("CHECKLIST_SNAPSHOT_CACHE_SIZE", 8))
+CHECKLIST_SNAPSHOT_DIR = os.getenv("CHECKLIST_SNAPSHOT_DIR", tempfile.gettempdir())
+
+# one node of the area -> subarea -> item -> activity tree.
+# data is the as_dict() of the row, weightages are floats and
+# importance is the activity importance name, parsed once at build time
+ChecklistNode = namedtuple(
+    "ChecklistNode",
+    [
+        "id",
+        "type",
+        "parent_id",
+        "name",
+        "weightage",
+        "effective_weightage",
+        "importance",
+        "data",
+    ],
+)
+
+# per container LRU of checklist_id -> ChecklistSnapshot
+_snapshot_cache = OrderedDict()
+
+
+def _toFloat(value):
+    return None if value is None else float(value)
+
+
+def _toNodeId(node_id):
+    # ids are stored as lower case uuid strings, callers may pass UUIDs or upper case
+    return str(node_id).lower()
+
+
+class ChecklistSnapshot:
+    """
+    Read only in-memory tree of a checklist with id -> node and
+    parent -> children indexes.
+    """
+
+    def __init__(self, checklist_id, version, nodes):
+        self.checklist_id = checklist_id
+        self.version = version
+        self.nodes = {}
+        self.children = {}
+        self.areas = []
+        for node in nodes:
+            node = ChecklistNode(**node)
+            self.nodes[node.id] = node
+            if node.type == "area":
+                self.areas.append(node)
+            else:
+                self.children.setdefault(node.parent_id, []).append(node)
+
+    def getNode(self, node_type, node_id):
+        """
+        Input: node type (area, subarea, item, activity) and id
+        Output: ChecklistNode or None when the id is not part of the checklist
+        """
+        node = self.nodes.get(_toNodeId(node_id))
+        if node is None or not node.type == node_type:
+            return None
+        return node
+
+    def getChildren(self, node_id):
+        return self.children.get(_toNodeId(node_id), [])
+
+    def getAreas(self):
+        return self.areas
+
+    def getSubareas(self):
+        return [
+            subarea for area in self.areas for subarea in self.getChildren(area.id)
+        ]
+
+    def getItems(self):
+        return [
+            item
+            for subarea in self.getSubareas()
+            for item in self.getChildren(subarea.id)
+        ]
+
+    def getActivitiesByItem(self):
+        return {item.id: self.getChildren(item.id) for item in self.getItems()}
+
+    def getAncestorId(self, node_id, node_type):
+        """
+        Walks up the tree from a node (e.g. activity) to its ancestor of the given type
+        Output: ancestor id or None when the node is not part of the checklist
+        """
+        node = self.nodes.get(_toNodeId(node_id))
+        while node is not None and not node.type == node_type:
+            node = self.nodes.get(node.parent_id)
+        return None if node is None else node.id
+
+    def rollUpCounts(self, counts, node_type):
+        """
+        Sums counts keyed by descendant id (e.g. activity id) per ancestor
+        Input: dict {node_id: count}, ancestor node type
+        Output: dict {ancestor_id: count}
+        """
+        rolled_up_counts = {}
+        for node_id, count in counts.items():
+            ancestor_id = self.getAncestorId(node_id, node_type)
+            if ancestor_id is not None:
+                rolled_up_counts[ancestor_id] = (
+                    rolled_up_counts.get(ancestor_id, 0) + count
+                )
+        return rolled_up_counts
+
+
+def _getChecklistVersion(checklist_id):
+    checklist = (
+        session.query(ChecklistModel.status, ChecklistModel.modified_on)
+        .filter(ChecklistModel.id == str(checklist_id))
+        .first()
+    )
+    if checklist is None:
+        return None
+    status = None if checklist.status is None else checklist.status.value
+    modified_on = (
+        None if checklist.modified_on is None else checklist.modified_on.isoformat()
+    )
+    return [status, modified_on]
+
+
+def _buildNodes(checklist_id):
+    nodes = []
+    areas = session.query(AreaModel).filter(
+        AreaModel.checklist_id == str(checklist_id)
+    )
+    for area in areas:
+        nodes.append(
+            {
+                "id": str(area.id),
+                "type": "area",
+                "parent_id": str(checklist_id),
+                "name": area.name,
+                "weightage": _toFloat(area.weightage),
+                "effective_weightage": None,
+                "importance": None,
+                "data": area.as_dict(),
+            }
+        )
+
+    subareas = (
+        session.query(SubareaModel)
+        .join(AreaModel, AreaModel.id == SubareaModel.area_id)
+        .filter(AreaModel.checklist_id == str(checklist_id))
+    )
+    for subarea in subareas:
+        nodes.append(
+            {
+                "id": str(subarea.id),
+                "type": "subarea",
+                "parent_id": str(subarea.area_id),
+                "name": subarea.name,
+                "weightage": _toFloat(subarea.weightage),
+                "effective_weightage": None,
+                "importance": None,
+                "data": subarea.as_dict(),
+            }
+        )
+
+    items = (
+        session.query(ItemModel)
+        .join(SubareaModel, SubareaModel.id == ItemModel.subarea_id)
+        .join(AreaModel, AreaModel.id == SubareaModel.area_id)
+        .filter(AreaModel.checklist_id == str(checklist_id))
+    )
+    for item in items:
+        nodes.append(
+            {
+                "id": str(item.id),
+                "type": "item",
+                "parent_id": str(item.subarea_id),
+                "name": item.name,
+                "weightage": _toFloat(item.weightage),
+                "effective_weightage": _toFloat(item.effective_weightage),
+                "importance": None,
+                "data": item.as_dict(),
+            }
+        )
+
+    activities = (
+        session.query(ActivityModel)
+        .join(ItemModel, ItemModel.id == ActivityModel.item_id)
+        .join(SubareaModel, SubareaModel.id == ItemModel.subarea_id)
+        .join(AreaModel, AreaModel.id == SubareaModel.area_id)
+        .filter(AreaModel.checklist_id == str(checklist_id))
+    )
+    for activity in activities:
+        nodes.append(
+            {
+                "id": str(activity.id),
+                "type": "activity",
+                "parent_id": str(activity.item_id),
+                "name": activity.name,
+                "weightage": None,
+                "effective_weightage": None,
+                "importance": None
+                if activity.importance is None
+                else activity.importance.name,
+                "data": activity.as_dict(),
+            }
+        )
+    return nodes
+
+
+def _getSnapshotPath(checklist_id):
+    return os.path.join(
+        CHECKLIST_SNAPSHOT_DIR, f"checklist_snapshot_{checklist_id}.json"
+    )
+
+
+def _readSnapshotFile(checklist_id, version):
+    try:
+        with open(_getSnapshotPath(checklist_id)) as snapshot_file:
+            snapshot = json.load(snapshot_file)
+    except (OSError, ValueError):
+        return None
+    if not snapshot.get("version") == version:
+        return None
+    return ChecklistSnapshot(checklist_id, version, snapshot.get("nodes"))
+
+
+def _writeSnapshotFile(checklist_id, version, nodes):
+    # written to a temporary file first so that a half written snapshot is never read
+    snapshot_path = _getSnapshotPath(checklist_id)
+    try:
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=CHECKLIST_SNAPSHOT_DIR)
+        with os.fdopen(file_descriptor, "w") as snapshot_file:
+            json.dump({"version": version, "nodes": nodes}, snapshot_file)
+        os.replace(temporary_path, snapshot_path)
+    except OSError as ex:
+        print("Error writing checklist snapshot", ex)
+
+
+def _cacheSnapshot(checklist_id, snapshot):
+    _snapshot_cache[checklist_id] = snapshot
+    _snapshot_cache.move_to_end(checklist_id)
+    while len(_snapshot_cache) > CHECKLIST_SNAPSHOT_CACHE_SIZE:
+        _snapshot_cache.popitem(last=False)
+
+
+def getChecklistSnapshot(checklist_id):
+    """
+    Snapshot of the checklist tree, built once per checklist version
+    (status, modified_on) and reused from memory or /tmp on warm invocations.
+    Input: checklist_id
+    Output: ChecklistSnapshot or None when the checklist does not exist
+    """
+    checklist_id = _toNodeId(checklist_id)
+    version = _getChecklistVersion(checklist_id)
+    if version is None:
+        return None
+
+    snapshot = _snapshot_cache.get(checklist_id)
+    if snapshot is not None and snapshot.version == version:
+        _snapshot_cache.move_to_end(checklist_id)
+        return snapshot
+
+    snapshot = _readSnapshotFile(checklist_id, version)
+    if snapshot is None:
+        nodes = _buildNodes(checklist_id)
+        _writeSnapshotFile(checklist_id, version, nodes)
+        snapshot = ChecklistSnapshot(checklist_id, version, nodes)
+    _cacheSnapshot(checklist_id, snapshot)
+    return snapshot
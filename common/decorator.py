@@ -1,9 +1,16 @@
+import os
+import time
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
 from models.accessControlModels import (
     FunctionDescription as FunctionDescriptionModel,
 )
 from models.database.dbConnection import session
 from models.roleModels import Role as RoleModel
 from models.rolePolicyModels import RolePolicy as RolePolicyModel
+from models.userModels import User as UserModel
 
 from common.customExceptions import *
 
@@ -34,50 +41,187 @@ from common.customExceptions import *
 # _addPolicy()
 
 
-def _getRoleByName(name):
+POLICY_CACHE_TTL = int(os.getenv("POLICY_CACHE_TTL", 300))
+
+# policy decision cache, lives as long as the warm lambda container
+_policy_cache = {
+    "version": None,
+    "expires_at": 0,
+    "roles": {},
+    "functions": {},
+    "policies": set(),
+}
+
+
+def _getPolicyVersion():
+    """
+    Cheap fingerprint of the access control tables, used to find out whether
+    roles, policies or function descriptions were changed by another container
+    since the last load.
+    """
     try:
-        role = session.query(RoleModel).filter(RoleModel.name == name).first()
+        policy_version = session.query(
+            func.count(RolePolicyModel.id),
+            func.max(RolePolicyModel.created_on),
+            func.max(RolePolicyModel.modified_on),
+        ).one()
+        role_version = session.query(
+            func.count(RoleModel.id),
+            func.max(RoleModel.created_on),
+            func.max(RoleModel.modified_on),
+        ).one()
+        # function descriptions have no timestamps, the rows are hashed instead,
+        # new ones come from migrations and the access control script
+        function_version = session.query(
+            func.md5(
+                func.string_agg(
+                    func.concat(
+                        FunctionDescriptionModel.name,
+                        ":",
+                        FunctionDescriptionModel.resource,
+                        ":",
+                        FunctionDescriptionModel.action,
+                    ),
+                    aggregate_order_by(",", FunctionDescriptionModel.name),
+                )
+            )
+        ).scalar()
     except Exception:
         return None
     finally:
         session.close()
-    return role
+    return tuple(policy_version) + tuple(role_version) + (function_version,)
 
 
-def _getResourceAndAction(function_name):
-
+def _loadPolicyCache(version):
     try:
-        function_description = (
-            session.query(FunctionDescriptionModel)
-            .filter(FunctionDescriptionModel.name == function_name)
-            .first()
-        )
-    except Exception:
-        return None
+        roles = session.query(RoleModel.id, RoleModel.name).all()
+        function_descriptions = session.query(
+            FunctionDescriptionModel.name,
+            FunctionDescriptionModel.resource,
+            FunctionDescriptionModel.action,
+        ).all()
+        policies = session.query(
+            RolePolicyModel.role_id,
+            RolePolicyModel.resource,
+            RolePolicyModel.action,
+        ).all()
     finally:
         session.close()
-    resource = function_description.resource.name
-    action = function_description.action.name
-    return resource, action
 
+    _policy_cache["roles"] = {role.name: str(role.id) for role in roles}
+    _policy_cache["functions"] = {
+        function_description.name: (
+            function_description.resource.name,
+            function_description.action.name,
+        )
+        for function_description in function_descriptions
+        if function_description.resource and function_description.action
+    }
+    _policy_cache["policies"] = {
+        (str(policy.role_id), policy.resource.name, policy.action.name)
+        for policy in policies
+        if policy.resource and policy.action
+    }
+    _policy_cache["version"] = version
 
-def _getRolePolicy(role_id, resource, action):
-    try:
 
-        policy = (
-            session.query(RolePolicyModel)
-            .filter(
-                RolePolicyModel.role_id == str(role_id),
-                RolePolicyModel.action == action,
-                RolePolicyModel.resource == resource,
-            )
+def invalidatePolicyCache():
+    """
+    Drop the cached roles and policies, next authorization check reloads them.
+    To be called after any change to roles or role policies.
+    """
+    _policy_cache["version"] = None
+    _policy_cache["expires_at"] = 0
+
+
+def _getPolicyCache():
+    if time.monotonic() < _policy_cache["expires_at"]:
+        return _policy_cache
+
+    version = _getPolicyVersion()
+    if _policy_cache["version"] is None or version != _policy_cache["version"]:
+        _loadPolicyCache(version)
+    _policy_cache["expires_at"] = time.monotonic() + POLICY_CACHE_TTL
+    return _policy_cache
+
+
+def _hasPolicy(policy_cache, role_id, resource, action):
+    policies = policy_cache["policies"]
+    return (
+        (role_id, resource, action) in policies
+        or (role_id, "All", action) in policies
+        or (role_id, resource, "All") in policies
+        or (role_id, "All", "All") in policies
+    )
+
+
+def resolvePermissionContext(user_id, role_names):
+    """
+    Resolves the user and the permissions of the user's role in the authorizer,
+    the downstream handlers get them through the authorizer context.
+    Input: user id (cognito sub), list of cognito group names
+    Output: dict of authorizer context entries, empty when the user is not found
+    """
+    try:
+        user = (
+            session.query(UserModel.id, UserModel.status)
+            .filter(UserModel.id == str(user_id))
             .first()
         )
-    except Exception:
-        return None
     finally:
         session.close()
-    return policy
+    if user is None:
+        return {}
+
+    policy_cache = _getPolicyCache()
+    # like the database checks of decor, only the first role of the user counts
+    role_ids = []
+    if role_names and role_names[0] is not None:
+        role_id = policy_cache["roles"].get(role_names[0].replace("_", " "))
+        if role_id is not None:
+            role_ids.append(role_id)
+    permissions = sorted(
+        {
+            f"{resource}:{action}"
+            for role_id, resource, action in policy_cache["policies"]
+            if role_id in role_ids
+        }
+    )
+    return {
+        "tenet:user_id": str(user.id),
+        "tenet:user_status": None if user.status is None else user.status.name,
+        "tenet:role_ids": role_ids,
+        "tenet:permissions": permissions,
+    }
+
+
+def getPermissionContext(event):
+    """
+    Input: API Gateway event
+    Output: dict of the kwargs resolved by the authorizer, empty when they were not resolved
+    """
+    authorizer_context = (
+        (event.get("requestContext") or {}).get("authorizer", {}).get("lambda", {})
+    )
+    if not authorizer_context.get("tenet:user_id"):
+        return {}
+    return {
+        "authenticated_user_status": authorizer_context.get("tenet:user_status"),
+        "authenticated_user_role_ids": authorizer_context.get("tenet:role_ids") or [],
+        # kept a list, some services forward their kwargs as json
+        "authenticated_user_permissions": authorizer_context.get("tenet:permissions")
+        or [],
+    }
+
+
+def _hasPermission(permissions, resource, action):
+    return (
+        f"{resource}:{action}" in permissions
+        or f"All:{action}" in permissions
+        or f"{resource}:All" in permissions
+        or "All:All" in permissions
+    )
 
 
 def decor(func):
@@ -86,44 +230,42 @@ def decor(func):
             raise AnyExceptionHandler("Authenticated User Role needed!")
         authenticated_user_roles = kwargs.get("authenticated_user_roles")
         # authenticated_user_roles = ["Project_Manager"]
+        permissions = kwargs.get("authenticated_user_permissions")
+        if "Admin" not in authenticated_user_roles and permissions is not None:
+            # permissions were resolved by the authorizer, trusted as they are,
+            # same outcome as the database checks below
+            if not kwargs.get("authenticated_user_role_ids"):
+                raise AnyExceptionHandler("Role not found")
+            functions = _getPolicyCache()["functions"]
+            if func.__name__ not in functions:
+                raise AnyExceptionHandler("Unauthorized access! - No policy found")
+            resource, action = functions[func.__name__]
+            if _hasPermission(permissions, resource, action):
+                return func(self, **kwargs)
+            raise AnyExceptionHandler("Unauthorized access! - No policy found")
         if "Admin" not in authenticated_user_roles:
-            flag = 0
+            policy_cache = _getPolicyCache()
             for role in authenticated_user_roles:
-                # print(f"id: {role.id}, role: {role_name}")
                 if role is not None:
                     role_name = role.replace("_", " ")
-                    role = _getRoleByName(role_name)
-                    resource, action = _getResourceAndAction(func.__name__)
-                    # print("resource", resource, "action", action)
-                    policy = _getRolePolicy(role.id, resource, action)
+                    role_id = policy_cache["roles"].get(role_name)
+                    if role_id is None:
+                        raise AnyExceptionHandler("Role not found")
+                    if func.__name__ not in policy_cache["functions"]:
+                        raise AnyExceptionHandler(
+                            "Unauthorized access! - No policy found"
+                        )
+                    resource, action = policy_cache["functions"][func.__name__]
 
-                    if policy is not None:
-                        flag = 1
+                    if _hasPolicy(policy_cache, role_id, resource, action):
                         return func(self, **kwargs)
-
                     else:
-                        policy = _getRolePolicy(role.id, "All", action)
-                        if policy is not None:
-                            flag = 1
-                            return func(self, **kwargs)
-                        else:
-                            policy = _getRolePolicy(role.id, resource, "All")
-                            if policy is not None:
-                                flag = 1
-                                return func(self, **kwargs)
-                            else:
-                                policy = _getRolePolicy(role.id, "All", "All")
-                                if policy is not None:
-                                    flag = 1
-                                    return func(self, **kwargs)
-                                else:
-                                    raise AnyExceptionHandler(
-                                        "Unauthorized access! - No policy found"
-                                    )
+                        raise AnyExceptionHandler(
+                            "Unauthorized access! - No policy found"
+                        )
                 else:
                     raise AnyExceptionHandler("Role not found")
-            if flag == 0:
-                raise AnyExceptionHandler("Unauthorized access!")
+            raise AnyExceptionHandler("Unauthorized access!")
         else:
             return func(self, **kwargs)
 
@@ -0,0 +1,118 @@
+import base64
+import csv
+import json
+import os
+import tempfile
+import uuid
+
+import boto3
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+
+EXPORT_CONTENT_TYPES = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+}
+
+# API Gateway rejects response payloads above 6 MB, base64 grows the file by 4/3
+INLINE_EXPORT_MAX_BYTES = int(os.getenv("INLINE_EXPORT_MAX_BYTES", 4 * 1024 * 1024))
+EXPORT_URL_EXPIRY = int(os.getenv("EXPORT_URL_EXPIRY", 900))
+
+
+class ExportBuilder:
+    """
+    Streams rows of a list endpoint into a xlsx (write-only workbook) or csv
+    file on the lambda's /tmp instead of building it in memory.
+    Small files are returned inline as base64, bigger ones are uploaded to the
+    export bucket and returned as a presigned URL.
+    """
+
+    def __init__(self, file_name, headers, file_format="xlsx", **kwargs):
+        if file_format not in EXPORT_CONTENT_TYPES:
+            raise ValueError(f"Unsupported export format {file_format}")
+        self.file_name = f"{file_name}.{file_format}"
+        self.file_format = file_format
+        self.headers = headers
+        self.sheet_title = kwargs.get("sheet_title")
+        self.column_width = kwargs.get("column_width")
+
+    def _writeXlsx(self, file_path, rows):
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet(title=self.sheet_title)
+        if self.column_width:
+            for column in range(len(self.headers)):
+                column_letter = get_column_letter(column + 1)
+                worksheet.column_dimensions[column_letter].width = self.column_width
+        worksheet.append(self.headers)
+        for row in rows:
+            worksheet.append(row)
+        workbook.save(file_path)
+
+    def _writeCsv(self, file_path, rows):
+        with open(file_path, "w", newline="") as export_file:
+            writer = csv.writer(export_file)
+            writer.writerow(self.headers)
+            for row in rows:
+                writer.writerow(["" if value is None else value for value in row])
+
+    def _uploadExport(self, file_path):
+        bucket = os.getenv("EXPORT_BUCKET_NAME")
+        if not bucket:
+            raise Exception("Export bucket not configured")
+        key = f"exports/{uuid.uuid4()}/{self.file_name}"
+        client = boto3.client("s3")
+        client.upload_file(
+            file_path,
+            bucket,
+            key,
+            ExtraArgs={"ContentType": EXPORT_CONTENT_TYPES[self.file_format]},
+        )
+        url = client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": bucket,
+                "Key": key,
+                "ResponseContentDisposition": f"attachment; filename={self.file_name}",
+            },
+            ExpiresIn=EXPORT_URL_EXPIRY,
+        )
+        return url
+
+    def buildResponse(self, rows):
+        """
+        Write the rows to the export file and build the lambda response
+        Input: iterable of row tuples (a generator keeps memory flat)
+        Output: dict lambda response with the file inline or a presigned URL
+        """
+        file_descriptor, file_path = tempfile.mkstemp(suffix=f".{self.file_format}")
+        os.close(file_descriptor)
+        try:
+            if self.file_format == "xlsx":
+                self._writeXlsx(file_path, rows)
+            else:
+                self._writeCsv(file_path, rows)
+
+            if os.path.getsize(file_path) <= INLINE_EXPORT_MAX_BYTES:
+                with open(file_path, "rb") as export_file:
+                    body = base64.b64encode(export_file.read())
+                return {
+                    "statusCode": 200,
+                    "body": body.decode("utf-8"),
+                    "headers": {
+                        "Content-Type": EXPORT_CONTENT_TYPES[self.file_format],
+                        "Content-Disposition": f"attachment; filename={self.file_name}",
+                    },
+                    "isBase64Encoded": True,
+                }
+
+            url = self._uploadExport(file_path)
+            return {
+                "statusCode": 303,
+                "body": json.dumps({"data": {"url": url}}),
+                "headers": {
+                    "Content-Type": "application/json",
+                    "Location": url,
+                },
+            }
+        finally:
+            os.remove(file_path)
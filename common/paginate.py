@@ -1,6 +1,10 @@
+import base64
+import enum
+import json
+
 from common.customExceptions import *
 from sqlalchemy.sql import text
-from sqlalchemy import exc, desc, inspect
+from sqlalchemy import exc, desc, inspect, and_, or_
 
 
 
@@ -20,6 +24,11 @@ class Paginate:
     __total_pages = 0
     __prev_page = None
     __next_page = None
+    __after = None
+    __cursor = None
+    __next_cursor = None
+    __sort_column = None
+    __primary_key_column = None
 
 
     def __init__(self, ModelClass, **kwargs):
@@ -37,6 +46,20 @@ class Paginate:
         self.__sort_key = kwargs.get('sort_key') if kwargs.get('sort_key') else None
         self.__sort_order = kwargs.get('sort_order') if kwargs.get('sort_order') else None
         self.__sort_key_order = self.__getSortKeyOrder(ModelClass)
+        # lists without a valid sort key are sorted by their default sort key, if any
+        if self.__sort_key_order is None and kwargs.get('default_sort_key'):
+            self.__sort_key = kwargs.get('default_sort_key')
+            self.__sort_order = kwargs.get('default_sort_order')
+            self.__sort_key_order = self.__getSortKeyOrder(ModelClass)
+
+        # keyset (cursor) pagination, enabled when an after token is passed
+        # empty after token -> first page
+        self.__after = kwargs.get('after')
+        self.__cursor = self.__decodeCursor(self.__after)
+        self.__primary_key_column = inspect(ModelClass).primary_key[0]
+        self.__sort_column = (
+            getattr(ModelClass, self.__sort_key) if self.__sort_key_order is not None else None
+        )
 
     def __getPageSize(self,input_page_size):
         # if no pageSize set then set default page size 8
@@ -108,6 +131,122 @@ class Paginate:
         return prev_page
 
 
+    def __decodeCursor(self, after):
+        if not after:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(after.encode()).decode())
+            if not isinstance(cursor, list) or len(cursor) != 2:
+                raise ValueError(after)
+        except Exception:
+            raise IncorrectFormat("after")
+        return cursor
+
+    def __encodeCursorValue(self, value):
+        if value is None:
+            return None
+        # enum columns bind and compare by member name, not by value
+        if isinstance(value, enum.Enum):
+            return value.name
+        return str(value)
+
+    def __encodeCursor(self, row):
+        sort_value = None
+        if self.__sort_column is not None:
+            sort_value = self.__encodeCursorValue(getattr(row, self.__sort_key))
+        primary_key_value = self.__encodeCursorValue(
+            getattr(row, self.__primary_key_column.key)
+        )
+        cursor = json.dumps([sort_value, primary_key_value])
+        return base64.urlsafe_b64encode(cursor.encode()).decode()
+
+    def __getKeysetFilter(self):
+        sort_value, primary_key_value = self.__cursor
+        primary_key = self.__primary_key_column
+        sort_column = self.__sort_column
+        descending = self.__sort_order == 'desc'
+        if sort_column is None:
+            if descending:
+                return primary_key < primary_key_value
+            return primary_key > primary_key_value
+
+        # postgres sorts NULLs last for asc and first for desc
+        if descending:
+            if sort_value is None:
+                return or_(
+                    and_(sort_column == None, primary_key < primary_key_value),
+                    sort_column != None,
+                )
+            return or_(
+                sort_column < sort_value,
+                and_(sort_column == sort_value, primary_key < primary_key_value),
+            )
+        if sort_value is None:
+            return and_(sort_column == None, primary_key > primary_key_value)
+        return or_(
+            sort_column > sort_value,
+            and_(sort_column == sort_value, primary_key > primary_key_value),
+            sort_column == None,
+        )
+
+    def _isKeysetMode(self) -> bool:
+        return self.__after is not None
+
+    def _getOrderBy(self) -> list:
+        """
+        Sort of the list, tie-broken by the primary key in the same direction.
+        Both pagination modes use it, so that they list the rows in the same order.
+        Output: List [] of order by clauses
+        """
+        primary_key = self.__primary_key_column
+        descending = self.__sort_order == 'desc'
+        order_by = []
+        if self.__sort_column is not None:
+            order_by.append(desc(self.__sort_column) if descending else self.__sort_column)
+        order_by.append(desc(primary_key) if descending else primary_key)
+        return order_by
+
+    def _getKeysetPage(self, query) -> list:
+        """
+        Fetch one page using the after token instead of OFFSET, so that deep
+        pages cost the same as the first one. Sets the nextCursor attribute.
+        Input: filtered query over the ModelClass
+        Output: List [] of rows of the page
+        """
+        query = query.order_by(*self._getOrderBy())
+        if self.__cursor is not None:
+            query = query.filter(self.__getKeysetFilter())
+
+        if not self.__page_size:
+            rows = query.all()
+        else:
+            # one extra row tells if there is a next page
+            rows = query.limit(self.__page_size + 1).all()
+
+        self.__next_cursor = None
+        if self.__page_size and len(rows) > self.__page_size:
+            rows = rows[:self.__page_size]
+            self.__next_cursor = self.__encodeCursor(rows[-1])
+        return rows
+
+    @staticmethod
+    def _getEstimatedCount(session, ModelClass) -> int:
+        """
+        Planner estimate of the number of rows in the table of ModelClass,
+        a cheap replacement of count() for unfiltered lists
+        """
+        try:
+            estimate = session.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table_name AS regclass)"),
+                {"table_name": ModelClass.__tablename__},
+            ).scalar()
+        except exc.SQLAlchemyError:
+            session.rollback()
+            return None
+        if estimate is None or estimate < 0:
+            return None
+        return estimate
+
     def _getPaginationSetting(self) -> dict:
         current_pagination_setting = {}
         current_pagination_setting['page_size'] = self.__page_size
@@ -120,6 +259,7 @@ class Paginate:
         current_pagination_setting['sort_key'] = self.__sort_key
         current_pagination_setting['sort_order'] = self.__sort_order
         current_pagination_setting['sort_key_order'] = self.__sort_key_order
+        current_pagination_setting['after'] = self.__after
 
         return current_pagination_setting
 
@@ -133,5 +273,7 @@ class Paginate:
         response_attributes['totalPages'] = self.__total_pages
         response_attributes['prevPage'] = self.__prev_page
         response_attributes['nextPage'] = self.__next_page
+        if self._isKeysetMode():
+            response_attributes['nextCursor'] = self.__next_cursor
 
         return response_attributes
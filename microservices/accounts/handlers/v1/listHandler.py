@@ -3,9 +3,12 @@ import os
 
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
 from microservices.accounts.services.accountsService import Account
+from models.database.dbConnection import release_session
 
 
+@release_session
 def listHandler(event, context):
 
     try:
@@ -59,6 +62,7 @@ def _checkAndCreateFunctionParametersDictionary(event):
     # print("authenticated_user_roles", authenticated_user_roles)
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
 
     # filters
     kwargs["domain_id"] = domain_id
@@ -1,8 +1,11 @@
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
 from microservices.accounts.services.accountsService import Account
+from models.database.dbConnection import release_session
 
 
+@release_session
 def readHandler(event, context):
 
     try:
@@ -38,4 +41,5 @@ def _checkAndCreateFunctionParametersDictionary(event):
     kwargs["account_id"] = account_id
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
     return kwargs
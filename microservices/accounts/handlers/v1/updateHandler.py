@@ -2,9 +2,12 @@ import json
 
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
 from microservices.accounts.services.accountsService import Account
+from models.database.dbConnection import release_session
 
 
+@release_session
 def updateHandler(event, context):
     try:
         account = Account()
@@ -63,4 +66,5 @@ def _checkAndCreateFunctionParametersDictionary(event):
     kwargs["created_by"] = created_by
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
     return kwargs
@@ -2,9 +2,12 @@ import json
 
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
 from microservices.activities.services.activitiesService import Activity
+from models.database.dbConnection import release_session
 
 
+@release_session
 def listHandler(event, context):
 
     try:
@@ -54,6 +57,7 @@ def _checkAndCreateFunctionParametersDictionary(event):
         raise URLAttributeNotFound("Item Id")
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
     project_id = event.get("pathParameters").get("project_id")
     assessment_id = event.get("pathParameters").get("assessment_id")
     area_id = event.get("pathParameters").get("area_id")
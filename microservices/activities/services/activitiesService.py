@@ -88,159 +88,46 @@ class Activity:
             raise AnyExceptionHandler(
                 "Assessment does not belong to the given project!"
             )
+        snapshot = assessment_object._getChecklistSnapshot(assessment.checklist_id)
         area_id = kwargs.get("area_id")
-        area_object = AreaClass()
-        area = area_object._getAreaById(area_id)
-
+        area = snapshot.getNode("area", area_id)
         if area is None:
-            raise AttributeIdNotFound("Area")
-        if not str(area.checklist_id) == str(assessment.checklist_id):
+            # not in the checklist snapshot, either missing or of another checklist
+            area_object = AreaClass()
+            if area_object._getAreaById(area_id) is None:
+                raise AttributeIdNotFound("Area")
             raise AnyExceptionHandler(
                 "Area Id does not belong to the correct checklist!"
             )
         subarea_id = kwargs.get("subarea_id")
         item_id = kwargs.get("item_id")
-        subarea_object = SubareaClass()
-        subarea = subarea_object._getSubareaById(subarea_id)
+        subarea = snapshot.getNode("subarea", subarea_id)
         if subarea is None:
-            raise AttributeIdNotFound("Subarea")
-        if not str(subarea.area_id) == area_id:
+            subarea_object = SubareaClass()
+            if subarea_object._getSubareaById(subarea_id) is None:
+                raise AttributeIdNotFound("Subarea")
+            raise AnyExceptionHandler("Subarea does not belong to the given Area")
+        if not subarea.parent_id == area.id:
             raise AnyExceptionHandler("Subarea does not belong to the given Area")
-        item_object = ItemClass()
-        item = item_object._getItemById(item_id)
+        item = snapshot.getNode("item", item_id)
         if item is None:
-            raise AttributeIdNotFound("Item")
-        if not str(item.subarea_id) == subarea_id:
+            item_object = ItemClass()
+            if item_object._getItemById(item_id) is None:
+                raise AttributeIdNotFound("Item")
             raise AnyExceptionHandler("Item does not belong to the given subarea")
-        activities = session.query(ActivityModel).filter(
-            ActivityModel.item_id == item_id
-        )
-        activity_list = []
-
-        # 07-March-2023 | activiy delta logic | start
-        assessment_responses_delta = session.query(
-            AssessmentResponseDeltaModel.id,
-            AssessmentResponseDeltaModel.activity_id,
-            AssessmentResponseDeltaModel.assessment_id,
-            AssessmentResponseDeltaModel.previous_assessment_id,
-            AssessmentResponseDeltaModel.previous_value,
-            AssessmentResponseDeltaModel.previous_comments,
-            AssessmentResponseDeltaModel.type,
-        ).filter(
-            AssessmentResponseDeltaModel.assessment_id == str(assessment_id),
+        if not item.parent_id == subarea.id:
+            raise AnyExceptionHandler("Item does not belong to the given subarea")
+        activities = snapshot.getChildren(item.id)
+        # responses and deltas of all the item's activities are read in one
+        # query each and indexed by activity
+        activity_ids = [activity.id for activity in activities]
+        responses = assessment_object._getResponsesByActivity(
+            assessment_id, activity_ids
         )
+        deltas = assessment_object._getDeltasByActivity(assessment_id, activity_ids)
 
-        print("length of assessment delta", assessment_responses_delta)
-
-        manager_delta_dict = {}
-        reviewer_delta_dict = {}
-        if not assessment_responses_delta:
-            pass
-        else:
-            # delta_dict = {str(ard.activity_id):dict(ard) for ard in assessment_responses_delta}
-            for ard in assessment_responses_delta:
-                if ard.type.value == "ReviewerDelta":
-                    reviewer_delta_dict[str(ard.activity_id)] = {
-                        "id": str(ard.id),
-                        "activity_id": str(ard.activity_id),
-                        "assessment_id": str(ard.assessment_id),
-                        "previous_assessment_id": str(ard.previous_assessment_id),
-                        "value": ard.previous_value,
-                        "comments": ard.previous_comments,
-                    }
-                if ard.type.value == "ManagerDelta":
-                    manager_delta_dict[str(ard.activity_id)] = {
-                        "id": str(ard.id),
-                        "activity_id": str(ard.activity_id),
-                        "assessment_id": str(ard.assessment_id),
-                        "previous_assessment_id": str(ard.previous_assessment_id),
-                        "value": ard.previous_value,
-                        "comments": ard.previous_comments,
-                    }
-
-        # 07-March-2023 | activiy delta logic | end
-
-        for activity in activities:
-            activity_details = activity.as_dict()
-
-            print(str(assessment_id), str(activity.id))
-
-            responses = session.query(ResponseModel).filter(
-                ResponseModel.assessment_id == str(assessment_id),
-                ResponseModel.activity_id == str(activity.id),
-            )
-
-            if responses is not None:
-                user_response = responses.filter(
-                    ResponseModel.type == "ManagerResponse"
-                ).first()
-                # user_response = session.query(ResponseModel).filter(
-                #     ResponseModel.assessment_id == str(assessment_id),
-                #     ResponseModel.activity_id == str(activity.id),
-                #     ResponseModel.type == "ManagerResponse",
-                # )
-
-                if user_response is None:
-                    user_response_details = {}
-                else:
-                    user_response_details = user_response.as_dict()
-
-                    ## 07-March-2023 | delta response logic updated (old commented) | Start
-                    # delta = self._fetchActivityDelta(
-                    #     assessment_id=str(assessment_id),
-                    #     activity_id=str(activity.id),
-                    # )
-                    # if delta is None:
-                    #     user_response_details["delta"] = {}
-                    # else:
-                    #     user_response_details["delta"] = delta
-
-                    if (
-                        any(reviewer_delta_dict)
-                        and str(activity.id) in reviewer_delta_dict
-                    ):
-                        user_response_details["delta"] = reviewer_delta_dict[
-                            str(activity.id)
-                        ]
-                    else:
-                        user_response_details["delta"] = {}
-
-                    ## 07-March-2023 | delta response logic updated | End
-
-                reviewer_response = responses.filter(
-                    ResponseModel.type == "ReviewerResponse"
-                ).first()
-
-                if reviewer_response is None:
-                    reviewer_response_details = {}
-                else:
-                    reviewer_response_details = reviewer_response.as_dict()
-
-                    if (
-                        any(manager_delta_dict)
-                        and str(activity.id) in manager_delta_dict
-                    ):
-                        reviewer_response_details["delta"] = manager_delta_dict[
-                            str(activity.id)
-                        ]
-                    else:
-                        reviewer_response_details["delta"] = {}
-
-                activity_details["user_response_details"] = user_response_details
-                activity_details[
-                    "reviewer_response_details"
-                ] = reviewer_response_details
-
-            activity_list.append(activity_details)
-        print(
-            "manager_delta_dict, reviewer_delta_dict",
-            manager_delta_dict,
-            reviewer_delta_dict,
-        )
-        test_delta_count = (
-            session.query(AssessmentResponseDeltaModel)
-            .order_by(desc(AssessmentResponseDeltaModel.created_on))
-            .limit(5)
-        )
-        print("!!!!!!!!!!!!!!!!!!!!!!!! test_delta_count:", test_delta_count)
+        activity_list = [
+            assessment_object._buildActivityDetails(activity, responses, deltas)
+            for activity in activities
+        ]
         return activity_list
@@ -1,8 +1,11 @@
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
 from microservices.areas.services.areasService import Area
+from models.database.dbConnection import release_session
 
 
+@release_session
 def listHandler(event, context):
 
     try:
@@ -48,6 +51,7 @@ def _checkAndCreateFunctionParametersDictionary(event):
     assessment_id = event.get("pathParameters").get("assessment_id")
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
     kwargs["project_id"] = project_id
     kwargs["assessment_id"] = assessment_id
     return kwargs
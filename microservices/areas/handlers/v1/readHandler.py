@@ -1,8 +1,10 @@
 import json
 
 from microservices.accounts.services.accountsService import Account
+from models.database.dbConnection import release_session
 
 
+@release_session
 def readhandler(event, context):
 
     account = Account()
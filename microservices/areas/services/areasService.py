@@ -61,87 +61,32 @@ class Area:
                 "Assessment does not belong to the given Project!"
             )
 
-        checklist_id = assessment.checklist_id
-        areas = session.query(AreaModel).filter(
-            AreaModel.checklist_id == checklist_id
-        )
+        snapshot = assessment_object._getChecklistSnapshot(assessment.checklist_id)
 
         # 09-March-2023 | delta count for each item | start
-        area_ids = [str(a.id) for a in areas]
-
-        area_delta_counts_manager = (
-            session.query(
-                SubareaModel.area_id, func.count(AssessmentResponseDeltaModel.id)
-            )
-            .filter(
-                AssessmentResponseDeltaModel.assessment_id == str(assessment_id),
-                AssessmentResponseDeltaModel.type == "ReviewerDelta",
-                ActivityModel.id == AssessmentResponseDeltaModel.activity_id,
-                ItemModel.id == ActivityModel.item_id,
-                SubareaModel.id == ItemModel.subarea_id,
-                SubareaModel.area_id.in_(area_ids),
-            )
-            .group_by(SubareaModel.area_id)
+        # delta counts per activity are summed per area through the checklist snapshot
+        area_delta_dict_manager = snapshot.rollUpCounts(
+            assessment_object._getDeltaCountsByActivity(assessment_id, "ReviewerDelta"),
+            "area",
         )
-
-        area_delta_dict_manager = {
-            str(dc[0]): dc[1] for dc in area_delta_counts_manager
-        }
-
-        # delta count for each item for reviewer| start
-        area_delta_counts_reviewer = (
-            session.query(
-                SubareaModel.area_id, func.count(AssessmentResponseDeltaModel.id)
-            )
-            .filter(
-                AssessmentResponseDeltaModel.assessment_id == str(assessment_id),
-                AssessmentResponseDeltaModel.type == "ManagerDelta",
-                ActivityModel.id == AssessmentResponseDeltaModel.activity_id,
-                ItemModel.id == ActivityModel.item_id,
-                SubareaModel.id == ItemModel.subarea_id,
-                SubareaModel.area_id.in_(area_ids),
-            )
-            .group_by(SubareaModel.area_id)
+        area_delta_dict_reviewer = snapshot.rollUpCounts(
+            assessment_object._getDeltaCountsByActivity(assessment_id, "ManagerDelta"),
+            "area",
         )
 
-        area_delta_dict_reviewer = {
-            str(dc[0]): dc[1] for dc in area_delta_counts_reviewer
-        }
-
         print("area delta count", area_delta_dict_manager, area_delta_dict_reviewer)
 
         # delta count for each item for reviewer| end
 
         areasSerializedObject = []
-        # areasSerializedObject = [area.as_dict() for area in areas]
-
-        for area in areas:
-            area_dict = area.as_dict()
-
-            # response object update for delta count | start
-            if (
-                any(area_delta_dict_manager)
-                and str(area.id) in area_delta_dict_manager
-            ):
-                reviewer_delta = area_delta_dict_manager[str(area.id)]
-
-            else:
-                reviewer_delta = 0
-
-            if (
-                any(area_delta_dict_reviewer)
-                and str(area.id) in area_delta_dict_reviewer
-            ):
-                manager_delta = area_delta_dict_reviewer[str(area.id)]
 
-            else:
-                manager_delta = 0
-            # response object update for delta count |
+        for area in snapshot.getAreas():
+            area_dict = dict(area.data)
 
             deltaResponseDict = {
                 "delta": {
-                    "reviewer_delta": manager_delta,
-                    "manager_delta": reviewer_delta,
+                    "reviewer_delta": area_delta_dict_reviewer.get(area.id, 0),
+                    "manager_delta": area_delta_dict_manager.get(area.id, 0),
                 }
             }
 
@@ -2,11 +2,14 @@ import json
 
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
 from microservices.assessmentResponses.services.assessmentResponses import (
     AssessmentResponse,
 )
+from models.database.dbConnection import release_session
 
 
+@release_session
 def updateHandler(event, context):
 
     try:
@@ -109,4 +112,5 @@ def _checkAndCreateFunctionParametersDictionary(event):
     kwargs["role"] = role
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
     return kwargs
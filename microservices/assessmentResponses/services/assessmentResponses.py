@@ -1,4 +1,5 @@
 import json
+import uuid
 from datetime import date, datetime
 from typing import Any
 
@@ -7,6 +8,9 @@ from common.decorator import decor
 from microservices.assessments.services.assessmentsService import (
     Assessment as AssessmentClass,
 )
+from microservices.assessments.services.progressService import (
+    AssessmentProgress as AssessmentProgressClass,
+)
 from microservices.projects.services.projectsService import Project as ProjectClass
 from models.assessmentModels import Assessment as AssessmentModel
 from models.assessmentModels import AssessmentStatus
@@ -58,6 +62,29 @@ class AssessmentResponse:
             return None
         return response
 
+    def _getResponsesByIds(self, ids):
+        """
+        Input: list of response ids as sent by the client
+        Output: dict {requested id: Response}, ids which are not UUIDs or not found are left out
+        """
+        response_ids = {}
+        for id in ids:
+            try:
+                response_ids[str(id)] = str(uuid.UUID(str(id)))
+            except ValueError:
+                continue
+        if not response_ids:
+            return {}
+        responses = session.query(ResponseModel).filter(
+            ResponseModel.id.in_(set(response_ids.values()))
+        )
+        responses = {str(response.id): response for response in responses}
+        return {
+            id: responses[response_id]
+            for id, response_id in response_ids.items()
+            if response_id in responses
+        }
+
     def _validateResponse(self, responseObject):
         if not responseObject.get("id"):
             return {
@@ -164,12 +191,19 @@ class AssessmentResponse:
         responses = kwargs.get("responses")
         if len(responses) == 0:
             raise AnyExceptionHandler("Response list is empty!")
-        response_return = {"body": []}
         for responseObject in responses:
             self._checkResponseFormat(responseObject, role)
+
+        # all referenced responses are read with one query and written in one transaction
+        existing_responses = self._getResponsesByIds(
+            [responseObject.get("id") for responseObject in responses]
+        )
+        response_return = {"body": []}
+        response_changes = []
+        for responseObject in responses:
             validated_response = self._validateResponse(responseObject)
             if validated_response is None:
-                response = self._getResponseById(responseObject.get("id"))
+                response = existing_responses.get(str(responseObject.get("id")))
                 if response is None:
                     response_return.get("body").append(
                         {
@@ -181,40 +215,50 @@ class AssessmentResponse:
                             },
                         }
                     )
-                else:
-                    if not str(response.assessment_id) == assessment_id:
-                        id = str(response.id)
-                        response_return.get("body").append(
-                            {
-                                "success": False,
-                                "body": f"Response with the given Id {id} does not belong to the given assessment",
-                            }
+                elif not str(response.assessment_id) == assessment_id:
+                    id = str(response.id)
+                    response_return.get("body").append(
+                        {
+                            "success": False,
+                            "body": f"Response with the given Id {id} does not belong to the given assessment",
+                        }
+                    )
+                elif not self._checkIfResponseIdAndRoleMatch(
+                    response, role, response_return
+                )[0]:
+                    response_changes.append(
+                        (
+                            str(response.activity_id),
+                            response.type,
+                            response.value,
+                            responseObject.get("value"),
                         )
-                        pass
-                    if not self._checkIfResponseIdAndRoleMatch(
-                        response, role, response_return
-                    )[0]:
-                        response.value = responseObject.get("value")
-                        response.comments = responseObject.get("comments")
-                        response.modified_by = authenticated_user_id
-                        response.modified_on = datetime.now()
-                        try:
-                            session.add(response)
-                            session.commit()
-                            session.refresh(response)
-                        except Exception as ex:
-                            session.rollback()
-                            raise AnyExceptionHandler(ex)
-                        if response is not None:
-                            response_return.get("body").append(
-                                {
-                                    "success": True,
-                                    "body": response.as_dict(),
-                                }
-                            )
+                    )
+                    response.value = responseObject.get("value")
+                    response.comments = responseObject.get("comments")
+                    response.modified_by = authenticated_user_id
+                    # utc like the grade calculation tasks it is compared with
+                    response.modified_on = datetime.utcnow()
+                    response_return.get("body").append(
+                        {
+                            "success": True,
+                            "body": response.as_dict(),
+                        }
+                    )
             else:
                 response_return.get("body").append(
                     {"success": False, "message": validated_response}
                 )
+
+        # the changed responses are flushed as one batched UPDATE, the progress
+        # counters are moved in the same transaction
+        try:
+            if response_changes:
+                progress_object = AssessmentProgressClass()
+                progress_object.applyResponseChanges(assessment_id, response_changes)
+            session.commit()
+        except Exception as ex:
+            session.rollback()
+            raise AnyExceptionHandler(ex)
         body = response_return["body"]
         return body
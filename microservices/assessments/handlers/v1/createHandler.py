@@ -2,10 +2,13 @@ import json
 from datetime import date, datetime, timedelta
 
 from common.customExceptions import *
+from common.decorator import getPermissionContext
 from common.responseBuilder import ResponseBuilder
 from microservices.assessments.services.assessmentsService import Assessment
+from models.database.dbConnection import release_session
 
 
+@release_session
 def triggerAssessment(event, context):
 
     try:
@@ -51,6 +54,7 @@ def triggerAssessment(event, context):
     return response
 
 
+@release_session
 def createHandler(event, context):
 
     try:
@@ -108,4 +112,5 @@ def _checkAndCreateFunctionParametersDictionary(event):
     kwargs["project_id"] = project_id
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
     return kwargs
@@ -1,23 +1,67 @@
 import json
 
-from common.customExceptions import RequestBodyNotFound, RequestBodyAttributeNotFound
+from common.customExceptions import (
+    RequestBodyAttributeNotFound,
+    RequestBodyNotFound,
+)
 from common.responseBuilder import ResponseBuilder
 
 from microservices.assessments.services.assessmentsService import Assessment
+from models.database.dbConnection import release_session, session_scope
 
+@release_session
 def gradeCalculationHandler(event, context):
-    try:
-        assessment = Assessment()
-        response_builder = ResponseBuilder()
-        kwargs = _checkAndCreateFunctionParametersDictionary(event)
-        print("triggered via sqs",kwargs)
-        assessment.gradeCalculator(**kwargs)
-        response = response_builder.buildResponse(None, True)
-    except Exception as error:
-        print(error)
-        response = response_builder.buildResponse(error)
-    return response
+    """
+    Consumes a batch of grade calculation messages from SQS.
+    Messages for the same assessment are deduplicated so that only the active
+    GradeCalculationTask is calculated, superseded ones are acknowledged, as are
+    the messages of an assessment without active task.
+    When the active task lookup fails, the messages of the assessment are failed.
+    Returns the partial batch response so that only failed messages are redelivered.
+    """
+    assessment = Assessment()
+    batch_item_failures = []
+    assessment_messages = {}
+
+    for record in event.get("Records", []):
+        try:
+            kwargs = _checkAndCreateFunctionParametersDictionary(record)
+        except Exception as error:
+            print("Invalid grade calculation message", record.get("messageId"), error)
+            batch_item_failures.append({"itemIdentifier": record.get("messageId")})
+            continue
+        assessment_messages.setdefault(kwargs["assessment_id"], []).append(
+            (record.get("messageId"), kwargs)
+        )
+
+    for assessment_id, messages in assessment_messages.items():
+        try:
+            with session_scope():
+                message_id, kwargs = _getLatestMessage(
+                    assessment, assessment_id, messages
+                )
+        except Exception as error:
+            # nothing is acknowledged unless the active task is known
+            print("Active grade calculation task lookup failed", assessment_id, error)
+            batch_item_failures.extend(
+                {"itemIdentifier": message_id} for message_id, _ in messages
+            )
+            continue
+        if kwargs is None:
+            print("Skipping superseded grade calculation tasks", assessment_id)
+            continue
+        try:
+            print("triggered via sqs", kwargs)
+            # one unit of work per assessment, the warm container keeps no state
+            with session_scope():
+                assessment.gradeCalculator(**kwargs)
+        except Exception as error:
+            print(error)
+            batch_item_failures.append({"itemIdentifier": message_id})
 
+    return {"batchItemFailures": batch_item_failures}
+
+@release_session
 def readHandler(event, context):
     # if not event.get("pathParameters").get("grade_calculation_task_id"):
     #     raise URLAttributeNotFound("Assessment Id")
@@ -29,13 +73,24 @@ def readHandler(event, context):
         return response_builder.buildResponse(None)
     return response_builder.buildResponse(None, calculation_task.as_dict())
 
-def _checkAndCreateFunctionParametersDictionary(event):
+def _getLatestMessage(assessment, assessment_id, messages):
+    # only the active task of an assessment is worth calculating,
+    # older tasks were deactivated by a later status transition
+    active_task = assessment._getActiveTask(assessment_id, raise_errors=True)
+    if active_task is None:
+        print("No active grade calculation task", assessment_id)
+        return None, None
+    for message_id, kwargs in reversed(messages):
+        if kwargs["grade_calculation_task_id"] == str(active_task.id):
+            return message_id, kwargs
+    return None, None
+
+def _checkAndCreateFunctionParametersDictionary(record):
     kwargs = {}
 
-    for record in event["Records"]:
-        if not record.get("body"):
-            raise RequestBodyNotFound()
-    body = json.loads(event["Records"][0].get("body"))
+    if not record.get("body"):
+        raise RequestBodyNotFound()
+    body = json.loads(record.get("body"))
 
     if not body.get("assessment_id"):
         raise RequestBodyAttributeNotFound("assessment_id")
@@ -49,4 +104,7 @@ def _checkAndCreateFunctionParametersDictionary(event):
         raise RequestBodyAttributeNotFound("status")
     kwargs["status"] = body.get("status")
 
+    # all the items are regraded instead of the ones with changed responses
+    kwargs["full_recalculation"] = bool(body.get("full_recalculation", False))
+
     return kwargs
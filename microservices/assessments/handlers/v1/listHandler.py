@@ -1,8 +1,11 @@
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
 from microservices.assessments.services.assessmentsService import Assessment
+from models.database.dbConnection import release_session
 
 
+@release_session
 def listHandler(event, context):
 
     try:
@@ -35,6 +38,7 @@ def _checkAndCreateFunctionParametersDictionary(event):
         authenticated_user_roles = [authenticated_user_roles]
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
 
     if not event.get("pathParameters").get("project_id"):
         raise URLAttributeNotFound("Project Id")
@@ -44,4 +48,15 @@ def _checkAndCreateFunctionParametersDictionary(event):
     # if not event.get("queryStringParameters").get("status"):
     #     raise URLAttributeNotFound("Status")
     kwargs["status"] = event.get("queryStringParameters", {}).get("status")
+
+    # pagination attributes, without a page size the whole list is returned as before
+    kwargs["page_size"] = event.get("queryStringParameters", {}).get("pageSize", "0")
+    kwargs["page_number"] = event.get("queryStringParameters", {}).get(
+        "pageNumber", None
+    )
+    kwargs["sort_key"] = event.get("queryStringParameters", {}).get("sortKey", None)
+    kwargs["sort_order"] = event.get("queryStringParameters", {}).get(
+        "sortOrder", None
+    )
+    kwargs["after"] = event.get("queryStringParameters", {}).get("after", None)
     return kwargs
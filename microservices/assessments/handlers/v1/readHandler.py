@@ -1,8 +1,11 @@
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
 from microservices.assessments.services.assessmentsService import Assessment
+from models.database.dbConnection import release_session
 
 
+@release_session
 def readHandler(event, context):
     try:
         assessment = Assessment()
@@ -39,6 +42,7 @@ def _checkAndCreateFunctionParametersDictionary(event):
         authenticated_user_roles = [authenticated_user_roles]
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
 
     if not event.get("pathParameters").get("project_id"):
         raise URLAttributeNotFound("Project Id")
@@ -0,0 +1,50 @@
+from common.customExceptions import *
+from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
+from microservices.assessments.services.assessmentsService import Assessment
+from models.database.dbConnection import release_session
+
+
+@release_session
+def treeHandler(event, context):
+    try:
+        assessment = Assessment()
+        response_builder = ResponseBuilder()
+        kwargs = _checkAndCreateFunctionParametersDictionary(event)
+        response = assessment.getAssessmentTree(**kwargs)
+        response = response_builder.buildResponse(None, response)
+    except Exception as error:
+        response = response_builder.buildResponse(error)
+    return response
+
+
+def _checkAndCreateFunctionParametersDictionary(event):
+    kwargs = {}
+    authenticated_user_id = (
+        event.get("requestContext", {})
+        .get("authorizer", {})
+        .get("lambda", {})
+        .get("sub")
+    )
+
+    authenticated_user_roles = (
+        event.get("requestContext", {})
+        .get("authorizer", {})
+        .get("lambda", {})
+        .get("cognito:groups")
+    )
+    if not isinstance(authenticated_user_roles, list):
+        authenticated_user_roles = [authenticated_user_roles]
+    kwargs["authenticated_user_id"] = authenticated_user_id
+    kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
+
+    if not event.get("pathParameters").get("project_id"):
+        raise URLAttributeNotFound("Project Id")
+    kwargs["project_id"] = event.get("pathParameters").get("project_id")
+
+    if not event.get("pathParameters").get("assessment_id"):
+        raise URLAttributeNotFound("Assessment Id")
+    kwargs["assessment_id"] = event.get("pathParameters").get("assessment_id")
+
+    return kwargs
@@ -0,0 +1,47 @@
+"""
+Recomputes the assessment progress counters from the responses and reports the drift.
+    python -m microservices.assessments.rebuildProgress [--assessment-id ID] [--dry-run]
+Without an assessment id every assessment is checked, assessments without
+counters (created before the counters existed) get them built.
+"""
+import argparse
+
+from microservices.assessments.services.progressService import AssessmentProgress
+from models.assessmentModels import Assessment as AssessmentModel
+from models.database.dbConnection import session
+
+
+def rebuildProgress(assessment_id=None, dry_run=False):
+    progress_object = AssessmentProgress()
+    assessments = session.query(AssessmentModel.id)
+    if assessment_id:
+        assessments = assessments.filter(AssessmentModel.id == assessment_id)
+
+    drifted_assessments = 0
+    for assessment in assessments.all():
+        try:
+            drift = progress_object.rebuildProgress(assessment.id, repair=not dry_run)
+            session.commit()
+        except Exception as ex:
+            session.rollback()
+            print("Error rebuilding progress of assessment", assessment.id, ex)
+            continue
+        if drift:
+            drifted_assessments += 1
+            print("Drift in assessment", assessment.id)
+            for column, (stored, actual) in drift.items():
+                print(f"    {column}: stored {stored}, actual {actual}")
+    print(
+        "Assessments with drift:",
+        drifted_assessments,
+        "(reported only)" if dry_run else "(repaired)",
+    )
+    return drifted_assessments
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--assessment-id", default=None)
+    parser.add_argument("--dry-run", action="store_true")
+    arguments = parser.parse_args()
+    rebuildProgress(arguments.assessment_id, arguments.dry_run)
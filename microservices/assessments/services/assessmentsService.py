@@ -2,10 +2,14 @@ import calendar
 import enum
 import json
 import os
+import uuid
 from datetime import datetime
 
 import boto3
-from sqlalchemy import desc, exc, func
+from sqlalchemy import Text, cast, desc, exc, func, insert, literal, or_, select
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import aliased
 
 from common.customExceptions import (  # PathParameterNotFound,; URLAttributeNotFound,
     AnyExceptionHandler,
@@ -14,9 +18,14 @@ from common.customExceptions import (  # PathParameterNotFound,; URLAttributeNot
     IncorrectFormat,
     InvalidAttribute,
 )
+from common.checklistSnapshot import getChecklistSnapshot
 from common.decorator import decor
+from common.paginate import Paginate as Pagination
 
 # from microservices.projects.services.projectsService import Project
+from microservices.assessments.services.progressService import (
+    AssessmentProgress as AssessmentProgressClass,
+)
 from microservices.projects.services.projectsService import Project as ProjectClass
 from microservices.users.services.usersService import User as UserClass
 from models.assessmentModels import Assessment as AssessmentModel
@@ -36,8 +45,18 @@ from models.database.dbConnection import session
 from models.projectModels import Frequency as AuditFrequency
 from models.projectModels import Project as ProjectModel
 from models.resultModels import AssessmentItemScore as AssessmentItemScoreModel
+from models.resultModels import (
+    AssessmentResultSnapshot as AssessmentResultSnapshotModel,
+)
 from models.resultModels import AssessmentSubareaScore as AssessmentSubareaScoreModel
 
+# bump when the results document changes, older snapshots are then rebuilt live
+RESULT_SNAPSHOT_VERSION = 1
+# grade only the items with responses changed since the last calculation
+GRADE_CALCULATION_INCREMENTAL = (
+    os.getenv("GRADE_CALCULATION_INCREMENTAL", "true").lower() == "true"
+)
+
 
 class Assessment:
     def _validateDate(self, date_text):
@@ -104,6 +123,70 @@ class Assessment:
             summary_json["total"] = _total
         return summary_json
 
+    def _getResponseSummaries(self, assessment_ids):
+        """
+        Yes/No/NA counts of the manager and reviewer responses of the assessments
+        Input: list of assessment ids
+        Output: dict {assessment_id: {"manager": {}, "reviewer": {}}}
+        """
+        response_counts = (
+            session.query(
+                ResponseModel.assessment_id,
+                ResponseModel.type,
+                ResponseModel.value,
+                func.count("*"),
+            )
+            .filter(ResponseModel.assessment_id.in_(assessment_ids))
+            .group_by(
+                ResponseModel.assessment_id, ResponseModel.type, ResponseModel.value
+            )
+        )
+        grouped_counts = {}
+        for assessment_id, response_type, value, count in response_counts:
+            if response_type is None:
+                continue
+            grouped_counts.setdefault(
+                (str(assessment_id), response_type.name), []
+            ).append((value, count))
+
+        response_summaries = {}
+        for assessment_id in assessment_ids:
+            summary = {}
+            for key, response_type in (
+                ("manager", "ManagerResponse"),
+                ("reviewer", "ReviewerResponse"),
+            ):
+                summary[key] = self._groupBySummaryDict(
+                    grouped_counts.get((assessment_id, response_type)),
+                    {"yes": 0, "no": 0, "n/a": 0, "total": 0},
+                )
+            response_summaries[assessment_id] = summary
+        return response_summaries
+
+    def _getAssessmentSummaries(self, assessment_ids):
+        # served from the progress counters, assessments whose counters were
+        # not built yet are counted from the responses
+        progress_object = AssessmentProgressClass()
+        summaries = progress_object.getProgressSummaries(assessment_ids)
+        missing_assessment_ids = [
+            assessment_id
+            for assessment_id in assessment_ids
+            if assessment_id not in summaries
+        ]
+        if missing_assessment_ids:
+            summaries.update(self._getResponseSummaries(missing_assessment_ids))
+        return summaries
+
+    def _getActiveTasks(self, assessment_ids):
+        tasks = session.query(GradeCalculationTaskModel).filter(
+            GradeCalculationTaskModel.assessment_id.in_(assessment_ids),
+            GradeCalculationTaskModel.active == True,
+        )
+        active_tasks = {}
+        for task in tasks:
+            active_tasks.setdefault(str(task.assessment_id), task)
+        return active_tasks
+
     @decor
     def getAssessmentList(self, **kwargs):
         """
@@ -119,7 +202,6 @@ class Assessment:
         project = project_object._getProjectById(project_id)
         if project is None:
             raise AttributeIdNotFound("Project Id")
-        assessment_status = []
         assessments = session.query(AssessmentModel).filter(
             AssessmentModel.project_id == project_id
         )
@@ -128,8 +210,45 @@ class Assessment:
             status = kwargs["status"]
             assessments = assessments.filter(AssessmentModel.status == status)
 
-        # 16-March-2023 | delta count for each area | Start
+        # paginate the final filtered response | start
+        if kwargs.get("after") is not None:
+            total_data_count = None
+        else:
+            total_data_count = assessments.count()
+
+        paginate = Pagination(
+            AssessmentModel,
+            **{
+                "page_size": kwargs.get("page_size"),
+                "page_number": kwargs.get("page_number"),
+                "sort_key": kwargs.get("sort_key"),
+                "sort_order": kwargs.get("sort_order"),
+                "total_data_count": total_data_count,
+                "after": kwargs.get("after"),
+                "default_sort_key": "start_date",
+                "default_sort_order": "desc",
+            },
+        )
+
+        if paginate._isKeysetMode():
+            assessments = paginate._getKeysetPage(assessments)
+        else:
+            pagination_setting = paginate._getPaginationSetting()
+            assessments = (
+                assessments.order_by(*paginate._getOrderBy())
+                .limit(pagination_setting["page_size"])
+                .offset(pagination_setting["offset_value"])
+                .all()
+            )
+        pagination_response_attributes = paginate._getResponseAttribute()
+        # paginate the final filtered response | end
+
+        # summaries of all the listed assessments are read with one query per table
         assessment_ids = [str(a.id) for a in assessments]
+        response_summaries = self._getAssessmentSummaries(assessment_ids)
+        active_tasks = self._getActiveTasks(assessment_ids)
+
+        # 16-March-2023 | delta count for each area | Start
         all_assessment_delta_counts = (
             session.query(
                 AssessmentResponseDeltaModel.assessment_id,
@@ -142,78 +261,33 @@ class Assessment:
             .group_by(AssessmentResponseDeltaModel.assessment_id)
         )
 
-        assessment_delta_dict = {dc[0]: dc[1] for dc in all_assessment_delta_counts}
+        assessment_delta_dict = {
+            str(dc[0]): dc[1] for dc in all_assessment_delta_counts
+        }
         # 16-March-2023 | delta count for each area | End
 
-        assessments = assessments.all()
         result = {}
         _assessments = []
-        # [assessment.as_dict() for assessment in assessments]
 
         for assessment in assessments:
-            print("Iterating assessments", assessment.as_dict())
+            assessment_id = str(assessment.id)
             _assessment_dict = assessment.as_dict()
             _assessment_dict["calculation_task_id"] = None
             _assessment_dict["calculation_task_status"] = False
-            task = self._getActiveTask(assessment.id)
+            task = active_tasks.get(assessment_id)
             if task:
                 _assessment_dict["calculation_task_id"] = str(task.id)
                 _assessment_dict["calculation_task_status"] = task.status
-            _manager_response = (
-                session.query(ResponseModel.value, func.count("*"))
-                .filter(
-                    ResponseModel.assessment_id == str(assessment.id),
-                    ResponseModel.type == "ManagerResponse",
-                )
-                .group_by(ResponseModel.value)
-                .all()
-            )
-
-            _reviewer_response = (
-                session.query(ResponseModel.value, func.count("*"))
-                .filter(
-                    ResponseModel.assessment_id == str(assessment.id),
-                    ResponseModel.type == "ReviewerResponse",
-                )
-                .group_by(ResponseModel.value)
-                .all()
-            )
-
-            activity_dict = {"activities": {}}
-
-            manager_dict = {"yes": 0, "no": 0, "n/a": 0, "total": 0}
-            reviewer_dict = {"yes": 0, "no": 0, "n/a": 0, "total": 0}
-            if _manager_response:
-                manager_dict = self._groupBySummaryDict(
-                    _manager_response, manager_dict
-                )
-            if _reviewer_response:
-                reviewer_dict = self._groupBySummaryDict(
-                    _reviewer_response, reviewer_dict
-                )
-
-            activity_dict["activities"]["manager"] = manager_dict
-            activity_dict["activities"]["reviewer"] = reviewer_dict
-
-            # 16-March-2023 | delta count for each area | Start
-            if (
-                any(assessment_delta_dict)
-                and str(assessment.id) in assessment_delta_dict
-            ):
-                deltaResponseDict = {
-                    "delta": {
-                        "reviewer_delta": assessment_delta_dict[str(assessment.id)]
-                    }
-                }
-            else:
-                deltaResponseDict = {"delta": {"reviewer_delta": 0}}
-            activity_dict.update(deltaResponseDict)
-            # 16-March-2023 | delta count for each area | End
 
+            activity_dict = {"activities": response_summaries[assessment_id]}
+            activity_dict["delta"] = {
+                "reviewer_delta": assessment_delta_dict.get(assessment_id, 0)
+            }
             _assessment_dict["summary"] = activity_dict
 
             _assessments.append(_assessment_dict)
 
+        result.update(pagination_response_attributes)
         result["data"] = _assessments
 
         try:
@@ -275,39 +349,11 @@ class Assessment:
         if task:
             _assessment_dict["calculation_task_id"] = str(task.id)
             _assessment_dict["calculation_task_status"] = task.status
-        _manager_response = (
-            session.query(ResponseModel.value, func.count("*"))
-            .filter(
-                ResponseModel.assessment_id == str(assessment.id),
-                ResponseModel.type == "ManagerResponse",
-            )
-            .group_by(ResponseModel.value)
-            .all()
-        )
-
-        _reviewer_response = (
-            session.query(ResponseModel.value, func.count("*"))
-            .filter(
-                ResponseModel.assessment_id == str(assessment.id),
-                ResponseModel.type == "ReviewerResponse",
-            )
-            .group_by(ResponseModel.value)
-            .all()
-        )
-
-        activity_dict = {"activities": {}}
-
-        manager_dict = {"yes": 0, "no": 0, "n/a": 0, "total": 0}
-        reviewer_dict = {"yes": 0, "no": 0, "n/a": 0, "total": 0}
-        if _manager_response:
-            manager_dict = self._groupBySummaryDict(_manager_response, manager_dict)
-        if _reviewer_response:
-            reviewer_dict = self._groupBySummaryDict(
-                _reviewer_response, reviewer_dict
-            )
-
-        activity_dict["activities"]["manager"] = manager_dict
-        activity_dict["activities"]["reviewer"] = reviewer_dict
+        activity_dict = {
+            "activities": self._getAssessmentSummaries([str(assessment.id)])[
+                str(assessment.id)
+            ]
+        }
         _assessment_dict["summary"] = activity_dict
 
         # 11 March 2023 | reviewerDelta
@@ -325,22 +371,261 @@ class Assessment:
 
         return result
 
+    def _getResponsesByActivity(self, assessment_id, activity_ids=None):
+        responses = session.query(ResponseModel).filter(
+            ResponseModel.assessment_id == str(assessment_id)
+        )
+        if activity_ids is not None:
+            responses = responses.filter(ResponseModel.activity_id.in_(activity_ids))
+        return {
+            (str(response.activity_id), response.type.name): response
+            for response in responses
+            if response.type is not None
+        }
+
+    def _getDeltasByActivity(self, assessment_id, activity_ids=None):
+        assessment_responses_delta = session.query(
+            AssessmentResponseDeltaModel.id,
+            AssessmentResponseDeltaModel.activity_id,
+            AssessmentResponseDeltaModel.assessment_id,
+            AssessmentResponseDeltaModel.previous_assessment_id,
+            AssessmentResponseDeltaModel.previous_value,
+            AssessmentResponseDeltaModel.previous_comments,
+            AssessmentResponseDeltaModel.type,
+        ).filter(
+            AssessmentResponseDeltaModel.assessment_id == str(assessment_id),
+        )
+        if activity_ids is not None:
+            assessment_responses_delta = assessment_responses_delta.filter(
+                AssessmentResponseDeltaModel.activity_id.in_(activity_ids)
+            )
+
+        deltas = {"ReviewerDelta": {}, "ManagerDelta": {}}
+        for ard in assessment_responses_delta:
+            if ard.type is None or ard.type.value not in deltas:
+                continue
+            deltas[ard.type.value][str(ard.activity_id)] = {
+                "id": str(ard.id),
+                "activity_id": str(ard.activity_id),
+                "assessment_id": str(ard.assessment_id),
+                "previous_assessment_id": str(ard.previous_assessment_id),
+                "value": ard.previous_value,
+                "comments": ard.previous_comments,
+            }
+        return deltas
+
+    def _buildActivityDetails(self, activity, responses, deltas):
+        """
+        Activity with its manager and reviewer responses, as returned by the activity list
+        Input: snapshot activity node, responses by (activity_id, type), deltas by type
+        Output: dict
+        """
+        activity_details = dict(activity.data)
+
+        # reviewer deltas are shown on the manager response and the other way round
+        user_response_details = {}
+        user_response = responses.get((activity.id, "ManagerResponse"))
+        if user_response is not None:
+            user_response_details = user_response.as_dict()
+            user_response_details["delta"] = deltas["ReviewerDelta"].get(
+                activity.id, {}
+            )
+
+        reviewer_response_details = {}
+        reviewer_response = responses.get((activity.id, "ReviewerResponse"))
+        if reviewer_response is not None:
+            reviewer_response_details = reviewer_response.as_dict()
+            reviewer_response_details["delta"] = deltas["ManagerDelta"].get(
+                activity.id, {}
+            )
+
+        activity_details["user_response_details"] = user_response_details
+        activity_details["reviewer_response_details"] = reviewer_response_details
+        return activity_details
+
+    @decor
+    def getAssessmentTree(self, **kwargs):
+        """
+        Fetch the whole checklist tree of an assessment (areas, subareas, items and
+        activities) with responses, delta counts, item grades and subarea scores.
+        Input: { "assessment_id": 123, "project_id":4434}
+        Output: {} dict containing the assessment and its areas
+
+        """
+        self._checkGetAssessmentDetailsParameters(**kwargs)
+        project_id = kwargs.get("project_id")
+        project_object = ProjectClass()
+        project = project_object._getProjectById(project_id)
+        if project is None:
+            raise AttributeIdNotFound("Project")
+
+        assessment_id = kwargs.get("assessment_id")
+        assessment = self._getAssessmentById(assessment_id)
+        if assessment is None:
+            raise AttributeIdNotFound("Assessment")
+        if not str(assessment.project_id) == project_id:
+            raise AnyExceptionHandler(
+                "Assessment does not belong to the given project!"
+            )
+
+        # the hierarchy comes from the snapshot, everything assessment specific
+        # is loaded with one query per table
+        snapshot = self._getChecklistSnapshot(assessment.checklist_id)
+        responses = self._getResponsesByActivity(assessment_id)
+        deltas = self._getDeltasByActivity(assessment_id)
+
+        assessment_item_scores = session.query(
+            AssessmentItemScoreModel.item_id,
+            AssessmentItemScoreModel.item_grade,
+            AssessmentItemScoreModel.item_score,
+        ).filter(AssessmentItemScoreModel.assessment_id == str(assessment_id))
+        assessment_item_scores = {
+            str(item_score.item_id): item_score for item_score in assessment_item_scores
+        }
+        assessment_subarea_scores = session.query(
+            AssessmentSubareaScoreModel.subarea_id,
+            AssessmentSubareaScoreModel.subarea_score,
+            AssessmentSubareaScoreModel.subarea_techdebt_count,
+        ).filter(AssessmentSubareaScoreModel.assessment_id == str(assessment_id))
+        assessment_subarea_scores = {
+            str(subarea_score.subarea_id): subarea_score
+            for subarea_score in assessment_subarea_scores
+        }
+
+        delta_counts = {}
+        for delta_type in deltas:
+            activity_delta_counts = self._getDeltaCountsByActivity(
+                assessment_id, delta_type
+            )
+            delta_counts[delta_type] = {
+                node_type: snapshot.rollUpCounts(activity_delta_counts, node_type)
+                for node_type in ("area", "subarea", "item")
+            }
+
+        def _summary(node):
+            return {
+                "delta": {
+                    "reviewer_delta": delta_counts["ManagerDelta"][node.type].get(
+                        node.id, 0
+                    ),
+                    "manager_delta": delta_counts["ReviewerDelta"][node.type].get(
+                        node.id, 0
+                    ),
+                }
+            }
+
+        areas = []
+        for area in snapshot.getAreas():
+            area_dict = dict(area.data)
+            area_dict["summary"] = _summary(area)
+            area_dict["subareas"] = []
+
+            for subarea in snapshot.getChildren(area.id):
+                subarea_dict = dict(subarea.data)
+                subarea_dict["summary"] = _summary(subarea)
+                subarea_score = assessment_subarea_scores.get(subarea.id)
+                subarea_dict["subarea_score"] = None
+                subarea_dict["subarea_techdebt_count"] = None
+                if subarea_score is not None:
+                    subarea_dict["subarea_score"] = subarea_score.subarea_score
+                    subarea_dict[
+                        "subarea_techdebt_count"
+                    ] = subarea_score.subarea_techdebt_count
+                subarea_dict["items"] = []
+
+                for item in snapshot.getChildren(subarea.id):
+                    item_dict = dict(item.data)
+                    item_score = assessment_item_scores.get(item.id)
+                    item_dict["grade"] = None
+                    item_dict["score"] = None
+                    if item_score is not None:
+                        if item_score.item_grade is not None:
+                            item_dict["grade"] = item_score.item_grade.value
+                        if item_score.item_score is not None:
+                            item_dict["score"] = str(item_score.item_score)
+                    item_dict["summary"] = _summary(item)
+                    item_dict["activities"] = [
+                        self._buildActivityDetails(activity, responses, deltas)
+                        for activity in snapshot.getChildren(item.id)
+                    ]
+                    subarea_dict["items"].append(item_dict)
+
+                area_dict["subareas"].append(subarea_dict)
+            areas.append(area_dict)
+
+        _assessment_dict = assessment.as_dict()
+        _assessment_dict["areas"] = areas
+        return _assessment_dict
+
     def _createAssessmentItemScoreRecords(self, items, assessment, **kwargs):
         authenticated_user_id = kwargs.get("authenticated_user_id")
 
-        assessment_item_scores = []
+        assessment_item_scores = [
+            {
+                "item_id": str(item.id),
+                "assessment_id": str(assessment.id),
+                "created_by": authenticated_user_id,
+            }
+            for item in items
+        ]
+        session.bulk_insert_mappings(AssessmentItemScoreModel, assessment_item_scores)
+
+    def _getPreviousAssessmentResponses(self, previous_assessment):
+        previous_responses = {
+            "ManagerResponse": {},
+            "ReviewerResponse": {},
+        }
+        if previous_assessment is None:
+            return previous_responses
+
+        responses = session.query(
+            ResponseModel.activity_id,
+            ResponseModel.value,
+            ResponseModel.comments,
+            ResponseModel.type,
+        ).filter(ResponseModel.assessment_id == str(previous_assessment.id))
+        for response in responses:
+            if response.type is None:
+                continue
+            previous_responses[response.type.name].setdefault(
+                str(response.activity_id), response
+            )
+        return previous_responses
+
+    def _seedAssessmentResponses(
+        self, assessment, checklist_id, previous_assessment, **kwargs
+    ):
+        authenticated_user_id = kwargs.get("authenticated_user_id")
+        previous_responses = self._getPreviousAssessmentResponses(
+            previous_assessment
+        )
+        snapshot = self._getChecklistSnapshot(checklist_id)
+        items = snapshot.getItems()
+        item_activities = snapshot.getActivitiesByItem()
+
+        self._createAssessmentItemScoreRecords(items, assessment, **kwargs)
+
+        responses = []
         for item in items:
-            assessment_item_score = AssessmentItemScoreModel()
-            assessment_item_score.item_id = str(item.id)
-            assessment_item_score.assessment_id = str(assessment.id)
-            assessment_item_score.created_by = authenticated_user_id
-            assessment_item_scores.append(assessment_item_score)
-        try:
-            session.add_all(assessment_item_scores)
-            session.commit()
-        except Exception as ex:
-            session.rollback()
-            raise AnyExceptionHandler(ex)
+            for activity in item_activities.get(str(item.id), []):
+                for response_type in ("ManagerResponse", "ReviewerResponse"):
+                    response = {
+                        "assessment_id": str(assessment.id),
+                        "activity_id": str(activity.id),
+                        "created_by": str(authenticated_user_id),
+                        "type": response_type,
+                    }
+                    # dumping previous assesments' activities response to new record
+                    previous_response = previous_responses[response_type].get(
+                        str(activity.id)
+                    )
+                    if previous_response is not None:
+                        response["value"] = previous_response.value
+                        response["comments"] = previous_response.comments
+                    responses.append(response)
+        session.bulk_insert_mappings(ResponseModel, responses)
+        progress_object = AssessmentProgressClass()
+        progress_object.createProgress(assessment.id, responses)
 
     def _generateStartAndEndDate(self, audit_frequency, **kwargs):
         # tz_NY = pytz.timezone("Asia/Kolkata")
@@ -480,6 +765,74 @@ class Assessment:
             assessment_creation_parameters["project_id"] = project_id
             self.createAssessment(assessment_creation_parameters)
 
+    def _insertResponseDeltas(
+        self,
+        assessment,
+        previous_assessment,
+        delta_type,
+        stored_response_filters,
+        compared_response_filters,
+        compare_comments=False,
+    ):
+        """
+        Materializes the deltas with a single INSERT ... SELECT joining the
+        responses against each other on activity_id.
+        Input: assessment, previous assessment, delta type, (assessment_id, type) of the
+        responses whose previous value is stored and of the responses compared to them
+        """
+        stored_response = aliased(ResponseModel)
+        compared_response = aliased(ResponseModel)
+        changed = stored_response.value.is_distinct_from(compared_response.value)
+        if compare_comments:
+            changed = or_(
+                changed,
+                stored_response.comments.is_distinct_from(compared_response.comments),
+            )
+
+        delta_table = AssessmentResponseDeltaModel.__table__
+        deltas = (
+            select(
+                func.gen_random_uuid(),
+                stored_response.activity_id,
+                cast(str(assessment.id), UUID),
+                cast(str(previous_assessment.id), UUID),
+                cast(literal(delta_type), delta_table.c.type.type),
+                # str() of a missing value used to be stored as "None"
+                func.coalesce(cast(stored_response.value, Text), "None"),
+                func.coalesce(stored_response.comments, ""),
+                cast(str(assessment.created_by), UUID),
+                func.timezone("utc", func.now()),
+            )
+            .join_from(
+                stored_response,
+                compared_response,
+                compared_response.activity_id == stored_response.activity_id,
+            )
+            .where(
+                stored_response.assessment_id == stored_response_filters[0],
+                stored_response.type == stored_response_filters[1],
+                compared_response.assessment_id == compared_response_filters[0],
+                compared_response.type == compared_response_filters[1],
+                changed,
+            )
+        )
+        session.execute(
+            insert(delta_table).from_select(
+                [
+                    delta_table.c.id,
+                    delta_table.c.activity_id,
+                    delta_table.c.assessment_id,
+                    delta_table.c.previous_assessment_id,
+                    delta_table.c.type,
+                    delta_table.c.previous_value,
+                    delta_table.c.previous_comments,
+                    delta_table.c.created_by,
+                    delta_table.c.created_on,
+                ],
+                deltas,
+            )
+        )
+
     def _storeReviewerDelta(self, assessment):
         # getting previously reviewed assessment if any
         previous_assessment = (
@@ -489,88 +842,32 @@ class Assessment:
                 AssessmentModel.status == "Reviewed",
             )
             .order_by(desc(AssessmentModel.start_date))
-            .limit(1)[0:1]
+            .first()
         )
 
-        if not previous_assessment:
+        if previous_assessment is None:
             print("No prev assessment found")
-            pass
-        else:
-            previous_assessment = previous_assessment[0]
-            # getting manager responses for respective assessment's activities
-            previous_assessment_manager_responses = session.query(
-                ResponseModel.activity_id,
-                ResponseModel.value,
-                ResponseModel.comments,
-            ).filter(
-                ResponseModel.assessment_id == str(previous_assessment.id),
-                ResponseModel.type == "ManagerResponse",
-            )
+            return
 
-            # getting reviever responses for respective assessment's activities
-            previous_assessment_reviewer_responses = session.query(
-                ResponseModel.activity_id,
-                ResponseModel.value,
-                ResponseModel.comments,
-            ).filter(
-                ResponseModel.assessment_id == str(previous_assessment.id),
-                ResponseModel.type == "ReviewerResponse",
+        # reviewer responses of the previous assessment which differ from its
+        # manager responses
+        try:
+            self._insertResponseDeltas(
+                assessment,
+                previous_assessment,
+                "ReviewerDelta",
+                (str(previous_assessment.id), "ReviewerResponse"),
+                (str(previous_assessment.id), "ManagerResponse"),
             )
-
-            manager_responses_dict = {
-                x.activity_id: [x.value, x.comments]
-                for x in previous_assessment_manager_responses
-            }
-            reviewer_responses_dict = {
-                x.activity_id: [x.value, x.comments]
-                for x in previous_assessment_reviewer_responses
-            }
-
-            final_delta_list = []
-
-            for mr_key, mr_val in manager_responses_dict.items():
-                if mr_key in reviewer_responses_dict:
-                    if str(mr_val[0]) != str(reviewer_responses_dict[mr_key][0]):
-                        # creating delta model object for reviever value record
-                        delta_model = AssessmentResponseDeltaModel()
-                        delta_model.previous_assessment_id = str(
-                            previous_assessment.id
-                        )
-
-                        if isinstance(reviewer_responses_dict[mr_key][0], enum.Enum):
-                            reviewer_responses_dict[mr_key][
-                                0
-                            ] = reviewer_responses_dict[mr_key][0].value
-                        delta_model.previous_value = str(
-                            reviewer_responses_dict[mr_key][0]
-                        )
-
-                        if type(reviewer_responses_dict[mr_key][1]) in [type(None)]:
-                            reviewer_responses_dict[mr_key][1] = ""
-                        delta_model.previous_comments = str(
-                            reviewer_responses_dict[mr_key][1]
-                        )
-
-                        delta_model.type = "ReviewerDelta"
-                        delta_model.activity_id = str(mr_key)
-                        delta_model.assessment_id = str(assessment.id)
-                        delta_model.created_by = str(assessment.created_by)
-
-                        final_delta_list.append(delta_model)
-
-            if final_delta_list:
-                try:
-                    session.add_all(final_delta_list)
-                    session.commit()
-                    print(f"_getAssessmentDelta Delta added")
-                except Exception as ex:
-                    session.rollback()
-                    print(f"_getAssessmentDelta exception block")
-                    raise AnyExceptionHandler(ex)
+            session.commit()
+            print(f"_getAssessmentDelta Delta added")
+        except Exception as ex:
+            session.rollback()
+            print(f"_getAssessmentDelta exception block")
+            raise AnyExceptionHandler(ex)
 
     def _storeManagerDelta(self, assessment):
         # getting previously submitted assessment
-        print("GOT THE ASSESSMENT assessment:", assessment)
         previous_assessment = (
             session.query(AssessmentModel)
             .filter(
@@ -578,103 +875,30 @@ class Assessment:
                 AssessmentModel.status.in_(["Submitted", "UnderReview", "Reviewed"]),
             )
             .order_by(desc(AssessmentModel.start_date))
-            .limit(1)[0:1]
+            .first()
         )
-        print("GOT THE ASSESSMENT previous_assessment:", previous_assessment)
 
-        if not previous_assessment:
+        if previous_assessment is None:
             print("No prev assessment found")
-            pass
-        else:
-            previous_assessment = previous_assessment[0]
-            # getting manager responses for previous assessment's activities
-            previous_assessment_manager_responses = session.query(
-                ResponseModel.activity_id,
-                ResponseModel.value,
-                ResponseModel.comments,
-            ).filter(
-                ResponseModel.assessment_id == str(previous_assessment.id),
-                ResponseModel.type == "ManagerResponse",
-            )
-
-            print(
-                "previous_assessment_manager_responses",
-                previous_assessment_manager_responses,
-            )
-            # getting managers responses for current assessment's activities
-            current_assessment_manager_responses = session.query(
-                ResponseModel.activity_id,
-                ResponseModel.value,
-                ResponseModel.comments,
-            ).filter(
-                ResponseModel.assessment_id == str(assessment.id),
-                ResponseModel.type == "ManagerResponse",
-            )
+            return
 
-            print(
-                "current_assessment_manager_responses",
-                current_assessment_manager_responses,
+        # manager responses of the previous assessment which differ in value or
+        # comments from the manager responses of this assessment
+        try:
+            self._insertResponseDeltas(
+                assessment,
+                previous_assessment,
+                "ManagerDelta",
+                (str(previous_assessment.id), "ManagerResponse"),
+                (str(assessment.id), "ManagerResponse"),
+                compare_comments=True,
             )
-            previous_assessment_manager_responses_dict = {
-                x.activity_id: [x.value, x.comments]
-                for x in previous_assessment_manager_responses
-            }
-            current_assessment_manager_responses_dict = {
-                x.activity_id: [x.value, x.comments]
-                for x in current_assessment_manager_responses
-            }
-
-            final_delta_list = []
-
-            for mr_key, mr_val in previous_assessment_manager_responses_dict.items():
-                if mr_key in current_assessment_manager_responses_dict:
-                    if (str(mr_val[0]) != str(current_assessment_manager_responses_dict[mr_key][0])) or (mr_val[1] != current_assessment_manager_responses_dict[mr_key][1]):
-                        # creating delta model object for managers value record
-                        delta_model = AssessmentResponseDeltaModel()
-                        delta_model.previous_assessment_id = str(
-                            previous_assessment.id
-                        )
-
-                        if isinstance(
-                            previous_assessment_manager_responses_dict[mr_key][0],
-                            enum.Enum,
-                        ):
-                            previous_assessment_manager_responses_dict[mr_key][
-                                0
-                            ] = previous_assessment_manager_responses_dict[mr_key][
-                                0
-                            ].value
-                        delta_model.previous_value = str(
-                            previous_assessment_manager_responses_dict[mr_key][0]
-                        )
-
-                        if type(
-                            previous_assessment_manager_responses_dict[mr_key][1]
-                        ) in [type(None)]:
-                            previous_assessment_manager_responses_dict[mr_key][
-                                1
-                            ] = ""
-                        delta_model.previous_comments = str(
-                            previous_assessment_manager_responses_dict[mr_key][1]
-                        )
-
-                        delta_model.type = "ManagerDelta"
-                        delta_model.activity_id = str(mr_key)
-                        delta_model.assessment_id = str(assessment.id)
-                        delta_model.created_by = str(assessment.created_by)
-
-                        final_delta_list.append(delta_model)
-
-            if final_delta_list:
-                try:
-                    print("final_delta_list", final_delta_list)
-                    session.add_all(final_delta_list)
-                    session.commit()
-                    print(f"_getAssessmentDelta Delta added")
-                except Exception as ex:
-                    session.rollback()
-                    print(f"_getAssessmentDelta exception block")
-                    raise AnyExceptionHandler(ex)
+            session.commit()
+            print(f"_getAssessmentDelta Delta added")
+        except Exception as ex:
+            session.rollback()
+            print(f"_getAssessmentDelta exception block")
+            raise AnyExceptionHandler(ex)
 
     def _checkCreateAssessmentParameters(self, **kwargs):
         required_parameters = {
@@ -762,38 +986,11 @@ class Assessment:
             .limit(1)[0:1]
         )
 
-        previous_assessment_manager_responses = False
-        previous_assessment_reviewer_responses = False
-
         if not previous_assessment:
-            pass
+            previous_assessment = None
         else:
             previous_assessment = previous_assessment[0]
 
-            # getting prev assessment Reviewer responses if any
-            previous_assessment_reviewer_responses = session.query(
-                ResponseModel.activity_id,
-                ResponseModel.value,
-                ResponseModel.comments,
-                ResponseModel.assessment_id,
-                ResponseModel.type,
-            ).filter(
-                ResponseModel.assessment_id == str(previous_assessment.id),
-                ResponseModel.type == "ReviewerResponse",
-            )
-
-            # getting prev assessment manager responses for all activities
-            previous_assessment_manager_responses = session.query(
-                ResponseModel.activity_id,
-                ResponseModel.value,
-                ResponseModel.comments,
-                ResponseModel.assessment_id,
-                ResponseModel.type,
-            ).filter(
-                ResponseModel.assessment_id == str(previous_assessment.id),
-                ResponseModel.type == "ManagerResponse",
-            )
-
         try:
             session.add(assessment)
             session.commit()
@@ -807,85 +1004,10 @@ class Assessment:
         print("Delta added")
         # Response creation
 
-        areas = (
-            session.query(AreaModel.id)
-            .filter(AreaModel.checklist_id == checklist_id)
-            .distinct()
-        )
-        subareas = (
-            session.query(SubareaModel.id)
-            .filter(SubareaModel.area_id.in_(areas))
-            .distinct()
-        )
-        items = (
-            session.query(ItemModel.id)
-            .filter(ItemModel.subarea_id.in_(subareas))
-            .distinct()
-        )
-        activities = session.query(ActivityModel.id).filter(
-            ActivityModel.item_id.in_(items)
-        )
-
-        self._createAssessmentItemScoreRecords(items, assessment, **kwargs)
-
-        responses = []
-        for activity in activities:
-            reviewer_response = ResponseModel()
-            reviewer_response.assessment_id = str(assessment.id)
-            reviewer_response.activity_id = str(activity.id)
-            reviewer_response.created_by = str(authenticated_user_id)
-            reviewer_response.type = "ReviewerResponse"
-
-            # filtering previous assessment responses as per activity id
-            if not previous_assessment_reviewer_responses:
-                pass
-            else:
-                previous_activity_reviewer_response = (
-                    previous_assessment_reviewer_responses.filter(
-                        ResponseModel.activity_id == str(activity.id)
-                    ).first()
-                )
-
-                # dumping previous assesments' activities manager's response to new object
-                if previous_activity_reviewer_response is not None:
-                    reviewer_response.comments = (
-                        previous_activity_reviewer_response.comments
-                    )
-                    reviewer_response.value = (
-                        previous_activity_reviewer_response.value
-                    )
-
-            manager_response = ResponseModel()
-            manager_response.assessment_id = str(assessment.id)
-            manager_response.activity_id = str(activity.id)
-            manager_response.created_by = str(authenticated_user_id)
-            manager_response.type = "ManagerResponse"
-
-            # filtering previous assessment responses as per activity id
-            if not previous_assessment_manager_responses:
-                pass
-            else:
-                previous_activity_manager_response = (
-                    previous_assessment_manager_responses.filter(
-                        ResponseModel.activity_id == str(activity.id)
-                    ).first()
-                )
-
-                # dumping previous assesments' activities manager's response to new object
-                if previous_activity_manager_response is not None:
-                    manager_response.comments = (
-                        previous_activity_manager_response.comments
-                    )
-                    manager_response.value = previous_activity_manager_response.value
-
-            responses.extend(
-                [
-                    manager_response,
-                    reviewer_response,
-                ]
-            )
         try:
-            session.add_all(responses)
+            self._seedAssessmentResponses(
+                assessment, checklist_id, previous_assessment, **kwargs
+            )
             session.commit()
             session.refresh(assessment)
             kwargs["assessment_id"] = str(assessment.id)
@@ -963,164 +1085,292 @@ class Assessment:
             "subarea_item_score": subarea_item_score,
         }
 
+    def _getChecklistSnapshot(self, checklist_id):
+        snapshot = getChecklistSnapshot(checklist_id)
+        if snapshot is None:
+            raise AttributeIdNotFound("Checklist")
+        return snapshot
+
+    def _getChecklistItems(self, checklist_id):
+        return self._getChecklistSnapshot(checklist_id).getItems()
+
+    def _getChecklistActivitiesByItem(self, checklist_id):
+        return self._getChecklistSnapshot(checklist_id).getActivitiesByItem()
+
+    def _getDeltaCountsByActivity(self, assessment_id, delta_type):
+        delta_counts = (
+            session.query(
+                AssessmentResponseDeltaModel.activity_id,
+                func.count(AssessmentResponseDeltaModel.id),
+            )
+            .filter(
+                AssessmentResponseDeltaModel.assessment_id == str(assessment_id),
+                AssessmentResponseDeltaModel.type == delta_type,
+            )
+            .group_by(AssessmentResponseDeltaModel.activity_id)
+        )
+        return {str(activity_id): count for activity_id, count in delta_counts}
+
+    def _getResponseValuesByActivity(
+        self, assessment_id, response_type, activity_ids=None
+    ):
+        responses = session.query(
+            ResponseModel.activity_id,
+            ResponseModel.value,
+        ).filter(
+            ResponseModel.assessment_id == str(assessment_id),
+            ResponseModel.type == response_type,
+        )
+        if activity_ids is not None:
+            responses = responses.filter(ResponseModel.activity_id.in_(activity_ids))
+        return {str(response.activity_id): response.value for response in responses}
+
+    def _getLastCompletedTask(self, assessment_id, task_id):
+        return (
+            session.query(GradeCalculationTaskModel)
+            .filter(
+                GradeCalculationTaskModel.assessment_id == str(assessment_id),
+                GradeCalculationTaskModel.status == True,
+                GradeCalculationTaskModel.id != str(task_id),
+            )
+            .order_by(desc(GradeCalculationTaskModel.created_on))
+            .first()
+        )
+
+    def _getItemsToGrade(
+        self, assessment_id, snapshot, response_type, task, full_recalculation=False
+    ):
+        """
+        Items whose grade may have changed since the last completed grade calculation
+        Input: assessment_id, checklist snapshot, response type, current task
+        Output: (list of item nodes, True when all the items are graded)
+        """
+        items = snapshot.getItems()
+        if full_recalculation:
+            return items, True
+
+        # stored item grades are only reused when they were calculated from
+        # the same responses of the same checklist version
+        last_task = self._getLastCompletedTask(assessment_id, task.id)
+        if last_task is None or last_task.response_type is None:
+            return items, True
+        if not last_task.response_type.name == response_type:
+            return items, True
+        checklist_modified_on = snapshot.version[1]
+        if checklist_modified_on is not None and (
+            datetime.fromisoformat(checklist_modified_on) >= last_task.created_on
+        ):
+            return items, True
+
+        # responses changed (or defaulted) after the last task was created
+        touched_activities = (
+            session.query(ResponseModel.activity_id)
+            .filter(
+                ResponseModel.assessment_id == str(assessment_id),
+                ResponseModel.type == response_type,
+                func.coalesce(ResponseModel.modified_on, ResponseModel.created_on)
+                >= last_task.created_on,
+            )
+            .distinct()
+        )
+        graded_items = session.query(
+            AssessmentItemScoreModel.item_id, AssessmentItemScoreModel.modified_on
+        ).filter(
+            AssessmentItemScoreModel.assessment_id == str(assessment_id),
+            AssessmentItemScoreModel.item_grade != None,
+        )
+        graded_item_ids = set()
+        item_ids = set()
+        for item_score in graded_items:
+            graded_item_ids.add(str(item_score.item_id))
+            # a manual grade only lasts until the next calculation, like a full one
+            if (
+                item_score.modified_on is not None
+                and item_score.modified_on >= last_task.created_on
+            ):
+                item_ids.add(str(item_score.item_id))
+
+        item_ids.update(
+            snapshot.getAncestorId(str(activity.activity_id), "item")
+            for activity in touched_activities
+        )
+        return [
+            item
+            for item in items
+            if item.id in item_ids or item.id not in graded_item_ids
+        ], False
+
+    def _calculateItemGrade(self, activities, response_values):
+        is_mimh = False
+        is_mh = False
+        is_gh = False
+        na_count = 0
+        no_count = 0
+        for activity in activities:
+            activity_id = str(activity.id)
+            if activity_id not in response_values:
+                raise AnyExceptionHandler(
+                    f"Response not found for activity with Id {activity_id}"
+                )
+            value = response_values[activity_id]
+            if value is None:
+                raise AnyExceptionHandler(
+                    f"Response not filled for activity with Id {activity_id}"
+                )
+            if value.name == "No":
+                no_count += 1
+                # Most Important Must Have
+                if activity.importance == "MIMH":
+                    is_mimh = True
+                # Must Have
+                elif activity.importance == "MH":
+                    is_mh = True
+                # Good to Have
+                elif activity.importance == "GH":
+                    is_gh = True
+            if value.name == "NA":
+                na_count += 1
+
+        activities_count = len(activities)
+        if na_count == activities_count:
+            grade = "NA"
+        elif no_count == activities_count:
+            grade = "D"
+        elif no_count + na_count == activities_count:
+            grade = "D"
+        elif is_mimh:
+            grade = "D"
+        elif is_mh:
+            grade = "C"
+        elif is_gh:
+            grade = "B"
+        else:
+            grade = "A"
+        return grade
+
+    def _saveAssessmentItemScores(self, assessment_id, item_scores):
+        existing_item_scores = session.query(
+            AssessmentItemScoreModel.id,
+            AssessmentItemScoreModel.item_id,
+        ).filter(AssessmentItemScoreModel.assessment_id == str(assessment_id))
+        existing_item_score_ids = {
+            str(item_score.item_id): item_score.id
+            for item_score in existing_item_scores
+        }
+
+        update_mappings = []
+        insert_mappings = []
+        for item_id, (grade, score) in item_scores.items():
+            mapping = {
+                "item_id": item_id,
+                "assessment_id": str(assessment_id),
+                "item_grade": grade,
+                "item_score": score,
+            }
+            if item_id in existing_item_score_ids:
+                mapping["id"] = existing_item_score_ids[item_id]
+                update_mappings.append(mapping)
+            else:
+                insert_mappings.append(mapping)
+
+        if update_mappings:
+            session.bulk_update_mappings(AssessmentItemScoreModel, update_mappings)
+        if insert_mappings:
+            session.bulk_insert_mappings(AssessmentItemScoreModel, insert_mappings)
+
     def gradeCalculator(self, **kwargs):
         assessment_id = kwargs.get("assessment_id")
         assessment = self._getAssessmentById(assessment_id)
         if assessment is None:
             raise AttributeIdNotFound("Assessment")
         checklist_id = str(assessment.checklist_id)
+        assessment_id = str(assessment_id)
+        snapshot = self._getChecklistSnapshot(checklist_id)
+        progress_object = AssessmentProgressClass()
+        full_recalculation = (
+            kwargs.get("full_recalculation", False) or not GRADE_CALCULATION_INCREMENTAL
+        )
         responseType = None
         if kwargs["status"] == "Submitted":
             responseType = "ManagerResponse"
-            (
-                responses,
-                responses_comments_none,
-            ) = self._checkIfAssessmentComplete(assessment_id, responseType)
-            # set null respone by manager to NO
+            # set null respone by manager to NO, already done by
+            # updateAssessmentStatus unless the task was queued before that
+            try:
+                self._defaultManagerActivityResponses(assessment_id)
+                progress_object.rebuildProgress(assessment_id)
+                session.commit()
+            except Exception as ex:
+                session.rollback()
+                raise AnyExceptionHandler(ex)
             print("Assessment completion checked")
-            if responses:
-                for _response in responses:
-                    _response.value = ResponseValue.No
-                    try:
-                        session.add(_response)
-                        session.commit()
-                        session.refresh(_response)
-                    except Exception as ex:
-                        session.rollback()
-                        raise AnyExceptionHandler(ex)
 
         elif kwargs["status"] == "Reviewed":
             responseType = "ReviewerResponse"
-            (
-                responses,
-                responses_comments_none,
-            ) = self._checkIfAssessmentComplete(assessment_id, responseType)
-
-            print("Assessment completion checked")
-            for response in responses:
-                self._defaultReviewerActivityRespone(response)
-            session.commit()
+            # set null reviewer responses to the managers response
+            try:
+                self._defaultReviewerActivityResponses(assessment_id)
+                progress_object.rebuildProgress(assessment_id)
+                session.commit()
+            except Exception as ex:
+                session.rollback()
+                raise AnyExceptionHandler(ex)
             print("setting default reviewer activity reponse to managers response")
-            # contains all the responses for reviewers
 
-        areas = session.query(AreaModel.id).filter(
-            AreaModel.checklist_id == checklist_id
+        task = self._getGradeCalculationTaskById(kwargs["grade_calculation_task_id"])
+        print("Grade Calculation Task", task.as_dict())
+
+        # checklist tree comes from the snapshot and responses are pulled once,
+        # grades are calculated in memory, only for the items with responses
+        # changed since the last calculation unless a full recalculation is asked
+        items, full_recalculation = self._getItemsToGrade(
+            assessment_id, snapshot, responseType, task, full_recalculation
         )
-        subareas = session.query(SubareaModel.id).filter(
-            SubareaModel.area_id.in_(areas)
+        item_activities = snapshot.getActivitiesByItem()
+        response_values = self._getResponseValuesByActivity(
+            assessment_id,
+            responseType,
+            activity_ids=None
+            if full_recalculation
+            else [
+                activity.id
+                for item in items
+                for activity in item_activities.get(str(item.id), [])
+            ],
+        )
+        print(
+            "Meta data Pulled",
+            "full" if full_recalculation else "incremental",
+            len(items),
         )
-        # for subarea in subareas:
-        #     items = session.query(ItemModel).filter(SubareaModel.id == subarea.id)
-        items = session.query(ItemModel).filter(ItemModel.subarea_id.in_(subareas))
-        subarea_techdebt_count = {}
-        subarea_item_score = {}
-        assessment_item_scores = []
-        print("Meta data Pulled")
-        for item in items:
-            print("Iterating Item")
-            activities = session.query(ActivityModel).filter(
-                ActivityModel.item_id == str(item.id)
-            )
-
-            is_mimh = False
-            is_mh = False
-            is_gh = False
-            na_count = 0
-            assessment_id = str(assessment_id)
-            # subarea_techdebt_count[str(item.subarea_id)] = 0
-            subarea_item_score[str(item.subarea_id)] = []
-            no_count = 0
-            for activity in activities:
-                print("Iterating Activity in Item")
-                activity_id = str(activity.id)
-
-                response = (
-                    session.query(ResponseModel)
-                    .filter(
-                        ResponseModel.activity_id == activity_id,
-                        ResponseModel.type == responseType,
-                        ResponseModel.assessment_id == assessment_id,
-                    )
-                    .first()
-                )
 
-                # print(response.type)
-                # print(response.type.name)
-                if response.value.name == "No":
-                    # subarea_techdebt_count[str(item.subarea_id)] = (
-                    #     subarea_techdebt_count[str(item.subarea_id)]
-                    #     + 1
-                    # )
-                    # print("activity_importance--" * 8)
-                    # print(activity.importance)
-                    # print(activity_id)
-                    # print("Noooooo")
-                    no_count += 1
-                    activity_id = response.activity_id
-                    activity = (
-                        session.query(ActivityModel)
-                        .filter(
-                            ActivityModel.id == str(activity_id),
-                        )
-                        .first()
-                    )
-                    # Most Important Must Have
-                    if activity.importance.name == "MIMH":
-                        is_mimh = True
-                    # Must Have
-                    elif activity.importance.name == "MH":
-                        is_mh = True
-                    # Good to Have
-                    elif activity.importance.name == "GH":
-                        is_gh = True
-                if response.value.name == "NA":
-                    na_count += 1
-
-            if na_count == activities.count():
-                grade = "NA"
-            elif no_count == activities.count():
-                grade = "D"
-            elif no_count + na_count == activities.count():
-                grade = "D"
-            elif is_mimh:
-                grade = "D"
-            elif is_mh:
-                grade = "C"
-            elif is_gh:
-                grade = "B"
-            else:
-                grade = "A"
-            assessment_item_score = (
-                session.query(AssessmentItemScoreModel)
-                .filter(
-                    AssessmentItemScoreModel.assessment_id == str(assessment.id),
-                    AssessmentItemScoreModel.item_id == str(item.id),
-                )
-                .first()
+        item_scores = {}
+        for item in items:
+            grade = self._calculateItemGrade(
+                item_activities.get(str(item.id), []), response_values
             )
-
-            # if not exist create
-            if not assessment_item_score:
-                assessment_item_score = AssessmentItemScoreModel()
-            assessment_item_score.assessment_id = str(assessment.id)
-            assessment_item_score.item_id = str(item.id)
-            assessment_item_score.item_grade = grade
-            assessment_item_score.item_score = self._fetchItemScore(
+            item_scores[str(item.id)] = (
                 grade,
-                item.effective_weightage,
+                self._fetchItemScore(grade, item.effective_weightage),
             )
 
-            assessment_item_scores.append(assessment_item_score)
-        task = self._getGradeCalculationTaskById(kwargs["grade_calculation_task_id"])
-        print("Grade Calculation Task", task.as_dict())
         try:
-            session.add_all(assessment_item_scores)
+            self._saveAssessmentItemScores(assessment_id, item_scores)
             session.commit()
             if kwargs["status"] == "Reviewed":
-                self._addAndCheckAssessmentItemGrades(assessment)
+                self._addAndCheckAssessmentItemGrades(
+                    assessment,
+                    items=snapshot.getItems(),
+                    subarea_ids=None
+                    if full_recalculation
+                    else {item.parent_id for item in items},
+                )
                 assessment.tech_debt = self._calculateTechDebt(assessment_id)
+                # results of a Reviewed assessment are final, stored once
+                self._storeResultSnapshot(assessment, task.id)
             print("Overall Score", assessment.overall_score)
             task.status = True
+            task.response_type = responseType
+            task.modified_on = datetime.utcnow()
             session.commit()
         except Exception as ex:
             session.rollback()
@@ -1128,40 +1378,122 @@ class Assessment:
         finally:
             session.close()
 
-        # subarea_item_score[str(item.subarea_id)].append(
-        #     (
-        #         assessment_item_score.item_score,
-        #         item.effective_weightage,
-        #     )
-        # )
-        # print("Inside Assessment subarea score-- *" * 8)
-        # result_dict = self._addSubareaScore(subarea_item_score)
-        # print("Outside Assessment subarea score-- *" * 8)
-        # print(result_dict)
-        # assessment_subareas = []
-        # for key, value in result_dict.get(
-        #     "subarea_item_score"
-        # ).items():
-
-        #     assessment_subarea_score = AssessmentSubareaScoreModel()
-        #     assessment_subarea_score.subarea_id = str(key)
-        #     # assessment_subarea_score.subarea_score = value
-        #     assessment_subarea_score.assessment_id = str(
-        #         assessment.id
-        #     )
-        #     assessment_subarea_score.subarea_techdebt_count = (
-        #         subarea_techdebt_count[key]
-        #     )
-        #     assessment_subareas.append(assessment_subarea_score)
-        # try:
-        #     session.add_all(assessment_subareas)
-
-        #     session.commit()
-        # except Exception as ex:
-        #     session.rollback()
-        #     raise AnyExceptionHandler(ex)
-        # finally:
-        #     session.close()
+    def _buildAssessmentResults(self, assessment):
+        """
+        Results document of an assessment from its subarea scores
+        Input: assessment
+        Output: dict {"overall_score": , "assessment_result_details": []}
+        """
+        snapshot = self._getChecklistSnapshot(assessment.checklist_id)
+        assessment_subarea_scores = session.query(
+            AssessmentSubareaScoreModel.subarea_id,
+            AssessmentSubareaScoreModel.subarea_score,
+            AssessmentSubareaScoreModel.subarea_techdebt_count,
+        ).filter(AssessmentSubareaScoreModel.assessment_id == str(assessment.id))
+        assessment_subarea_scores = {
+            str(subarea_score.subarea_id): subarea_score
+            for subarea_score in assessment_subarea_scores
+        }
+
+        assessment_result_details = []
+
+        for area in snapshot.getAreas():
+            response = {}
+            response["area_id"] = area.id
+            response["name"] = area.name
+            response["subareas"] = []
+
+            for subarea in snapshot.getChildren(area.id):
+                subarea_response = {}
+                subarea_response["subarea_id"] = subarea.id
+                subarea_response["name"] = subarea.name
+
+                assessment_subarea_score = assessment_subarea_scores.get(subarea.id)
+                if not assessment_subarea_score is None:
+                    subarea_response[
+                        "subarea_score"
+                    ] = assessment_subarea_score.subarea_score
+                    subarea_response[
+                        "subarea_techdebt_count"
+                    ] = assessment_subarea_score.subarea_techdebt_count
+                    response["subareas"].append(subarea_response)
+
+            assessment_result_details.append(response)
+
+        result = {}
+        result["overall_score"] = assessment.overall_score
+        result["assessment_result_details"] = assessment_result_details
+        return result
+
+    def _getResultSnapshot(self, assessment_id):
+        result_snapshot = (
+            session.query(AssessmentResultSnapshotModel.result)
+            .filter(
+                AssessmentResultSnapshotModel.assessment_id == str(assessment_id),
+                AssessmentResultSnapshotModel.version == RESULT_SNAPSHOT_VERSION,
+            )
+            .first()
+        )
+        if result_snapshot is None:
+            return None
+        return result_snapshot.result
+
+    def _storeResultSnapshot(self, assessment, task_id):
+        # one snapshot per assessment, a recalculation replaces it
+        result = self._buildAssessmentResults(assessment)
+        statement = pg_insert(AssessmentResultSnapshotModel.__table__).values(
+            id=str(uuid.uuid4()),
+            assessment_id=str(assessment.id),
+            grade_calculation_task_id=str(task_id),
+            version=RESULT_SNAPSHOT_VERSION,
+            result=result,
+            created_on=datetime.utcnow(),
+        )
+        session.execute(
+            statement.on_conflict_do_update(
+                index_elements=["assessment_id"],
+                set_={
+                    "grade_calculation_task_id": statement.excluded.grade_calculation_task_id,
+                    "version": statement.excluded.version,
+                    "result": statement.excluded.result,
+                    "modified_on": statement.excluded.created_on,
+                },
+            )
+        )
+
+    def _overrideItemGrade(self, assessment, assessment_item_score, grade, item):
+        """
+        Manual grade of an item, not committed. The subarea and overall scores and
+        the results snapshot of a Reviewed assessment are rebuilt with it
+        Input: assessment, its AssessmentItemScore of the item, grade, item
+        """
+        assessment_item_score.item_grade = grade
+        assessment_item_score.item_score = self._fetchItemScore(
+            grade, item.effective_weightage
+        )
+        # later incremental grade calculations regrade the item from its responses
+        assessment_item_score.modified_on = datetime.utcnow()
+        session.add(assessment_item_score)
+        if not assessment.status.name == "Reviewed":
+            return
+        session.flush()
+        snapshot = self._getChecklistSnapshot(assessment.checklist_id)
+        self._addAndCheckAssessmentItemGrades(
+            assessment,
+            items=snapshot.getItems(),
+            subarea_ids={str(item.subarea_id)},
+        )
+        # the lookups of the services may have closed the session
+        session.add(assessment)
+        result_snapshot = (
+            session.query(AssessmentResultSnapshotModel.grade_calculation_task_id)
+            .filter(AssessmentResultSnapshotModel.assessment_id == str(assessment.id))
+            .first()
+        )
+        if result_snapshot is not None:
+            self._storeResultSnapshot(
+                assessment, result_snapshot.grade_calculation_task_id
+            )
 
     def _checkIfAssessmentComplete(self, assessment_id, type):
         responses = session.query(ResponseModel).filter(
@@ -1196,78 +1528,82 @@ class Assessment:
             session.rollback()
             raise AnyExceptionHandler(ex)
 
-    def _getTechdebtCount(self, subarea_id, assessment_id):
-        subareas = session.query(SubareaModel.id).filter(
-            SubareaModel.id == str(subarea_id)
+    def _getSubareaTechdebtCounts(self, checklist_id, assessment_id):
+        techdebt_counts = (
+            session.query(ResponseModel.activity_id, func.count(ResponseModel.id))
+            .filter(
+                ResponseModel.assessment_id == str(assessment_id),
+                ResponseModel.type == "ReviewerResponse",
+                ResponseModel.value == "No",
+            )
+            .group_by(ResponseModel.activity_id)
         )
-        items = session.query(ItemModel.id).filter(
-            ItemModel.subarea_id.in_(subareas)
+        # activity counts are summed per subarea through the checklist snapshot
+        return self._getChecklistSnapshot(checklist_id).rollUpCounts(
+            {str(activity_id): count for activity_id, count in techdebt_counts},
+            "subarea",
         )
 
-        activities = session.query(ActivityModel.id).filter(
-            ActivityModel.item_id.in_(items)
+    def _defaultManagerActivityResponses(self, assessment_id):
+        # update the null manager responses to No in a single statement
+        session.query(ResponseModel).filter(
+            ResponseModel.assessment_id == str(assessment_id),
+            ResponseModel.value == None,
+            ResponseModel.type == "ManagerResponse",
+        ).update(
+            {
+                ResponseModel.value: ResponseValue.No,
+                ResponseModel.modified_on: datetime.utcnow(),
+            },
+            synchronize_session=False,
         )
 
-        manager_responses = session.query(ResponseModel.id).filter(
-            ResponseModel.activity_id.in_(activities),
+    def _defaultReviewerActivityResponses(self, assessment_id):
+        # update the null reviewer responses to the manager_response value
+        # for the same activity id in a single UPDATE ... FROM statement
+        manager_response = aliased(ResponseModel)
+        session.query(ResponseModel).filter(
             ResponseModel.assessment_id == str(assessment_id),
+            ResponseModel.value == None,
             ResponseModel.type == "ReviewerResponse",
-            ResponseModel.value == "No",
-        )[:]
-
-        techdebtCount = len(manager_responses)
-        return techdebtCount
-
-    def _defaultReviewerActivityRespone(self, reviewer_response):
-        # get manager response value for the same activity id
-
-        manager_response = (
-            session.query(ResponseModel)
-            .filter(
-                ResponseModel.activity_id == str(reviewer_response.activity_id),
-                ResponseModel.assessment_id == str(reviewer_response.assessment_id),
-                ResponseModel.type == "ManagerResponse",
-            )
-            .first()
+            manager_response.assessment_id == ResponseModel.assessment_id,
+            manager_response.activity_id == ResponseModel.activity_id,
+            manager_response.type == "ManagerResponse",
+        ).update(
+            {
+                ResponseModel.value: manager_response.value,
+                ResponseModel.modified_on: datetime.utcnow(),
+            },
+            synchronize_session=False,
         )
-        _manager_response_dict = manager_response.as_dict()
-        _manager_response_value = _manager_response_dict["value"]
-
-        # update the null respone value of reviewer_response to the manager_response value
-        reviewer_response.value = _manager_response_value
-        try:
-            session.add(reviewer_response)
-            # session.refresh(reviewer_response)
-        except Exception as ex:
-            session.rollback()
-            raise AnyExceptionHandler(ex)
 
     def _addAndCheckAssessmentItemGrades(self, assessment, **kwargs):
-        assessment_id = assessment.id
+        assessment_id = str(assessment.id)
         checklist_id = assessment.checklist_id
-        areas = session.query(AreaModel.id).filter(
-            AreaModel.checklist_id == str(checklist_id)
-        )
-        subareas = session.query(SubareaModel.id).filter(
-            SubareaModel.area_id.in_(areas)
-        )
-        items = session.query(ItemModel).filter(ItemModel.subarea_id.in_(subareas))
-        assessment_item_scores = []
+        items = kwargs.get("items")
+        if items is None:
+            items = self._getChecklistItems(checklist_id)
+        # subareas whose items were regraded, None when all the rows are written.
+        # scores of all subareas are still aggregated in memory for the overall score
+        subarea_ids = kwargs.get("subarea_ids")
+
+        assessment_item_scores = session.query(
+            AssessmentItemScoreModel.item_id,
+            AssessmentItemScoreModel.item_grade,
+            AssessmentItemScoreModel.item_score,
+        ).filter(AssessmentItemScoreModel.assessment_id == assessment_id)
+        assessment_item_scores = {
+            str(item_score.item_id): item_score for item_score in assessment_item_scores
+        }
+
         subarea_item_score = {}
         print("Before items loop")
         for item in items:
-            if not subarea_item_score.get(str(item.subarea_id)):
-                subarea_item_score[str(item.subarea_id)] = []
-            assessment_item_score = (
-                session.query(AssessmentItemScoreModel)
-                .filter(
-                    AssessmentItemScoreModel.assessment_id == str(assessment_id),
-                    AssessmentItemScoreModel.item_id == str(item.id),
-                )
-                .first()
-            )
+            if not subarea_item_score.get(item.parent_id):
+                subarea_item_score[item.parent_id] = []
 
             item_id = str(item.id)
+            assessment_item_score = assessment_item_scores.get(item_id)
             if assessment_item_score is None:
                 raise AnyExceptionHandler(
                     f"Grade not filled for item with Id {item_id}"
@@ -1278,13 +1614,7 @@ class Assessment:
                     f"Grade not filled for item with Id 123 {item_id}"
                 )
 
-            # self._addItemScore(
-            #     assessment_item_score,
-            #     str(assessment_item_score.item_grade.name),
-            #     item.effective_weightage,
-            # )
-
-            subarea_item_score[str(item.subarea_id)].append(
+            subarea_item_score[item.parent_id].append(
                 (
                     assessment_item_score.item_score,
                     item.effective_weightage,
@@ -1295,39 +1625,53 @@ class Assessment:
         result_dict = self._addSubareaScore(subarea_item_score)
         print("Overall result", result_dict)
         assessment.overall_score = result_dict.get("overall_score")
-        assessment_subareas = []
+
+        existing_subarea_scores = session.query(
+            AssessmentSubareaScoreModel.id,
+            AssessmentSubareaScoreModel.subarea_id,
+        ).filter(AssessmentSubareaScoreModel.assessment_id == assessment_id)
+        existing_subarea_score_ids = {
+            str(subarea_score.subarea_id): subarea_score.id
+            for subarea_score in existing_subarea_scores
+        }
+        subarea_techdebt_counts = self._getSubareaTechdebtCounts(
+            checklist_id, assessment_id
+        )
+
+        update_mappings = []
+        insert_mappings = []
         print("Before subarea item score loop")
         for key, value in result_dict.get("subarea_item_score").items():
-            assessment_subarea_score = (
-                session.query(AssessmentSubareaScoreModel)
-                .filter(
-                    AssessmentSubareaScoreModel.assessment_id == str(assessment.id),
-                    AssessmentSubareaScoreModel.subarea_id == str(key),
-                )
-                .first()
-            )
-
+            mapping = {
+                "subarea_id": str(key),
+                "subarea_score": value,
+                "assessment_id": assessment_id,
+                "subarea_techdebt_count": subarea_techdebt_counts.get(str(key), 0),
+            }
             # if not exist create
-            if not assessment_subarea_score:
-                assessment_subarea_score = AssessmentSubareaScoreModel()
-            assessment_subarea_score.subarea_id = str(key)
-            assessment_subarea_score.subarea_score = value
-            assessment_subarea_score.assessment_id = str(assessment.id)
-            assessment_subarea_score.subarea_techdebt_count = self._getTechdebtCount(
-                str(key), assessment_id
-            )
-            assessment_subareas.append(assessment_subarea_score)
+            if str(key) in existing_subarea_score_ids:
+                if subarea_ids is not None and str(key) not in subarea_ids:
+                    continue
+                mapping["id"] = existing_subarea_score_ids[str(key)]
+                update_mappings.append(mapping)
+            else:
+                insert_mappings.append(mapping)
         print("After subarea item score loop")
         try:
-            session.add_all(assessment_subareas)
-            session.commit()
+            if update_mappings:
+                session.bulk_update_mappings(
+                    AssessmentSubareaScoreModel, update_mappings
+                )
+            if insert_mappings:
+                session.bulk_insert_mappings(
+                    AssessmentSubareaScoreModel, insert_mappings
+                )
+            # committed by the caller with the overall score and the results snapshot
+            session.flush()
         except Exception as ex:
             print("Error adding subareas", ex)
             session.rollback()
             raise AnyExceptionHandler(ex)
-        # finally:
-        #     session.close()
-        # return (assessment_item_scores, items)
 
     # def _checkGetAssessmentListParameters(self, **kwargs):
     #     required_parameters = {
@@ -1360,11 +1704,15 @@ class Assessment:
 
         project_id = kwargs.get("project_id")
         authenticated_user_id = kwargs.get("authenticated_user_id")
-        user_object = UserClass()
-        authenticated_user = user_object._getUserById(authenticated_user_id)
-        if authenticated_user is None:
-            raise AttributeIdNotFound("Authenticated User Id")
-        if authenticated_user.status.name != "Verified":
+        # status resolved by the authorizer, otherwise the user is looked up
+        authenticated_user_status = kwargs.get("authenticated_user_status")
+        if authenticated_user_status is None:
+            user_object = UserClass()
+            authenticated_user = user_object._getUserById(authenticated_user_id)
+            if authenticated_user is None:
+                raise AttributeIdNotFound("Authenticated User Id")
+            authenticated_user_status = authenticated_user.status.name
+        if authenticated_user_status != "Verified":
             raise AnyExceptionHandler(
                 "An unverified/inactive user cannot make changes to the assessment status"
             )
@@ -1434,9 +1782,6 @@ class Assessment:
             calculation_task_id = str(calculationTask.id)
             calculation_task_status = calculationTask.status
             print("Calculation task created", calculationTask.as_dict())
-            self._queueGradeCalculation(
-                assessment_id, calculation_task_id, status=status
-            )
 
             if status == "Submitted":
                 print(
@@ -1444,6 +1789,9 @@ class Assessment:
                 )
                 self._storeManagerDelta(assessment)
                 print("Manager Delta added!")
+                # set null respone by manager to NO with the status, a Reviewed
+                # calculation may supersede the one of this submission
+                self._defaultManagerActivityResponses(assessment_id)
 
         assessment.status = status
         assessment.modified_by = authenticated_user_id
@@ -1456,6 +1804,12 @@ class Assessment:
         except Exception as ex:
             session.rollback()
             raise AnyExceptionHandler(ex)
+        if status in ("Submitted", "Reviewed"):
+            # queued once the new task is committed as the active one, the
+            # consumer acknowledges the messages of inactive tasks
+            self._queueGradeCalculation(
+                assessment_id, calculation_task_id, status=status
+            )
         assessmentDict = assessment.as_dict()
         assessmentDict["calculation_task_id"] = calculation_task_id
         assessmentDict["calculation_task_status"] = calculation_task_status
@@ -1471,13 +1825,16 @@ class Assessment:
 
         return assessmentDict
 
-    def _queueGradeCalculation(self, assessment_id, task_id, status="Submitted"):
+    def _queueGradeCalculation(
+        self, assessment_id, task_id, status="Submitted", full_recalculation=False
+    ):
         print("queuing Calculation to sqs")
         messageBody = json.dumps(
             {
                 "assessment_id": str(assessment_id),
                 "grade_calculation_task_id": str(task_id),
                 "status": status,
+                "full_recalculation": full_recalculation,
             }
         )
         client = boto3.client("sqs")
@@ -1500,7 +1857,7 @@ class Assessment:
             return None
         return task
 
-    def _getActiveTask(self, assessment_id):
+    def _getActiveTask(self, assessment_id, raise_errors=False):
         try:
             task = (
                 session.query(GradeCalculationTaskModel)
@@ -1513,6 +1870,8 @@ class Assessment:
 
         except Exception as ex:
             print("error retreiving GradeCalculationTask record", ex)
+            if raise_errors:
+                raise AnyExceptionHandler(ex)
             return None
         return task
 
@@ -1563,67 +1922,15 @@ class Assessment:
         return result
 
     def _getAssessmentReviewerDelta(self, assessment):
-        assessment_id = assessment.id
-        checklist_id = assessment.checklist_id
-
-        areas = session.query(AreaModel).filter(
-            AreaModel.checklist_id == checklist_id
-        )
-
-        # 11-March-2023 | delta count for each area | start
-        area_ids = [str(a.id) for a in areas]
-
-        area_delta_counts = (
-            session.query(
-                SubareaModel.area_id, func.count(AssessmentResponseDeltaModel.id)
-            )
-            .filter(
-                AssessmentResponseDeltaModel.assessment_id == str(assessment_id),
-                AssessmentResponseDeltaModel.type == "ReviewerDelta",
-                ActivityModel.id == AssessmentResponseDeltaModel.activity_id,
-                ItemModel.id == ActivityModel.item_id,
-                SubareaModel.id == ItemModel.subarea_id,
-                SubareaModel.area_id.in_(area_ids),
-            )
-            .group_by(SubareaModel.area_id)
-        )
-
-        area_delta_list = [dc[1] for dc in area_delta_counts]
-        assessment_delta = sum(area_delta_list)
-
-        return assessment_delta
-
-        # 11-March-2023 | delta count for each area | end
+        return self._getAssessmentDelta(assessment, "ReviewerDelta")
 
     def _getAssessmentManagerDelta(self, assessment):
-        assessment_id = assessment.id
-        checklist_id = assessment.checklist_id
-
-        areas = session.query(AreaModel).filter(
-            AreaModel.checklist_id == checklist_id
-        )
+        return self._getAssessmentDelta(assessment, "ManagerDelta")
 
-        # 11-March-2023 | delta count for each area | start
-        area_ids = [str(a.id) for a in areas]
-
-        area_delta_counts_reviewer = (
-            session.query(
-                SubareaModel.area_id, func.count(AssessmentResponseDeltaModel.id)
-            )
-            .filter(
-                AssessmentResponseDeltaModel.assessment_id == str(assessment_id),
-                AssessmentResponseDeltaModel.type == "ManagerDelta",
-                ActivityModel.id == AssessmentResponseDeltaModel.activity_id,
-                ItemModel.id == ActivityModel.item_id,
-                SubareaModel.id == ItemModel.subarea_id,
-                SubareaModel.area_id.in_(area_ids),
-            )
-            .group_by(SubareaModel.area_id)
+    def _getAssessmentDelta(self, assessment, delta_type):
+        # only deltas of activities in the assessment checklist are counted
+        snapshot = self._getChecklistSnapshot(assessment.checklist_id)
+        area_delta_counts = snapshot.rollUpCounts(
+            self._getDeltaCountsByActivity(assessment.id, delta_type), "area"
         )
-
-        area_delta_list = [dc[1] for dc in area_delta_counts_reviewer]
-        assessment_delta = sum(area_delta_list)
-
-        return assessment_delta
-
-        # delta count for each area | end reviewer
+        return sum(area_delta_counts.values())
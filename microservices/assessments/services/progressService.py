@@ -0,0 +1,165 @@
+import datetime
+import enum
+
+from sqlalchemy import func
+
+from models.assessmentModels import AssessmentProgress as AssessmentProgressModel
+from models.assessmentModels import Response as ResponseModel
+from models.database.dbConnection import session
+
+# (response type, response value) -> counter column, None value is unanswered
+COUNTER_COLUMNS = {
+    ("ManagerResponse", "Yes"): "manager_yes_count",
+    ("ManagerResponse", "No"): "manager_no_count",
+    ("ManagerResponse", "NA"): "manager_na_count",
+    ("ManagerResponse", None): "manager_unanswered_count",
+    ("ReviewerResponse", "Yes"): "reviewer_yes_count",
+    ("ReviewerResponse", "No"): "reviewer_no_count",
+    ("ReviewerResponse", "NA"): "reviewer_na_count",
+    ("ReviewerResponse", None): "reviewer_unanswered_count",
+}
+
+
+def _getCounterColumn(response_type, value):
+    if isinstance(response_type, enum.Enum):
+        response_type = response_type.name
+    if isinstance(value, enum.Enum):
+        value = value.value
+    return COUNTER_COLUMNS.get((response_type, value))
+
+
+class AssessmentProgress:
+    """
+    Yes/No/NA/unanswered counters of the manager and reviewer responses per
+    assessment, updated along with the responses so that the summaries are read
+    with a lookup instead of counting t_tenet_response.
+    """
+
+    def _countResponses(self, responses):
+        """
+        Input: iterable of (type, value, count)
+        Output: dict {counter column: count}
+        """
+        counts = {}
+        for response_type, value, count in responses:
+            column = _getCounterColumn(response_type, value)
+            if column is not None:
+                counts[column] = counts.get(column, 0) + count
+        return counts
+
+    def createProgress(self, assessment_id, responses):
+        """
+        Adds the counters of a newly seeded assessment, the caller commits
+        Input: assessment_id, list of response mappings
+        """
+        counts = self._countResponses(
+            (response["type"], response.get("value"), 1) for response in responses
+        )
+        self._insertCounters(assessment_id, counts)
+
+    def _insertCounters(self, assessment_id, counts):
+        mapping = {column: 0 for column in COUNTER_COLUMNS.values()}
+        mapping.update(counts)
+        mapping["assessment_id"] = str(assessment_id)
+        session.bulk_insert_mappings(AssessmentProgressModel, [mapping])
+
+    def applyResponseChanges(self, assessment_id, changes):
+        """
+        Moves the counts of changed responses between the counters, the caller commits
+        Input: assessment_id, list of (activity_id, response type, old value, new value)
+        """
+        counts = self._countResponses(
+            [
+                (response_type, old_value, -1)
+                for activity_id, response_type, old_value, new_value in changes
+            ]
+            + [
+                (response_type, new_value, 1)
+                for activity_id, response_type, old_value, new_value in changes
+            ],
+        )
+        counts = {column: count for column, count in counts.items() if count}
+        if not counts:
+            return
+        # relative update so that concurrent writers do not lose counts
+        values = {
+            getattr(AssessmentProgressModel, column): getattr(
+                AssessmentProgressModel, column
+            )
+            + count
+            for column, count in counts.items()
+        }
+        values[AssessmentProgressModel.modified_on] = datetime.datetime.utcnow()
+        session.query(AssessmentProgressModel).filter(
+            AssessmentProgressModel.assessment_id == str(assessment_id)
+        ).update(values, synchronize_session=False)
+
+    def _getCounts(self, assessment_id):
+        responses = (
+            session.query(ResponseModel.type, ResponseModel.value, func.count("*"))
+            .filter(ResponseModel.assessment_id == str(assessment_id))
+            .group_by(ResponseModel.type, ResponseModel.value)
+        )
+        return self._countResponses(responses)
+
+    def _getStoredCounts(self, assessment_id):
+        counters = (
+            session.query(AssessmentProgressModel)
+            .filter(AssessmentProgressModel.assessment_id == str(assessment_id))
+            .first()
+        )
+        if counters is None:
+            return None
+        return {column: getattr(counters, column) for column in COUNTER_COLUMNS.values()}
+
+    def rebuildProgress(self, assessment_id, repair=True):
+        """
+        Recomputes the counters of an assessment from its responses
+        Input: assessment_id, repair: replace the stored counters
+        Output: dict of the drift {counter column: (stored, actual)}
+        """
+        counts = self._getCounts(assessment_id)
+        stored_counts = self._getStoredCounts(assessment_id)
+
+        drift = {}
+        for column in COUNTER_COLUMNS.values():
+            stored_count = None if stored_counts is None else stored_counts[column]
+            if not stored_count == counts.get(column, 0):
+                drift[column] = (stored_count, counts.get(column, 0))
+
+        if repair and drift:
+            session.query(AssessmentProgressModel).filter(
+                AssessmentProgressModel.assessment_id == str(assessment_id)
+            ).delete(synchronize_session=False)
+            self._insertCounters(assessment_id, counts)
+        return drift
+
+    def _getSummaryDict(self, counters, prefix):
+        # same keys the grouped count used to return, "none" only when unanswered
+        summary = {
+            "yes": getattr(counters, f"{prefix}_yes_count"),
+            "no": getattr(counters, f"{prefix}_no_count"),
+            "n/a": getattr(counters, f"{prefix}_na_count"),
+        }
+        unanswered = getattr(counters, f"{prefix}_unanswered_count")
+        if unanswered:
+            summary["none"] = unanswered
+        summary["total"] = sum(summary.values())
+        return summary
+
+    def getProgressSummaries(self, assessment_ids):
+        """
+        Input: list of assessment ids
+        Output: dict {assessment_id: {"manager": {}, "reviewer": {}}},
+        assessments without counters are left out
+        """
+        progress = session.query(AssessmentProgressModel).filter(
+            AssessmentProgressModel.assessment_id.in_(assessment_ids)
+        )
+        return {
+            str(counters.assessment_id): {
+                "manager": self._getSummaryDict(counters, "manager"),
+                "reviewer": self._getSummaryDict(counters, "reviewer"),
+            }
+            for counters in progress
+        }
@@ -7,34 +7,127 @@ Contributor: Chirag Rathod (Srce Cde)
 ========================
 """
 
+import hashlib
 import logging
 import os
+import time
+from collections import OrderedDict
 
 import jwt
 from jwt import PyJWKClient
 
+from common.decorator import resolvePermissionContext
+from models.database.dbConnection import release_session
+
+# verified tokens kept per warm container, each one until its exp
+TOKEN_CACHE_SIZE = int(os.getenv("AUTHORIZER_TOKEN_CACHE_SIZE", 1024))
+# unknown key ids refetch the JWKS at most once per interval
+JWKS_MIN_REFRESH_INTERVAL = int(os.getenv("JWKS_MIN_REFRESH_INTERVAL", 60))
+
+# sha256 of the token -> (exp, verified claims), the permission context is not
+# cached, a disabled user or a changed role shows on the next request
+_token_cache = OrderedDict()
+# kid -> signing key of the user pool
+_signing_keys = {}
+_signing_keys_fetched_at = 0
+
+region = os.getenv("COGNITO_REGION_NAME")
+userPoolId = os.getenv("USER_POOL_ID")
+# JWKS_URL points the authorizer to another key set, e.g. a local one in the tests
+url = os.getenv("JWKS_URL") or (
+    f"https://cognito-idp.{region}.amazonaws.com/{userPoolId}/.well-known/jwks.json"
+)
+app_client = os.getenv("CLIENT_ID")
+
+print("Region: ", region)
+print("UserPoolId: ", userPoolId)
+print("URL: ", url)
+print("AppClient: ", app_client)
+
+jwks_client = PyJWKClient(url)
+
+
+def _refresh_signing_keys():
+    global _signing_keys, _signing_keys_fetched_at
+    _signing_keys_fetched_at = time.time()
+    _signing_keys = {key.key_id: key for key in jwks_client.get_signing_keys()}
+
+
+def _get_signing_key(kid):
+    # refresh on miss, the user pool rotated its keys or the prefetch failed
+    key = _signing_keys.get(kid)
+    if key is None and (
+        time.time() - _signing_keys_fetched_at >= JWKS_MIN_REFRESH_INTERVAL
+        or not _signing_keys
+    ):
+        _refresh_signing_keys()
+        key = _signing_keys.get(kid)
+    if key is None:
+        raise jwt.InvalidTokenError(f"Unable to find a signing key that matches: {kid}")
+    return key
+
+
+def _get_token_hash(token):
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _get_cached_claims(token_hash):
+    cached = _token_cache.get(token_hash)
+    if cached is None:
+        return None
+    exp, data = cached
+    if exp <= time.time():
+        _token_cache.pop(token_hash, None)
+        return None
+    _token_cache.move_to_end(token_hash)
+    return data
+
+
+def _cache_claims(token_hash, data):
+    exp = data.get("exp")
+    if not isinstance(exp, (int, float)):
+        return
+    now = time.time()
+    if len(_token_cache) >= TOKEN_CACHE_SIZE:
+        for cached_hash in [
+            cached_hash
+            for cached_hash, (cached_exp, _) in _token_cache.items()
+            if cached_exp <= now
+        ]:
+            _token_cache.pop(cached_hash)
+    _token_cache[token_hash] = (exp, data)
+    _token_cache.move_to_end(token_hash)
+    while len(_token_cache) > TOKEN_CACHE_SIZE:
+        _token_cache.popitem(last=False)
+
+
+def _add_permission_context(data):
+    # user, roles and permissions are resolved here on every request for the
+    # downstream handlers, they fall back to the database checks when this fails
+    data = dict(data)
+    try:
+        groups = data.get("cognito:groups") or []
+        if not isinstance(groups, list):
+            groups = [groups]
+        data.update(resolvePermissionContext(data.get("sub"), groups))
+    except Exception as e:
+        logging.error(e)
+    return data
+
+
 try:
-    region = os.getenv("COGNITO_REGION_NAME")
-    userPoolId = os.getenv("USER_POOL_ID")
-    url = f"https://cognito-idp.{region}.amazonaws.com/{userPoolId}/.well-known/jwks.json"
-    app_client = os.getenv("CLIENT_ID")
-    
-    print("Region: ",region)
-    print("UserPoolId: ",userPoolId)
-    print("URL: ",url)
-    print("AppClient: ", app_client)
-
-    # fetching jwks
-    jwks_client = PyJWKClient(url)
+    # fetching jwks on cold start, a failure is retried on the first request
+    _refresh_signing_keys()
 except Exception as e:
     logging.error(e)
-    raise ("Unable to download JWKS")
+    print("Unable to download JWKS")
 
 
 def return_response(isAuthorized, other_params={}):
     return {"isAuthorized": isAuthorized, "context": other_params}
 
 
+@release_session
 def handler(event, context):
     try:
         # fetching access token from event
@@ -51,11 +144,19 @@ def handler(event, context):
         logging.error(e)
         return return_response(isAuthorized=False, other_params={})
 
+    # tokens verified before by this container skip the signature check
+    token_hash = _get_token_hash(token)
+    data = _get_cached_claims(token_hash)
+    if data is not None:
+        return return_response(
+            isAuthorized=True, other_params=_add_permission_context(data)
+        )
+
     try:
         # get unverified headers
         headers = jwt.get_unverified_header(token)
         # get signing key
-        signing_key = jwks_client.get_signing_key_from_jwt(token)
+        signing_key = _get_signing_key(headers.get("kid"))
         # validating exp, iat, signature, iss
         data = jwt.decode(
             token,
@@ -115,7 +216,10 @@ def handler(event, context):
     # except Exception as e:
     #         logging.error(e)
     #     return return_response(isAuthorized=False, other_params={})
-    response = return_response(isAuthorized=True, other_params=data)
+    _cache_claims(token_hash, data)
+    response = return_response(
+        isAuthorized=True, other_params=_add_permission_context(data)
+    )
     return response
 
 
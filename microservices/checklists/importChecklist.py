@@ -0,0 +1,55 @@
+"""
+Imports a checklist sheet (xlsx or csv) with its areas, subareas, items and activities.
+    python -m microservices.checklists.importChecklist FILE --name NAME [--sheet SHEET]
+        [--status STATUS] [--comments COMMENTS] [--created-by USER_ID]
+The whole sheet is validated first and imported in one transaction.
+The creator defaults to the COGNITO_ADMIN_ID of the .env file.
+"""
+import argparse
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from microservices.checklists.services.checklistsService import Checklist
+
+load_dotenv(dotenv_path=Path("./.env"))
+
+
+def importChecklist(file_path, name, **kwargs):
+    checklist_object = Checklist()
+    kwargs = {key: value for key, value in kwargs.items() if value is not None}
+    kwargs.setdefault("authenticated_user_id", os.getenv("COGNITO_ADMIN_ID"))
+    try:
+        checklist = checklist_object.importChecklist(
+            file_path=file_path,
+            name=name,
+            authenticated_user_roles=["Admin"],
+            **kwargs,
+        )
+    except Exception as ex:
+        print("Checklist not imported:", getattr(ex, "message", ex))
+        return None
+    print("Checklist imported", checklist)
+    return checklist
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("file_path")
+    parser.add_argument("--name", required=True)
+    parser.add_argument("--sheet", dest="sheet_name", default=None)
+    parser.add_argument("--status", default=None)
+    parser.add_argument("--comments", default=None)
+    parser.add_argument("--created-by", dest="authenticated_user_id", default=None)
+    arguments = parser.parse_args()
+    checklist = importChecklist(
+        arguments.file_path,
+        arguments.name,
+        sheet_name=arguments.sheet_name,
+        status=arguments.status,
+        comments=arguments.comments,
+        authenticated_user_id=arguments.authenticated_user_id,
+    )
+    if checklist is None:
+        raise SystemExit(1)
@@ -0,0 +1,446 @@
+import csv
+import os
+import re
+import uuid
+from datetime import datetime
+
+from openpyxl import load_workbook
+from sqlalchemy import insert
+
+from common.customExceptions import (
+    AlreadyExists,
+    AnyExceptionHandler,
+    AttributeNotPresent,
+    InvalidAttribute,
+)
+from common.decorator import decor
+from models.checklistModels import Activity as ActivityModel
+from models.checklistModels import ActivityImportance
+from models.checklistModels import Area as AreaModel
+from models.checklistModels import Checklist as ChecklistModel
+from models.checklistModels import ChecklistStatus
+from models.checklistModels import Item as ItemModel
+from models.checklistModels import Subarea as SubareaModel
+from models.database.dbConnection import session
+
+# rows per multi-row INSERT, keeps every statement well below the bind parameter limit
+IMPORT_CHUNK_SIZE = 1000
+# weightages of the children of a node add up to this
+WEIGHTAGE_TOTAL = 100.0
+
+# normalized sheet header -> column of the checklist tree
+IMPORT_COLUMNS = {
+    "area": "area",
+    "areaweightage": "area_weightage",
+    "sub-areas": "subarea",
+    "subarea": "subarea",
+    "subareaweightage": "subarea_weightage",
+    "item": "item",
+    "itemweightage": "item_weightage",
+    "effectiveweightage": "effective_weightage",
+    "activity": "activity",
+    "importanceofpriority": "importance",
+    "importance": "importance",
+}
+REQUIRED_COLUMNS = [
+    "area",
+    "area_weightage",
+    "subarea",
+    "subarea_weightage",
+    "item",
+    "item_weightage",
+    "activity",
+    "importance",
+]
+
+
+class Checklist:
+    def _readRows(self, file_path, sheet_name=None):
+        """
+        Streams the rows of an xlsx (read only) or csv checklist sheet
+        Input: file path, sheet name of the workbook (first sheet when not given)
+        Output: generator of (row number, dict {column: value})
+        """
+        if file_path.lower().endswith(".csv"):
+            with open(file_path, newline="", encoding="utf-8-sig") as csv_file:
+                yield from self._mapRows(csv.reader(csv_file))
+            return
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            if sheet_name is None:
+                worksheet = workbook.worksheets[0]
+            elif sheet_name in workbook.sheetnames:
+                worksheet = workbook[sheet_name]
+            else:
+                raise AnyExceptionHandler(f"Sheet {sheet_name} not found")
+            yield from self._mapRows(worksheet.iter_rows(values_only=True))
+        finally:
+            workbook.close()
+
+    def _mapRows(self, rows):
+        header = None
+        for row_number, row in enumerate(rows, start=1):
+            if header is None:
+                # first occurrence of a header wins, headers differ in case and whitespace
+                header = {}
+                for index, title in enumerate(row):
+                    column = IMPORT_COLUMNS.get(
+                        re.sub(r"\s+", "", str(title or "")).lower()
+                    )
+                    if column is not None and column not in header.values():
+                        header[index] = column
+                missing_columns = set(REQUIRED_COLUMNS) - set(header.values())
+                if missing_columns:
+                    raise AttributeNotPresent(", ".join(sorted(missing_columns)))
+                continue
+            values = {
+                column: row[index] if index < len(row) else None
+                for index, column in header.items()
+            }
+            if all(value in (None, "") for value in values.values()):
+                continue
+            yield row_number, values
+
+    def _getName(self, values, column, row_number, errors):
+        name = values.get(column)
+        name = None if name is None else str(name).strip()
+        if not name:
+            errors.append(f"Row {row_number}: {column} is empty")
+        return name
+
+    def _getWeightage(self, values, column, row_number, errors, required=True):
+        weightage = values.get(column)
+        if weightage in (None, ""):
+            if required:
+                errors.append(f"Row {row_number}: {column} is empty")
+            return None
+        try:
+            weightage = float(weightage)
+        except (TypeError, ValueError):
+            errors.append(f"Row {row_number}: {column} {weightage} is not a number")
+            return None
+        if weightage < 0:
+            errors.append(f"Row {row_number}: {column} {weightage} is negative")
+            return None
+        return weightage
+
+    def _addNode(self, nodes, key, name, weightage, column, row_number, errors):
+        # a node repeats on every row of its children, its weightage must not change
+        node = nodes.get(key)
+        if node is None:
+            node = {"id": str(uuid.uuid4()), "name": name, "weightage": weightage}
+            nodes[key] = node
+        elif weightage is not None and not node["weightage"] == weightage:
+            errors.append(
+                f"Row {row_number}: {column} {weightage} differs from "
+                f"{node['weightage']} given before for {name}"
+            )
+        return node
+
+    def _buildTree(self, rows):
+        """
+        Validates the whole sheet in memory before anything is written
+        Input: iterable of (row number, dict {column: value})
+        Output: dict of areas, subareas, items and activities keyed by their path,
+        list of weightage warnings
+        """
+        errors = []
+        areas, subareas, items, activities = {}, {}, {}, {}
+        subarea_areas, item_subareas = {}, {}
+        for row_number, values in rows:
+            area_name = self._getName(values, "area", row_number, errors)
+            subarea_name = self._getName(values, "subarea", row_number, errors)
+            item_name = self._getName(values, "item", row_number, errors)
+            activity_name = self._getName(values, "activity", row_number, errors)
+            area_weightage = self._getWeightage(
+                values, "area_weightage", row_number, errors
+            )
+            subarea_weightage = self._getWeightage(
+                values, "subarea_weightage", row_number, errors
+            )
+            item_weightage = self._getWeightage(
+                values, "item_weightage", row_number, errors
+            )
+            # only given on the first row of an item in the reference sheet
+            effective_weightage = self._getWeightage(
+                values, "effective_weightage", row_number, errors, required=False
+            )
+            importance = values.get("importance")
+            importance = None if importance is None else str(importance).strip()
+            if not ActivityImportance.has_value(importance):
+                errors.append(f"Row {row_number}: importance {importance} is not valid")
+            if not all([area_name, subarea_name, item_name, activity_name]):
+                continue
+
+            # area, subarea and item names are unique across the checklist
+            if subarea_areas.setdefault(subarea_name, area_name) != area_name:
+                errors.append(
+                    f"Row {row_number}: subarea {subarea_name} is in more than one area"
+                )
+            if item_subareas.setdefault(item_name, subarea_name) != subarea_name:
+                errors.append(
+                    f"Row {row_number}: item {item_name} is in more than one subarea"
+                )
+
+            area = self._addNode(
+                areas,
+                area_name,
+                area_name,
+                area_weightage,
+                "area_weightage",
+                row_number,
+                errors,
+            )
+            subarea = self._addNode(
+                subareas,
+                (area_name, subarea_name),
+                subarea_name,
+                subarea_weightage,
+                "subarea_weightage",
+                row_number,
+                errors,
+            )
+            subarea["area_id"] = area["id"]
+            item = self._addNode(
+                items,
+                (area_name, subarea_name, item_name),
+                item_name,
+                item_weightage,
+                "item_weightage",
+                row_number,
+                errors,
+            )
+            item["subarea_id"] = subarea["id"]
+            if effective_weightage is not None:
+                if item.get("effective_weightage") is None:
+                    item["effective_weightage"] = effective_weightage
+                elif not item["effective_weightage"] == effective_weightage:
+                    errors.append(
+                        f"Row {row_number}: effective_weightage {effective_weightage} "
+                        f"differs from {item['effective_weightage']} given before "
+                        f"for {item_name}"
+                    )
+
+            # repeated activities of an item are imported once
+            activity_key = (area_name, subarea_name, item_name, activity_name)
+            if activity_key not in activities:
+                activities[activity_key] = {
+                    "id": str(uuid.uuid4()),
+                    "name": activity_name,
+                    "importance": importance,
+                    "item_id": item["id"],
+                }
+
+        if not activities and not errors:
+            errors.append("Checklist sheet has no activities")
+        warnings = self._checkWeightages(areas, subareas, items, errors)
+        if errors:
+            raise AnyExceptionHandler("\n".join(errors))
+        return {
+            "areas": areas,
+            "subareas": subareas,
+            "items": items,
+            "activities": activities,
+        }, warnings
+
+    def _checkWeightages(self, areas, subareas, items, errors):
+        # a total above 100 is an error, below 100 the checklist is not complete yet
+        warnings = []
+        totals = {None: 0.0}
+        for area in areas.values():
+            totals[None] += area["weightage"] or 0
+        for subarea in subareas.values():
+            totals[subarea["area_id"]] = totals.get(subarea["area_id"], 0) + (
+                subarea["weightage"] or 0
+            )
+        for item in items.values():
+            totals[item["subarea_id"]] = totals.get(item["subarea_id"], 0) + (
+                item["weightage"] or 0
+            )
+
+        names = {None: "checklist areas"}
+        names.update({area["id"]: f"subareas of {area['name']}" for area in areas.values()})
+        names.update(
+            {subarea["id"]: f"items of {subarea['name']}" for subarea in subareas.values()}
+        )
+        for node_id, total in totals.items():
+            total = round(total, 4)
+            if total > WEIGHTAGE_TOTAL:
+                errors.append(
+                    f"Weightages of the {names[node_id]} add up to {total}, "
+                    f"more than {WEIGHTAGE_TOTAL}"
+                )
+            elif total < WEIGHTAGE_TOTAL:
+                warnings.append(
+                    f"Weightages of the {names[node_id]} add up to {total}"
+                )
+
+        # effective weightage of an item is its share of the whole checklist
+        for (area_name, subarea_name, item_name), item in items.items():
+            area = areas[area_name]
+            subarea = subareas[(area_name, subarea_name)]
+            if item.get("effective_weightage") is None and None not in (
+                area["weightage"],
+                subarea["weightage"],
+                item["weightage"],
+            ):
+                item["effective_weightage"] = (
+                    area["weightage"]
+                    * subarea["weightage"]
+                    * item["weightage"]
+                    / (WEIGHTAGE_TOTAL * WEIGHTAGE_TOTAL)
+                )
+        return warnings
+
+    def _checkExistingNames(self, name, tree):
+        # names are unique in the tables, across all the checklists
+        errors = []
+        if (
+            session.query(ChecklistModel.id).filter(ChecklistModel.name == name).first()
+            is not None
+        ):
+            raise AlreadyExists("Checklist", "name")
+        for Model, label, nodes in (
+            (AreaModel, "Area", tree["areas"]),
+            (SubareaModel, "Subarea", tree["subareas"]),
+            (ItemModel, "Item", tree["items"]),
+        ):
+            node_names = list({node["name"] for node in nodes.values()})
+            existing_names = session.query(Model.name).filter(
+                Model.name.in_(node_names)
+            )
+            errors.extend(
+                f"{label} {existing.name} already exists" for existing in existing_names
+            )
+        if errors:
+            raise AnyExceptionHandler("\n".join(errors))
+
+    def _bulkInsert(self, Model, rows):
+        for index in range(0, len(rows), IMPORT_CHUNK_SIZE):
+            session.execute(
+                insert(Model).values(rows[index : index + IMPORT_CHUNK_SIZE])
+            )
+
+    def _insertTree(self, checklist, tree, created_by):
+        now = datetime.utcnow()
+        common = {"created_by": created_by, "created_on": now}
+        session.execute(insert(ChecklistModel).values(**checklist, **common))
+        self._bulkInsert(
+            AreaModel,
+            [
+                {
+                    "id": area["id"],
+                    "name": area["name"],
+                    "weightage": area["weightage"],
+                    "checklist_id": checklist["id"],
+                    **common,
+                }
+                for area in tree["areas"].values()
+            ],
+        )
+        self._bulkInsert(
+            SubareaModel,
+            [
+                {
+                    "id": subarea["id"],
+                    "name": subarea["name"],
+                    "weightage": subarea["weightage"],
+                    "area_id": subarea["area_id"],
+                    **common,
+                }
+                for subarea in tree["subareas"].values()
+            ],
+        )
+        self._bulkInsert(
+            ItemModel,
+            [
+                {
+                    "id": item["id"],
+                    "name": item["name"],
+                    "weightage": item["weightage"],
+                    "effective_weightage": item["effective_weightage"],
+                    "subarea_id": item["subarea_id"],
+                    **common,
+                }
+                for item in tree["items"].values()
+            ],
+        )
+        self._bulkInsert(
+            ActivityModel,
+            [
+                {
+                    "id": activity["id"],
+                    "name": activity["name"],
+                    "importance": ActivityImportance(activity["importance"]),
+                    "item_id": activity["item_id"],
+                    **common,
+                }
+                for activity in tree["activities"].values()
+            ],
+        )
+
+    def _checkImportChecklistParameters(self, **kwargs):
+        required_parameters = {
+            "file_path": "File Path",
+            "name": "Checklist Name",
+            "authenticated_user_id": "Authenticated User Id",
+            "authenticated_user_roles": "Authenticated User Role",
+        }
+        for key, value in required_parameters.items():
+            if key not in kwargs:
+                raise AttributeNotPresent(value)
+
+    @decor
+    def importChecklist(self, **kwargs):
+        """
+        Imports a checklist sheet (xlsx or csv) in one transaction, nothing is
+        written when the sheet or its weightages are not valid.
+        Input: {"file_path", "name", "authenticated_user_id", optional "sheet_name",
+        "comments", "status", "is_active"}
+        Output: dict of the checklist with the imported node counts and warnings
+        """
+        self._checkImportChecklistParameters(**kwargs)
+        file_path = kwargs.get("file_path")
+        if not os.path.isfile(file_path):
+            raise AnyExceptionHandler(f"File {file_path} not found")
+        status = kwargs.get("status", "Published")
+        if not ChecklistStatus.has_value(status):
+            raise InvalidAttribute("Checklist", "status")
+
+        tree, warnings = self._buildTree(
+            self._readRows(file_path, kwargs.get("sheet_name"))
+        )
+        for warning in warnings:
+            print("Checklist import warning:", warning)
+
+        checklist = {
+            "id": str(uuid.uuid4()),
+            "name": kwargs.get("name"),
+            "is_active": kwargs.get("is_active", True),
+            "status": ChecklistStatus(status),
+            "comments": kwargs.get("comments", "Uploaded via excel"),
+        }
+        try:
+            self._checkExistingNames(checklist["name"], tree)
+            self._insertTree(checklist, tree, kwargs.get("authenticated_user_id"))
+            session.commit()
+        except (AlreadyExists, AnyExceptionHandler):
+            session.rollback()
+            raise
+        except Exception as ex:
+            session.rollback()
+            raise AnyExceptionHandler(ex)
+        finally:
+            session.close()
+
+        return {
+            "id": checklist["id"],
+            "name": checklist["name"],
+            "status": status,
+            "area_count": len(tree["areas"]),
+            "subarea_count": len(tree["subareas"]),
+            "item_count": len(tree["items"]),
+            "activity_count": len(tree["activities"]),
+            "warnings": warnings,
+        }
@@ -3,9 +3,12 @@ import json
 
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
 from microservices.domains.services.domainsService import Domain
+from models.database.dbConnection import release_session
 
 
+@release_session
 def createHandler(event, context):
     try:
         domain = Domain()
@@ -56,4 +59,5 @@ def _checkAndCreateFunctionParametersDictionary(event):
     kwargs["created_by"] = created_by
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
     return kwargs
@@ -1,8 +1,11 @@
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
 from microservices.domains.services.domainsService import Domain
+from models.database.dbConnection import release_session
 
 
+@release_session
 def listHandler(event, context):
     try:
         domain = Domain()
@@ -51,6 +54,7 @@ def _checkAndCreateFunctionParametersDictionary(event):
     kwargs = {}
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
 
     # Filters
     kwargs["domain_head_id"] = domain_head_id
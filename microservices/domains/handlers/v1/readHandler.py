@@ -2,9 +2,12 @@ import json
 
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
 from microservices.domains.services.domainsService import Domain
+from models.database.dbConnection import release_session
 
 
+@release_session
 def readHandler(event, context):
     try:
         domain = Domain()
@@ -37,6 +40,7 @@ def _checkAndCreateFunctionParametersDictionary(event):
         authenticated_user_roles = [authenticated_user_roles]
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
 
     if not event.get("pathParameters").get("domain_id"):
         raise RequestBodyAttributeNotFound("Domain Id")
@@ -6,40 +6,56 @@ from dotenv import load_dotenv
 from models.userModels import User as UserModel
 from models.database.dbConnection import session
 from common.customExceptions import AttributeNotPresent
-from common.responseBuilder import ResponseBuilder
 
 load_dotenv()  # read .env file, if it exists
 
+# SES accepts at most 50 recipients per message
+EMAIL_MAX_DESTINATIONS = 50
+# The character encoding for the email.
+CHARSET = "UTF-8"
+# SES errors of an email refused for one of its addresses, the other recipients
+# of a grouped email are then sent one by one
+SES_REJECTION_CODES = ("MessageRejected", "InvalidParameterValue")
+
+# SES client of the warm container, created on first use
+_ses_client = None
+
+
+def _getSesClient():
+    global _ses_client
+    if _ses_client is None:
+        _ses_client = boto3.client('ses', region_name=os.getenv("REGION_NAME"))
+    return _ses_client
+
 
 def sendEmail(from_add, to_add, email_subject, email_body):
-    sender = from_add  # must be verified in AWS SES Email
-    recepient = to_add  # must be verified in AWS SES Email
-    aws_region = os.getenv("REGION_NAME")
-    # The subject line for the email.
-    subject = email_subject
-    # The HTML body of the email.
-    html_body = email_body
-    # The character encoding for the email.
-    CHARSET = "UTF-8"
-    # Create a new SES resource and specify a region.
-    client = boto3.client('ses', region_name=aws_region)
-
-    # Try to send the email.
+    return _sendEmail(from_add, {'ToAddresses': [to_add]}, email_subject, email_body)
+
+
+def _sendEmail(sender, destination, subject, html_body):
+    message_id, _ = _trySendEmail(sender, destination, subject, html_body)
+    return message_id
+
+
+def _trySendEmail(sender, destination, subject, html_body):
+    """
+    Input: sender, SES destination, subject, html body
+    Output: (message id, None) or (None, SES error code) when the email was not sent
+    """
+    # sender and recipients must be verified in AWS SES Email
     try:
         # Provide the contents of the email.
-        response = client.send_email(
-            Destination={
-                'ToAddresses': [
-                    recepient,
-                ],
-            },
+        response = _getSesClient().send_email(
+            Destination=destination,
             Message={
                 'Body': {
                     'Html': {
+                        'Charset': CHARSET,
                         'Data': html_body
                     },
                 },
                 'Subject': {
+                    'Charset': CHARSET,
                     'Data': subject
                 },
             },
@@ -48,9 +64,9 @@ def sendEmail(from_add, to_add, email_subject, email_body):
     # Display an error if something goes wrong.
     except ClientError as e:
         print('exception is', e.response['Error']['Message'])
-    else:
-        print("Email sent! Message ID: ", response['MessageId'])
-        return response['MessageId']
+        return None, e.response['Error'].get('Code')
+    print("Email sent! Message ID: ", response['MessageId'])
+    return response['MessageId'], None
 
 
 def checkCreateAssessmentParameters(**kwargs):
@@ -64,28 +80,94 @@ def checkCreateAssessmentParameters(**kwargs):
             raise AttributeNotPresent(value)
 
 
+def _getUsernames(user_ids):
+    # recipients of the whole batch are fetched with one query
+    try:
+        users = session.query(UserModel.id, UserModel.username).filter(
+            UserModel.id.in_(user_ids))
+        return {str(user.id): user.username for user in users}
+    finally:
+        session.close()
+
+
+def _sendToEachRecipient(sender, usernames, subject, html_body):
+    """
+    Input: sender, list of recipient addresses, subject, html body
+    Output: set of the addresses the email could not be sent to
+    """
+    failed_usernames = set()
+    for username in usernames:
+        try:
+            message_id = _sendEmail(sender, {'ToAddresses': [username]}, subject, html_body)
+        except Exception as error:
+            print(error)
+            message_id = None
+        if message_id is None:
+            failed_usernames.add(username)
+    return failed_usernames
+
+
 def sendEmailToUser(**kwargs):
     """
-        Send email to users in the system.
-        Input: Event data
-        Output: MessageId of mail
+        Send the emails of a batch of SQS records to the users in the system.
+        Records with the same subject and body are sent as one email with the
+        users in Bcc, at most EMAIL_MAX_DESTINATIONS per email.
+        Input: event_data: list of SQS records
+        Output: dict with batchItemFailures, the records to be redelivered
     """
-    try:
-        response_builder = ResponseBuilder()
-        checkCreateAssessmentParameters(**kwargs)
-        event_data = kwargs.get("event_data")
-        for record in event_data:
+    batch_item_failures = []
+    messages = []
+    for record in kwargs.get("event_data") or []:
+        try:
             body_dict = json.loads(record['body'])
-            user_info = (session.query(UserModel).filter(
-                UserModel.id == body_dict['user_id']).first())
-            
-            print("sendEmailToUser user_info:: ", user_info.username)
-            email_subject = body_dict['message']
-            email_body = body_dict['description']
-            response = sendEmail(os.getenv("NOTIFICATION_MAIL_SENDER"),
-                                 user_info.username,
-                                 email_subject, email_body)
-        response = response_builder.buildResponse(None, response, 201)
-    except Exception as error:
-        response = response_builder.buildResponse(error)
-    return response
+            checkCreateAssessmentParameters(**body_dict)
+        except Exception as error:
+            # a malformed message never succeeds, it is not redelivered
+            print("Invalid email message", record.get('messageId'), error)
+            continue
+        messages.append((record.get('messageId'), body_dict))
+
+    usernames = _getUsernames(list({str(body_dict['user_id']) for _, body_dict in messages}))
+
+    email_groups = {}
+    for message_id, body_dict in messages:
+        username = usernames.get(str(body_dict['user_id']))
+        if username is None:
+            print("sendEmailToUser user not found:: ", body_dict['user_id'])
+            continue
+        email_groups.setdefault(
+            (body_dict['message'], body_dict['description']), []
+        ).append((message_id, username))
+
+    sender = os.getenv("NOTIFICATION_MAIL_SENDER")
+    for (email_subject, email_body), recipients in email_groups.items():
+        for index in range(0, len(recipients), EMAIL_MAX_DESTINATIONS):
+            chunk = recipients[index:index + EMAIL_MAX_DESTINATIONS]
+            usernames_chunk = list(dict.fromkeys(username for _, username in chunk))
+            if len(usernames_chunk) == 1:
+                destination = {'ToAddresses': usernames_chunk}
+            else:
+                # recipients do not see each other
+                destination = {'BccAddresses': usernames_chunk}
+            print("sendEmailToUser recipients:: ", usernames_chunk)
+            try:
+                message_id, error_code = _trySendEmail(
+                    sender, destination, email_subject, email_body)
+            except Exception as error:
+                print(error)
+                message_id, error_code = None, None
+            failed_usernames = set()
+            if message_id is None and len(usernames_chunk) > 1 and (
+                    error_code in SES_REJECTION_CODES):
+                # one rejected address fails the whole email, the recipients are
+                # sent one by one so that only the rejected ones are redelivered
+                failed_usernames = _sendToEachRecipient(
+                    sender, usernames_chunk, email_subject, email_body)
+            elif message_id is None:
+                failed_usernames = set(usernames_chunk)
+            batch_item_failures.extend(
+                {"itemIdentifier": record_id} for record_id, username in chunk
+                if username in failed_usernames
+            )
+
+    return {"batchItemFailures": batch_item_failures}
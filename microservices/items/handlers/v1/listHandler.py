@@ -1,8 +1,11 @@
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
 from microservices.items.services.itemsService import Item
+from models.database.dbConnection import release_session
 
 
+@release_session
 def listHandler(event, context):
 
     try:
@@ -50,6 +53,7 @@ def _checkAndCreateFunctionParametersDictionary(event):
         authenticated_user_roles = [authenticated_user_roles]
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
     project_id = event.get("pathParameters").get("project_id")
     assessment_id = event.get("pathParameters").get("assessment_id")
     area_id = event.get("pathParameters").get("area_id")
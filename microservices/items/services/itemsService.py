@@ -74,130 +74,70 @@ class Item:
                 "Assessment does not belong to the given project"
             )
 
+        snapshot = assessment_object._getChecklistSnapshot(assessment.checklist_id)
         area_id = kwargs.get("area_id")
-        area_object = AreaClass()
-        area = area_object._getAreaById(area_id)
+        area = snapshot.getNode("area", area_id)
         if area is None:
-            raise AttributeIdNotFound("Area")
-        if not str(assessment.checklist_id) == str(area.checklist_id):
+            # not in the checklist snapshot, either missing or of another checklist
+            area_object = AreaClass()
+            if area_object._getAreaById(area_id) is None:
+                raise AttributeIdNotFound("Area")
             raise AnyExceptionHandler("Area does not belong to the given assessment")
         subarea_id = kwargs.get("subarea_id")
-        subarea_object = SubareaClass()
-        subarea = subarea_object._getSubareaById(subarea_id)
+        subarea = snapshot.getNode("subarea", subarea_id)
         if subarea is None:
-            raise AttributeIdNotFound("Subarea")
-        if not str(subarea.area_id) == str(area_id):
+            subarea_object = SubareaClass()
+            if subarea_object._getSubareaById(subarea_id) is None:
+                raise AttributeIdNotFound("Subarea")
+            raise AnyExceptionHandler("Subarea does not belong to the given area Id")
+        if not subarea.parent_id == area.id:
             raise AnyExceptionHandler("Subarea does not belong to the given area Id")
-
-        items = session.query(ItemModel).filter(
-            ItemModel.subarea_id == str(subarea_id)
-        )
 
         # 08-March-2023 | delta count for each item | start
-        item_ids = [item.id for item in items]
-
-        item_delta_counts_manager = (
-            session.query(
-                ActivityModel.item_id, func.count(AssessmentResponseDeltaModel.id)
-            )
-            .filter(
-                AssessmentResponseDeltaModel.assessment_id == str(assessment_id),
-                AssessmentResponseDeltaModel.type == "ReviewerDelta",
-                ActivityModel.id == AssessmentResponseDeltaModel.activity_id,
-                ActivityModel.item_id.in_(item_ids),
-            )
-            .group_by(ActivityModel.item_id)
+        # delta counts per activity are summed per item through the checklist snapshot
+        item_delta_dict_manager = snapshot.rollUpCounts(
+            assessment_object._getDeltaCountsByActivity(assessment_id, "ReviewerDelta"),
+            "item",
+        )
+        item_delta_dict_reviewer = snapshot.rollUpCounts(
+            assessment_object._getDeltaCountsByActivity(assessment_id, "ManagerDelta"),
+            "item",
         )
-
-        item_delta_dict_manager = {
-            str(idc[0]): idc[1] for idc in item_delta_counts_manager
-        }
         # 08-March-2023 | delta count for each item | end
 
-        # delta count for reviewer on items | start
-        item_delta_counts_reviewer = (
-            session.query(
-                ActivityModel.item_id, func.count(AssessmentResponseDeltaModel.id)
-            )
-            .filter(
-                AssessmentResponseDeltaModel.assessment_id == str(assessment_id),
-                AssessmentResponseDeltaModel.type == "ManagerDelta",
-                ActivityModel.id == AssessmentResponseDeltaModel.activity_id,
-                ActivityModel.item_id.in_(item_ids),
-            )
-            .group_by(ActivityModel.item_id)
+        items = snapshot.getChildren(subarea.id)
+        assessment_item_scores = session.query(
+            AssessmentItemScoreModel.item_id,
+            AssessmentItemScoreModel.item_grade,
+            AssessmentItemScoreModel.item_score,
+        ).filter(
+            AssessmentItemScoreModel.assessment_id == str(assessment_id),
+            AssessmentItemScoreModel.item_id.in_([item.id for item in items]),
         )
-
-        item_delta_dict_reviewer = {
-            str(idc[0]): idc[1] for idc in item_delta_counts_reviewer
+        assessment_item_scores = {
+            str(item_score.item_id): item_score for item_score in assessment_item_scores
         }
-        # delta count for reviewer on items | start
 
         itemsSerializedObject = []
         for item in items:
-            # item_result_object = {}
-            assessment_item_score = (
-                session.query(AssessmentItemScoreModel)
-                .filter(
-                    AssessmentItemScoreModel.item_id == str(item.id),
-                    AssessmentItemScoreModel.assessment_id == str(assessment_id),
-                )
-                .first()
-            )
-            assessment_item_score_dict = assessment_item_score.as_dict()
-
-            item_dict = item.as_dict()
-
-            item_grade = assessment_item_score_dict.get("item_grade", None)
-            item_score = assessment_item_score_dict.get("item_score", None)
-            # item_result_object["id"] = str(item.id)
-            # item_result_object["name"] = item.name
-            # item_result_object["weightage"] = item.weightage
-            # item_result_object["effective_weightage"] = item.effective_weightage
-            # # item_result_object["subarea_id"] = str(item.subarea_id)
-            item_dict["grade"] = item_grade
-            item_dict["score"] = item_score
-
-            # if (
-            #     any(item_delta_dict_manager)
-            #     and str(item.id) in item_delta_dict_manager
-            # ):
-            #     # item_dict["summary"] = {'delta': item_delta_dict_manager[str(item.id)]}
-            #     deltaResponseDict = {
-            #         "delta": {
-            #             "reviewer_delta": item_delta_dict_manager[str(item.id)],
-            #             "manager_delta": 0,
-            #         }
-            #     }
-            # else:
-            #     deltaResponseDict = {
-            #         "delta": {"reviewer_delta": 0, "manager_delta": 0}
-            #     }
+            item_dict = dict(item.data)
 
-            # response object update for delta count | start
-            if (
-                any(item_delta_dict_manager)
-                and str(item.id) in item_delta_dict_manager
-            ):
-                reviewer_delta = item_delta_dict_manager[str(item.id)]
-            else:
-                reviewer_delta = 0
-
-            if (
-                any(item_delta_dict_reviewer)
-                and str(item.id) in item_delta_dict_reviewer
-            ):
-                manager_delta = item_delta_dict_reviewer[str(item.id)]
-            else:
-                manager_delta = 0
+            assessment_item_score = assessment_item_scores.get(item.id)
+            if assessment_item_score is None:
+                raise AnyExceptionHandler(
+                    f"Assessment Item score not found for item with Id {item.id}"
+                )
+            item_grade = assessment_item_score.item_grade
+            item_score = assessment_item_score.item_score
+            item_dict["grade"] = None if item_grade is None else item_grade.value
+            item_dict["score"] = None if item_score is None else str(item_score)
 
             deltaResponseDict = {
                 "delta": {
-                    "reviewer_delta": manager_delta,
-                    "manager_delta": reviewer_delta,
+                    "reviewer_delta": item_delta_dict_reviewer.get(item.id, 0),
+                    "manager_delta": item_delta_dict_manager.get(item.id, 0),
                 }
             }
-            # response object update for delta count | start
 
             item_dict["summary"] = deltaResponseDict
             itemsSerializedObject.append(item_dict)
@@ -275,11 +215,12 @@ class Item:
                 "Assessment Item score not found for the given item and assessment Id"
             )
 
-        assessment_item_score.item_grade = grade
         # assessment_item_score.modified_by=" "
         # To be implemented!!
         try:
-            session.add(assessment_item_score)
+            assessment_object._overrideItemGrade(
+                assessment, assessment_item_score, grade, item
+            )
             session.commit()
             session.refresh(assessment_item_score)
 
@@ -3,8 +3,10 @@ import json
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
 from microservices.notifications.services.notificationServices import NotificationSender
+from models.database.dbConnection import release_session
 
 
+@release_session
 def createHandler(event, context):
     try:
         notification = NotificationSender()
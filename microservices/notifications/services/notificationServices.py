@@ -1,18 +1,19 @@
 import boto3
 import json
-from models.projectUserModels import ProjectUser as ProjectUserModel
 from models.notificationModels import NotificationStatus, NotificationSeverity, Notification
 from models.commonImports import *
 from common.customExceptions import AnyExceptionHandler, AttributeNotPresent
 from dotenv import load_dotenv
 from models.database.dbConnection import session
-from models.userRoleModels import UserRole as UserRoleModel
-from models.roleModels import Role as RoleModel
-from models.projectModels import Project as ProjectModel
-from models.assessmentModels import Assessment as AssessmentModel
-from sqlalchemy import or_
+from microservices.notifications.services.recipientsService import NotificationRecipients
+from sqlalchemy import insert
 load_dotenv()
 
+# SendMessageBatch takes at most 10 entries
+SQS_BATCH_SIZE = 10
+# failed batch entries are sent again this many times
+EMAIL_QUEUE_SEND_RETRIES = int(os.getenv("EMAIL_QUEUE_SEND_RETRIES", 3))
+
 
 class NotificationSender:
     def __init__(self):
@@ -34,36 +35,100 @@ class NotificationSender:
         return notification_payload
 
     def storeNotifications(self, notifications):
-        # save Notifications in DB
-        for notification in notifications:
-            notification_record = Notification(
-                user_id=notification["user_id"],
-                message=notification["message"],
-                description=notification["description"],
-                status=notification["status"],
-                severity=notification["severity"]
-            )
+        # save Notifications in DB with one multi-row INSERT
+        notification_rows = [
+            {
+                "id": uuid.uuid4(),
+                "user_id": str(notification["user_id"]),
+                "message": notification["message"],
+                "description": notification["description"],
+                "status": notification["status"],
+                "severity": notification["severity"],
+            }
+            for notification in notifications
+        ]
+        if notification_rows:
             try:
-                session.add(notification_record)
+                session.execute(insert(Notification).values(notification_rows))
                 session.commit()
-                session.refresh(notification_record)
             except Exception as ex:
                 session.rollback()
                 raise AnyExceptionHandler(ex)
+            finally:
+                session.close()
 
-        session.close()
-
-        for notification in notifications:
-            email_payload = {
-                'user_id': notification['user_id'],
+        email_payloads = [
+            {
+                'user_id': str(notification['user_id']),
                 'message': notification['message'],
                 'description': notification['description']
             }
-            # sending message to sqs queue
-            response = self.sqs.send_message(
-                QueueUrl=self.queue_url, MessageBody=json.dumps(email_payload))
-
-        return response
+            for notification in notifications
+        ]
+        return self._queueEmails(email_payloads)
+
+    def _sendMessageBatch(self, entries):
+        # sending messages to sqs queue in batches of 10, returns the failed entries
+        failed_entries = []
+        for index in range(0, len(entries), SQS_BATCH_SIZE):
+            batch = entries[index:index + SQS_BATCH_SIZE]
+            try:
+                response = self.sqs.send_message_batch(
+                    QueueUrl=self.queue_url, Entries=batch)
+            except Exception as ex:
+                # the whole batch failed to send, its entries are retried
+                print("Email queue batch not sent", ex)
+                failed_entries.extend(
+                    (entry, {"Id": entry["Id"], "SenderFault": False,
+                             "Code": "BatchNotSent", "Message": str(ex)})
+                    for entry in batch
+                )
+                continue
+            failed_ids = {failed["Id"]: failed for failed in response.get("Failed", [])}
+            for entry in batch:
+                if entry["Id"] in failed_ids:
+                    failed_entries.append((entry, failed_ids[entry["Id"]]))
+        return failed_entries
+
+    def _queueEmails(self, email_payloads):
+        entries = [
+            {"Id": str(index), "MessageBody": json.dumps(email_payload)}
+            for index, email_payload in enumerate(email_payloads)
+        ]
+        failed_entries = self._sendMessageBatch(entries)
+        attempt = 0
+        # only the failed entries are sent again, sender faults will not succeed
+        while failed_entries and attempt < EMAIL_QUEUE_SEND_RETRIES:
+            attempt += 1
+            retry_entries = [
+                entry for entry, failure in failed_entries
+                if not failure.get("SenderFault")
+            ]
+            if not retry_entries:
+                break
+            print("Retrying failed email queue entries", len(retry_entries))
+            failed_entries = [
+                (entry, failure) for entry, failure in failed_entries
+                if failure.get("SenderFault")
+            ] + self._sendMessageBatch(retry_entries)
+
+        # the notifications are already stored, the emails which could not be
+        # queued are returned with the reason instead of failing the event
+        failed_emails = [
+            {
+                "email": json.loads(entry["MessageBody"]),
+                "code": failure.get("Code"),
+                "message": failure.get("Message"),
+            }
+            for entry, failure in failed_entries
+        ]
+        if failed_emails:
+            print("Failed email queue entries", failed_emails)
+        return {
+            "notification_count": len(entries),
+            "queued_count": len(entries) - len(failed_emails),
+            "failed_emails": failed_emails,
+        }
 
     def _checkCreateNotificationParameters(self, **kwargs):
         topic_arn = kwargs.get("TopicArn")
@@ -83,98 +148,51 @@ class NotificationSender:
         self._checkCreateNotificationParameters(**kwargs)
         topic_arn = kwargs.get("TopicArn")
         project_id = kwargs.get("project_id")
-        project_name = (session.query(ProjectModel).filter(
-                ProjectModel.id == project_id).first())
+        assessment_id = kwargs.get("assessment_id")
+        recipients_object = NotificationRecipients()
+        Notifications = []
 
         if "assessment-created" in topic_arn:
-            project_users = session.query(ProjectUserModel).filter(
-                ProjectUserModel.project_id == project_id)
-            Notifications = []
-            assessment_id = kwargs.get("assessment_id")
-            assessment_info = (session.query(AssessmentModel).filter(
-                AssessmentModel.id == assessment_id).first())
+            recipients = recipients_object.getAssessmentCreatedRecipients(
+                project_id, assessment_id)
+            event_type = "assessment-created"
             description = "Assessment with name {0} has been created for {1} \
-                    with due date as {2}".format(assessment_info.name,
-                                                 project_name.name, assessment_info.end_date)
-
-            for project_user in project_users:
-                message = self.createNotificationPayload("assessment-created",
-                                                         description, project_user.user_id)
-                Notifications.append(message)
+                    with due date as {2}".format(recipients["assessment_name"],
+                                                 recipients["project_name"],
+                                                 recipients["assessment_end_date"])
 
         elif "project-user-created" in topic_arn:
-            user_id = kwargs.get("user_id")
-            user_role = (session.query(UserRoleModel).filter(
-                UserRoleModel.user_id == user_id).first())
-            project_role = (session.query(RoleModel).filter(
-                RoleModel.id == user_role.role_id).first())
-
-            project_users = session.query(ProjectUserModel).filter(
-                ProjectUserModel.project_id == project_id,
-                ProjectUserModel.user_id == user_id)
-            Notifications = []
+            recipients = recipients_object.getProjectUserCreatedRecipients(
+                project_id, kwargs.get("user_id"))
+            event_type = "project-user-created"
             description = "You have been assigned to {0} project \
-                    with {1} as a role".format(project_name.name, project_role.name)
-
-            for project_user in project_users:
-                message = self.createNotificationPayload("project-user-created",
-                                                         description, project_user.user_id)
-                Notifications.append(message)
+                    with {1} as a role".format(recipients["project_name"], recipients["role_name"])
 
         elif "assessment-updated" in topic_arn and kwargs.get("status") == "Submitted":
-            reviewers_and_admin = session.query(RoleModel).filter(
-                or_(RoleModel.name == 'Reviewer', RoleModel.name == 'Admin'))
-            
-            reviewer_and_admin_role_id = []
-            for reviewer in reviewers_and_admin:
-                reviewer_and_admin_role_id.append(str(reviewer.id))
-
-            Notifications = []
-            assessment_id = kwargs.get("assessment_id")
-            assessment_info = (session.query(AssessmentModel).filter(
-                AssessmentModel.id == assessment_id).first())
+            recipients = recipients_object.getAssessmentSubmittedRecipients(
+                project_id, assessment_id)
+            event_type = "assessment-updated"
             description = "Assessment for {0} with name {1} has been submitted \
-                    for review with due date as {2}".format(project_name.name, assessment_info.name, 
-                                                            assessment_info.end_date)
-            
-            reviewers = session.query(UserRoleModel).filter(
-                UserRoleModel.role_id.in_(reviewer_and_admin_role_id))
-
-            for reviewer_id in reviewers:
-                message = self.createNotificationPayload("assessment-updated",
-                                                         description, reviewer_id.user_id)
-                Notifications.append(message)
+                    for review with due date as {2}".format(recipients["project_name"],
+                                                            recipients["assessment_name"],
+                                                            recipients["assessment_end_date"])
 
         elif "assessment-updated" in topic_arn and kwargs.get("status") == "Reviewed":
-            project_managers_and_admin = []
-            admin_role_id = session.query(RoleModel).filter(
-                (RoleModel.name == 'Admin')).first()
-            admins = session.query(UserRoleModel).filter(
-                UserRoleModel.role_id == str(admin_role_id.id))
-            for admin in admins:
-                project_managers_and_admin.append(str(admin.user_id))
-
-            project_manager_role_id = session.query(RoleModel).filter(
-                (RoleModel.name == 'Project Manager')).first()
-            project_managers = session.query(UserRoleModel).filter(
-                UserRoleModel.role_id == str(project_manager_role_id.id))
-            for pm in project_managers:
-                manager_info = session.query(ProjectUserModel).filter(
-                    ProjectUserModel.project_id == str(project_id),
-                    ProjectUserModel.user_id == str(pm.user_id)).first()
-                if manager_info:
-                    project_managers_and_admin.append(str(manager_info.user_id))
-
-            Notifications = []
-            assessment_id = kwargs.get("assessment_id")
-            assessment_info = (session.query(AssessmentModel).filter(
-                AssessmentModel.id == assessment_id).first())
+            recipients = recipients_object.getAssessmentReviewedRecipients(
+                project_id, assessment_id)
+            event_type = "assessment-reviewed"
             description = "Assessment for {0} with name \
-                    {1} has been reviewed".format(project_name.name, assessment_info.name)
-            for project_manager_id in project_managers_and_admin:
-                message = self.createNotificationPayload("assessment-reviewed",
-                                                         description, project_manager_id)
-                Notifications.append(message)
+                    {1} has been reviewed".format(recipients["project_name"],
+                                                  recipients["assessment_name"])
+        else:
+            recipients = {"user_ids": []}
+            event_type = None
+            description = None
+        session.close()
+
+        for user_id in recipients["user_ids"]:
+            message = self.createNotificationPayload(event_type, description, user_id)
+            Notifications.append(message)
 
         response = self.storeNotifications(Notifications)
         return response
@@ -0,0 +1,139 @@
+from sqlalchemy import and_, or_, select, true
+
+from common.customExceptions import AttributeIdNotFound
+from models.assessmentModels import Assessment as AssessmentModel
+from models.database.dbConnection import session
+from models.projectModels import Project as ProjectModel
+from models.projectUserModels import ProjectUser as ProjectUserModel
+from models.roleModels import Role as RoleModel
+from models.userRoleModels import UserRole as UserRoleModel
+
+
+class NotificationRecipients:
+    """
+    Recipients of a notification event resolved with one joined query per
+    topic/status rule, together with the project and assessment names.
+    """
+
+    def _getProjectUsers(self, project_id, user_id=None):
+        project_users = select(ProjectUserModel.user_id).where(
+            ProjectUserModel.project_id == str(project_id)
+        )
+        if user_id is not None:
+            project_users = project_users.where(
+                ProjectUserModel.user_id == str(user_id)
+            )
+        return project_users
+
+    def _getRoleUsers(self, role_names):
+        return (
+            select(UserRoleModel.user_id)
+            .join(RoleModel, RoleModel.id == UserRoleModel.role_id)
+            .where(RoleModel.name.in_(role_names))
+        )
+
+    def _getAdminsAndProjectManagers(self, project_id):
+        # admins and the project managers who are members of the project
+        return (
+            select(UserRoleModel.user_id)
+            .join(RoleModel, RoleModel.id == UserRoleModel.role_id)
+            .outerjoin(
+                ProjectUserModel,
+                and_(
+                    ProjectUserModel.user_id == UserRoleModel.user_id,
+                    ProjectUserModel.project_id == str(project_id),
+                ),
+            )
+            .where(
+                or_(
+                    RoleModel.name == "Admin",
+                    and_(
+                        RoleModel.name == "Project Manager",
+                        ProjectUserModel.id != None,
+                    ),
+                )
+            )
+        )
+
+    def _resolve(self, project_id, assessment_id, recipients):
+        """
+        Input: project_id, assessment_id, select of the recipient user ids
+        Output: dict with the deduplicated user ids, project and assessment details
+        """
+        recipients = recipients.subquery()
+        rows = (
+            session.query(
+                ProjectModel.name.label("project_name"),
+                AssessmentModel.name.label("assessment_name"),
+                AssessmentModel.end_date.label("assessment_end_date"),
+                recipients.c.user_id,
+            )
+            .select_from(ProjectModel)
+            .join(AssessmentModel, AssessmentModel.id == str(assessment_id))
+            .outerjoin(recipients, true())
+            .filter(ProjectModel.id == str(project_id))
+            .all()
+        )
+        if not rows:
+            raise AttributeIdNotFound("Project or Assessment")
+        return {
+            "project_name": rows[0].project_name,
+            "assessment_name": rows[0].assessment_name,
+            "assessment_end_date": rows[0].assessment_end_date,
+            "user_ids": self._getUniqueUserIds(rows),
+        }
+
+    def _getUniqueUserIds(self, rows):
+        user_ids = []
+        for row in rows:
+            if row.user_id is not None:
+                user_ids.append(str(row.user_id))
+        # duplicates come from users with several matching roles
+        return list(dict.fromkeys(user_ids))
+
+    def getAssessmentCreatedRecipients(self, project_id, assessment_id):
+        # every member of the project
+        return self._resolve(
+            project_id, assessment_id, self._getProjectUsers(project_id)
+        )
+
+    def getAssessmentSubmittedRecipients(self, project_id, assessment_id):
+        # every reviewer and admin
+        return self._resolve(
+            project_id, assessment_id, self._getRoleUsers(["Reviewer", "Admin"])
+        )
+
+    def getAssessmentReviewedRecipients(self, project_id, assessment_id):
+        return self._resolve(
+            project_id,
+            assessment_id,
+            self._getAdminsAndProjectManagers(project_id),
+        )
+
+    def getProjectUserCreatedRecipients(self, project_id, user_id):
+        """
+        Input: project_id, user_id of the user added to the project
+        Output: dict with the user id when it is a member of the project,
+        the project name and the name of the user's role
+        """
+        project_users = self._getProjectUsers(project_id, user_id).subquery()
+        rows = (
+            session.query(
+                ProjectModel.name.label("project_name"),
+                RoleModel.name.label("role_name"),
+                project_users.c.user_id,
+            )
+            .select_from(ProjectModel)
+            .outerjoin(project_users, true())
+            .outerjoin(UserRoleModel, UserRoleModel.user_id == str(user_id))
+            .outerjoin(RoleModel, RoleModel.id == UserRoleModel.role_id)
+            .filter(ProjectModel.id == str(project_id))
+            .all()
+        )
+        if not rows:
+            raise AttributeIdNotFound("Project")
+        return {
+            "project_name": rows[0].project_name,
+            "role_name": rows[0].role_name,
+            "user_ids": self._getUniqueUserIds(rows),
+        }
@@ -2,11 +2,14 @@ import json
 
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
 from microservices.projectUsers.services.projectUsersService import (
     ProjectUser,
 )
+from models.database.dbConnection import release_session
 
 
+@release_session
 def createHandler(event, context):
 
     try:
@@ -59,4 +62,5 @@ def _checkAndCreateFunctionParametersDictionary(event):
     # authenticated_user_id = "d30847c7-3c46-4e08-8955-c11b97a63db1"
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
     return kwargs
@@ -2,11 +2,14 @@ import json
 
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
 from microservices.projectUsers.services.projectUsersService import (
     ProjectUser,
 )
+from models.database.dbConnection import release_session
 
 
+@release_session
 def deleteHandler(event, context):
 
     try:
@@ -47,5 +50,6 @@ def _checkAndCreateFunctionParametersDictionary(event):
     kwargs["user_id"] = user_id
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
 
     return kwargs
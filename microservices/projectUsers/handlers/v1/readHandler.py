@@ -1,8 +1,11 @@
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
 from microservices.projectUsers.services.projectUsersService import ProjectUser
+from models.database.dbConnection import release_session
 
 
+@release_session
 def readHandler(event, context):
     try:
         project_users = ProjectUser()
@@ -44,5 +47,6 @@ def _checkAndCreateFunctionParametersDictionary(event):
 
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
 
     return kwargs
@@ -3,8 +3,10 @@ import json
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
 from microservices.projects.services.projectsService import Project
+from models.database.dbConnection import release_session
 
 
+@release_session
 def deleteHandler(event, context):
     try:
 
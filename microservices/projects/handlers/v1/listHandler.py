@@ -4,9 +4,12 @@ from re import I
 
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
 from microservices.projects.services.projectsService import Project
+from models.database.dbConnection import release_session
 
 
+@release_session
 def listHandler(event, context):
 
     try:
@@ -47,6 +50,7 @@ def _checkAndCreateFunctionParametersDictionary(event):
     page_number = event.get("queryStringParameters", {}).get("pageNumber", None)
     sort_key = event.get("queryStringParameters", {}).get("sortKey", None)
     sort_order = event.get("queryStringParameters", {}).get("sortOrder", None)
+    after = event.get("queryStringParameters", {}).get("after", None)
 
     # search
     search = event.get("queryStringParameters", {}).get("search", None)
@@ -90,6 +94,7 @@ def _checkAndCreateFunctionParametersDictionary(event):
     kwargs = {}
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
     kwargs["from_date"] = from_date
     kwargs["to_date"] = to_date
     kwargs["min_overall_score"] = min_overall_score
@@ -107,5 +112,6 @@ def _checkAndCreateFunctionParametersDictionary(event):
     kwargs["page_number"] = page_number
     kwargs["sort_key"] = sort_key
     kwargs["sort_order"] = sort_order
+    kwargs["after"] = after
 
     return kwargs
@@ -1,9 +1,12 @@
 import json
 
 from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
 from microservices.projects.services.projectsService import Project
+from models.database.dbConnection import release_session
 
 
+@release_session
 def readHandler(event, context):
     try:
         kwargs = _checkAndCreateFunctionParametersDictionary(event)
@@ -38,6 +41,7 @@ def _checkAndCreateFunctionParametersDictionary(event):
         authenticated_user_roles = [authenticated_user_roles]
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
 
     project_id = event.get("pathParameters").get("project_id")
     kwargs["project_id"] = project_id
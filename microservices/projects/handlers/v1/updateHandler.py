@@ -2,9 +2,12 @@ import json
 
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
 from microservices.projects.services.projectsService import Project
+from models.database.dbConnection import release_session
 
 
+@release_session
 def updateHandler(event, context):
     try:
         project = Project()
@@ -76,5 +79,6 @@ def _checkAndCreateFunctionParametersDictionary(event):
     kwargs["audit_frequency"] = audit_frequency
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
     
     return kwargs
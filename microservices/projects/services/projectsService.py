@@ -19,6 +19,8 @@ from models.database.dbConnection import session
 from models.projectModels import Frequency
 from models.projectModels import Project as ProjectModel
 from models.projectUserModels import ProjectUser as ProjectUserModel
+from models.roleModels import Role as RoleModel
+from models.userModels import User as UserModel
 from models.userRoleModels import UserRole as UserRoleModel
 
 
@@ -101,7 +103,14 @@ class Project:
         if project_filters:
             projects = projects.filter(*project_filters)
 
-        total_data_count = projects.count()
+        if kwargs.get("after") is not None:
+            # keyset pagination skips the full count, the unfiltered list
+            # gets the planner estimate
+            total_data_count = None
+            if not project_filters and not kwargs["search"]:
+                total_data_count = Pagination._getEstimatedCount(session, ProjectModel)
+        else:
+            total_data_count = projects.count()
 
         paginate = Pagination(
             ProjectModel,
@@ -111,18 +120,23 @@ class Project:
                 "sort_key": kwargs["sort_key"],
                 "sort_order": kwargs["sort_order"],
                 "total_data_count": total_data_count,
+                "after": kwargs.get("after"),
             },
         )
 
-        pagination_setting = paginate._getPaginationSetting()
-        pagination_response_attributes = paginate._getResponseAttribute()
-
-        projects = (
-            projects.order_by(pagination_setting["sort_key_order"])
-            .limit(pagination_setting["page_size"])
-            .offset(pagination_setting["offset_value"])
-            .all()
-        )
+        if paginate._isKeysetMode():
+            projects = paginate._getKeysetPage(projects)
+            pagination_response_attributes = paginate._getResponseAttribute()
+        else:
+            pagination_setting = paginate._getPaginationSetting()
+            pagination_response_attributes = paginate._getResponseAttribute()
+
+            projects = (
+                projects.order_by(pagination_setting["sort_key_order"])
+                .limit(pagination_setting["page_size"])
+                .offset(pagination_setting["offset_value"])
+                .all()
+            )
 
         # paginate the final filtered response | end
 
@@ -182,123 +196,46 @@ class Project:
                 )
             )
 
-        user_object = UserClass()
-        role_object = RoleClass()
+        project_ids = [str(project.id) for project in projects]
+        project_users = self._getProjectListUsers(project_ids)
+        project_assessments = self._getLatestProjectAssessments(
+            project_ids, request_filters
+        )
+        project_reviewed_assessments = self._getLatestProjectAssessments(
+            project_ids,
+            request_filters_without_date
+            + [AssessmentModel.status == AssessmentStatus.Reviewed],
+        )
 
         results = []
         for project in projects:
             project_dict = project.as_dict()
-            _users = []
-
-            project_users = session.query(ProjectUserModel).filter(
-                ProjectUserModel.project_id == f"{project.id}",
-                ProjectUserModel.end_date == None,
-            )
-
-            for project_user in project_users:
-                _roles = []
-                user = user_object._getUserById(project_user.user_id)
-
-                user_roles = session.query(UserRoleModel).filter(
-                    UserRoleModel.user_id == f"{user.id}"
-                )
-
-                for user_role in user_roles:
-                    role = role_object._getRoleById(user_role.role_id)
-                    _roles.append({"id": str(role.id), "name": role.name})
-                user_dict = {"id": str(user.id), "name": user.name}
-                user_dict["roles"] = _roles
-                _users.append(user_dict)
-            project_assessment_filter = []
-            project_assessment_without_date_filter = []
-            project_assessment_filter.extend(request_filters)
-            project_assessment_without_date_filter.extend(
-                request_filters_without_date
-            )
-
-            project_assessment_filter.append(
-                AssessmentModel.project_id == str(project.id)
+            project_assessment = project_assessments.get(str(project.id))
+            project_reviewed_assessment = project_reviewed_assessments.get(
+                str(project.id)
             )
-            project_assessment_without_date_filter.append(
-                AssessmentModel.project_id == str(project.id)
-            )
-
-            # project_assessment_filter.append(AssessmentModel.status==AssessmentStatus.Reviewed)
-            project_assessment = (
-                session.query(
-                    AssessmentModel.overall_score,
-                    AssessmentModel.tech_debt,
-                    AssessmentModel.id,
-                    AssessmentModel.status,
-                )
-                .order_by(desc(AssessmentModel.start_date))
-                .filter(*project_assessment_filter)
-                .first()
-            )
-            project_dict["users"] = _users
+            project_dict["users"] = project_users.get(str(project.id), [])
             project_dict["overall_score"] = None
             project_dict["tech_debt"] = None
             project_dict["assessment_id"] = None
             project_dict["assessment_status"] = None
             project_dict["previous_overall_score"] = None
             project_dict["previous_tech_debt"] = None
-            # print("project_assessment-", project_assessment, project_assessment)
             # Assesment for given date range
-            if project_assessment:
+            if (
+                project_assessment
+                and project_assessment.status == AssessmentStatus.Reviewed
+            ):
                 # Assessment for Project with Reviewed status
                 project_dict["assessment_status"] = str(project_assessment.status)
-                if project_assessment.status == AssessmentStatus.Reviewed:
-                    project_dict["assessment_id"] = str(project_assessment.id)
-                    project_dict["overall_score"] = project_assessment.overall_score
-                    project_dict["tech_debt"] = project_assessment.tech_debt
-                # Getting Previous Reviewed Assessment
-                else:
-                    project_assessment_without_date_filter.append(
-                        AssessmentModel.status == AssessmentStatus.Reviewed
-                    )
-                    project_reviewed_assessment = (
-                        session.query(
-                            AssessmentModel.overall_score,
-                            AssessmentModel.tech_debt,
-                            AssessmentModel.id,
-                            AssessmentModel.status,
-                        )
-                        .order_by(desc(AssessmentModel.start_date))
-                        .filter(*project_assessment_without_date_filter)
-                        .first()
-                    )
-                    # print("project_reviewed_assessment-", project_assessment)
-
-                    if project_reviewed_assessment:
-                        project_dict["assessment_id"] = str(
-                            project_reviewed_assessment.id
-                        )
-                        # project_dict["overall_score"] = project_reviewed_assessment.overall_score
-                        # project_dict["tech_debt"] = project_reviewed_assessment.tech_debt
-                        project_dict[
-                            "previous_overall_score"
-                        ] = project_reviewed_assessment.overall_score
-                        project_dict[
-                            "previous_tech_debt"
-                        ] = project_reviewed_assessment.tech_debt
-            # Latest reviewed Assesment before given date range
+                project_dict["assessment_id"] = str(project_assessment.id)
+                project_dict["overall_score"] = project_assessment.overall_score
+                project_dict["tech_debt"] = project_assessment.tech_debt
             else:
-                project_assessment_without_date_filter.append(
-                    AssessmentModel.status == AssessmentStatus.Reviewed
-                )
-                project_reviewed_assessment = (
-                    session.query(
-                        AssessmentModel.overall_score,
-                        AssessmentModel.tech_debt,
-                        AssessmentModel.id,
-                        AssessmentModel.status,
-                    )
-                    .order_by(desc(AssessmentModel.start_date))
-                    .filter(*project_assessment_without_date_filter)
-                    .first()
-                )
-                # print("project_reviewed_assessment when no assessment for filter date range-", project_assessment)
-
+                if project_assessment:
+                    project_dict["assessment_status"] = str(project_assessment.status)
+                # Getting Previous Reviewed Assessment /
+                # Latest reviewed Assesment before given date range
                 if project_reviewed_assessment:
                     project_dict["assessment_id"] = str(
                         project_reviewed_assessment.id
@@ -310,10 +247,74 @@ class Project:
                         "previous_tech_debt"
                     ] = project_reviewed_assessment.tech_debt
             results.append(project_dict)
-            # break
 
         return results, pagination_response_attributes
 
+    def _getProjectListUsers(self, project_ids):
+        """
+        Fetch active users of the given projects along with their roles
+        Input: list of project ids
+        Output: dict {project_id: [{"id", "name", "roles": [{"id", "name"}]}]}
+
+        """
+        if not project_ids:
+            return {}
+
+        project_users = (
+            session.query(ProjectUserModel.project_id, UserModel.id, UserModel.name)
+            .join(UserModel, UserModel.id == ProjectUserModel.user_id)
+            .filter(
+                ProjectUserModel.project_id.in_(project_ids),
+                ProjectUserModel.end_date == None,
+            )
+            .all()
+        )
+
+        user_ids = list({str(project_user.id) for project_user in project_users})
+        user_roles = {}
+        if user_ids:
+            roles = (
+                session.query(UserRoleModel.user_id, RoleModel.id, RoleModel.name)
+                .join(RoleModel, RoleModel.id == UserRoleModel.role_id)
+                .filter(UserRoleModel.user_id.in_(user_ids))
+            )
+            for role in roles:
+                user_roles.setdefault(str(role.user_id), []).append(
+                    {"id": str(role.id), "name": role.name}
+                )
+
+        users = {}
+        for project_user in project_users:
+            user_dict = {"id": str(project_user.id), "name": project_user.name}
+            user_dict["roles"] = list(user_roles.get(str(project_user.id), []))
+            users.setdefault(str(project_user.project_id), []).append(user_dict)
+        return users
+
+    def _getLatestProjectAssessments(self, project_ids, assessment_filters):
+        """
+        Fetch the latest assessment (by start date) of each of the given projects
+        matching the filters, in a single DISTINCT ON (project_id) query
+        Input: list of project ids, list of assessment filters
+        Output: dict {project_id: assessment row}
+
+        """
+        if not project_ids:
+            return {}
+
+        assessments = (
+            session.query(
+                AssessmentModel.project_id,
+                AssessmentModel.overall_score,
+                AssessmentModel.tech_debt,
+                AssessmentModel.id,
+                AssessmentModel.status,
+            )
+            .filter(AssessmentModel.project_id.in_(project_ids), *assessment_filters)
+            .order_by(AssessmentModel.project_id, desc(AssessmentModel.start_date))
+            .distinct(AssessmentModel.project_id)
+        )
+        return {str(assessment.project_id): assessment for assessment in assessments}
+
     def _getProjectById(self, id):
         """
         Check if the given Id belong to a project in the system
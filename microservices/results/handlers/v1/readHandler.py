@@ -1,7 +1,9 @@
 from common.responseBuilder import ResponseBuilder
 from microservices.results.services.resultsService import Result
+from models.database.dbConnection import release_session
 
 
+@release_session
 def readHandler(event, context):
 
     try:
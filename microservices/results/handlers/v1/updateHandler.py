@@ -1,8 +1,10 @@
 import json
 
 from microservices.results.services.resultsService import Result
+from models.database.dbConnection import release_session
 
 
+@release_session
 def updateHandler(event, context):
 
     result = Result()
@@ -67,53 +67,11 @@ class Result:
             raise AnyExceptionHandler(
                 "en assessment does not belong to the given Project"
             )
-        result = {}
-        overall_score = assessment.overall_score
-        checklist_id = assessment.checklist_id
-        areas = session.query(AreaModel).filter(
-            AreaModel.checklist_id == checklist_id
-        )
-
-        assessment_result_details = []
-
-        for area in areas:
-            response = {}
-            area_id = str(area.id)
-            response["area_id"] = area_id
-            response["name"] = area.name
-            response["subareas"] = []
-            subareas = session.query(SubareaModel).filter(
-                SubareaModel.area_id == area_id
-            )
-
-            for subarea in subareas:
-                subarea_response = {}
-                subarea_id = subarea.id
-
-                subarea_id = str(subarea.id)
-                subarea_response["subarea_id"] = subarea_id
-                subarea_response["name"] = subarea.name
-
-                assessment_subarea_score = session.query(AssessmentSubareaScoreModel).filter(
-                    AssessmentSubareaScoreModel.subarea_id == subarea_id,
-                    AssessmentSubareaScoreModel.assessment_id == assessment_id,
-                ).first()
-                if not assessment_subarea_score is None:
-                    subarea_response[
-                        "subarea_score"
-                    ] = assessment_subarea_score.subarea_score
-                    subarea_response[
-                        "subarea_techdebt_count"
-                    ] = assessment_subarea_score.subarea_techdebt_count
-                    response["subareas"].append(subarea_response)
-                # else:
-                    # subarea_response["subarea_score"] = 13.45
-                    # subarea_response["subarea_techdebt_count"] = 12
-                    # response["subareas"].append(subarea_response)
-
-            assessment_result_details.append(response)
-        result["overall_score"] = overall_score
-        result["assessment_result_details"] = assessment_result_details
+        # the results are frozen when the grade calculation of the Reviewed
+        # assessment finishes, computed live for older assessments
+        result = assessment_object._getResultSnapshot(assessment_id)
+        if result is None:
+            result = assessment_object._buildAssessmentResults(assessment)
         return {"body": (result)}
 
     def _fetchItemScore(self, grade, effective_weightage):
@@ -201,7 +159,7 @@ class Result:
             session.query(AssessmentItemScoreModel)
             .filter(
                 AssessmentItemScoreModel.item_id == str(item_id),
-                assessment_id == str(assessment_id),
+                AssessmentItemScoreModel.assessment_id == str(assessment_id),
             )
             .first()
         )
@@ -211,16 +169,14 @@ class Result:
                 "Assessment Item score not found for the given item and assessment Id!"
             )
 
-        assessment_item_score.item_grade = grade
-        assessment_item_score.item_score = self._fetchItemScore(
-            grade, item.effective_weightage
-        )
         # assessment_item_score.modified_by=" "
         # To be implemented!!
         try:
-            session.add(assessment_item_score)
+            assessment_object._overrideItemGrade(
+                assessment, assessment_item_score, grade, item
+            )
             session.commit()
-            session.refresh()
+            session.refresh(assessment_item_score)
         except Exception as ex:
             session.rollback()
             raise AnyExceptionHandler(ex)
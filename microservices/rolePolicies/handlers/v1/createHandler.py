@@ -2,9 +2,12 @@ import json
 
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
 from microservices.rolePolicies.services.rolePoliciesService import RolePolicy
+from models.database.dbConnection import release_session
 
 
+@release_session
 def seedHandler(event, context):
     try:
         role_policy = RolePolicy()
@@ -32,6 +35,7 @@ def seedHandler(event, context):
     return responses
 
 
+@release_session
 def createHandler(event, context):
     try:
         role_policy = RolePolicy()
@@ -85,4 +89,5 @@ def _checkAndCreateFunctionParametersDictionary(event):
     # authenticated_user_id = "d30847c7-3c46-4e08-8955-c11b97a63db1"
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
     return kwargs
@@ -5,8 +5,10 @@ from common.responseBuilder import ResponseBuilder
 from microservices.rolePolicies.services.rolePoliciesService import (
     RolePolicy,
 )
+from models.database.dbConnection import release_session
 
 
+@release_session
 def updateHandler(event, context):
 
     try:
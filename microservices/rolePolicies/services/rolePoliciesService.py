@@ -13,7 +13,7 @@ from common.customExceptions import (  # PathParameterNotFound,; URLAttributeNot
     RequestBodyAttributeNotFound,
     RequestBodyNotFound,
 )
-from common.decorator import decor
+from common.decorator import decor, invalidatePolicyCache
 from microservices.roles.services.rolesService import Role as RoleClass
 from models.database.dbConnection import session
 from models.roleModels import Role as RoleModel
@@ -216,6 +216,7 @@ class RolePolicy:
 
             session.commit()
             session.refresh(role_policy)
+            invalidatePolicyCache()
         except exc.IntegrityError as ex:
             session.rollback()
             raise AnyExceptionHandler("Role already has same policy mapped to it!")
@@ -293,6 +294,7 @@ class RolePolicy:
             session.add(role_policy)
             session.commit()
             session.refresh(role_policy)
+            invalidatePolicyCache()
 
         except exc.IntegrityError as ex:
             session.rollback()
@@ -350,6 +352,7 @@ class RolePolicy:
         try:
             session.delete(policy)
             session.commit()
+            invalidatePolicyCache()
         except Exception as e:
             session.rollback()
             raise AnyExceptionHandler(e)
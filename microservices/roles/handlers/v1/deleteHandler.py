@@ -3,8 +3,10 @@ import json
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
 from microservices.roles.services.rolesService import Role
+from models.database.dbConnection import release_session
 
 
+@release_session
 def deleteHandler(event, context):
 
     try:
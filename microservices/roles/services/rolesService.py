@@ -7,7 +7,7 @@ from typing import Any
 
 import boto3
 from common.customExceptions import *
-from common.decorator import decor
+from common.decorator import decor, invalidatePolicyCache
 from dotenv import load_dotenv
 from models.database.dbConnection import session
 from models.roleModels import Role as RoleModel
@@ -144,6 +144,7 @@ class Role:
             session.add(role)
             session.commit()
             session.refresh(role)
+            invalidatePolicyCache()
         except Exception as ex:
             session.rollback()
             try:
@@ -213,6 +214,7 @@ class Role:
         try:
             session.delete(role)
             session.commit()
+            invalidatePolicyCache()
         except Exception as ex:
             session.rollback()
             raise AnyExceptionHandler(ex)
@@ -311,6 +313,7 @@ class Role:
             session.add(role)
             session.commit()
             session.refresh(role)
+            invalidatePolicyCache()
         except Exception as ex:
             session.rollback()
             try:
@@ -79,105 +79,38 @@ class Subarea:
             raise AnyExceptionHandler(
                 "Assessment does not belong to the given project!"
             )
-        checklist_id = assessment.checklist_id
+        snapshot = assessment_object._getChecklistSnapshot(assessment.checklist_id)
         area_id = kwargs.get("area_id")
-        assessment_object = AssessmentClass()
-        area_object = AreaClass()
-        area = area_object._getAreaById(area_id)
+        area = snapshot.getNode("area", area_id)
         if area is None:
-            raise AttributeIdNotFound("Area")
-        if not str(area.checklist_id) == checklist_id:
+            # not in the checklist snapshot, either missing or of another checklist
+            area_object = AreaClass()
+            if area_object._getAreaById(area_id) is None:
+                raise AttributeIdNotFound("Area")
             raise AnyExceptionHandler(
                 "Given Area doesn't belong to the assessment checklist!"
             )
-        subareas = session.query(SubareaModel).filter(
-            SubareaModel.area_id == area_id
-        )
 
         # 09-March-2023 | delta count for each item | start
-        subarea_ids = [str(sa.id) for sa in subareas]
-
-        subarea_delta_counts_manager = (
-            session.query(
-                ItemModel.subarea_id, func.count(AssessmentResponseDeltaModel.id)
-            )
-            .filter(
-                AssessmentResponseDeltaModel.assessment_id == str(assessment_id),
-                AssessmentResponseDeltaModel.type == "ReviewerDelta",
-                ActivityModel.id == AssessmentResponseDeltaModel.activity_id,
-                ItemModel.id == ActivityModel.item_id,
-                ItemModel.subarea_id.in_(subarea_ids),
-            )
-            .group_by(ItemModel.subarea_id)
+        # delta counts per activity are summed per subarea through the checklist snapshot
+        subarea_delta_dict_manager = snapshot.rollUpCounts(
+            assessment_object._getDeltaCountsByActivity(assessment_id, "ReviewerDelta"),
+            "subarea",
         )
-
-        subarea_delta_dict_manager = {
-            str(idc[0]): idc[1] for idc in subarea_delta_counts_manager
-        }
-        # 09-March-2023 | delta count for each item | end
-
-        # 09-March-2023 | delta count for each item of reviewer| start
-        subarea_delta_counts_reviewer = (
-            session.query(
-                ItemModel.subarea_id, func.count(AssessmentResponseDeltaModel.id)
-            )
-            .filter(
-                AssessmentResponseDeltaModel.assessment_id == str(assessment_id),
-                AssessmentResponseDeltaModel.type == "ManagerDelta",
-                ActivityModel.id == AssessmentResponseDeltaModel.activity_id,
-                ItemModel.id == ActivityModel.item_id,
-                ItemModel.subarea_id.in_(subarea_ids),
-            )
-            .group_by(ItemModel.subarea_id)
+        subarea_delta_dict_reviewer = snapshot.rollUpCounts(
+            assessment_object._getDeltaCountsByActivity(assessment_id, "ManagerDelta"),
+            "subarea",
         )
+        # 09-March-2023 | delta count for each item | end
 
-        subarea_delta_dict_reviewer = {
-            str(idc[0]): idc[1] for idc in subarea_delta_counts_reviewer
-        }
-
-        # 09-March-2023 | delta count for each item of reviewer| end
-
-        # subareasSerializedObject = [
-        #     subarea.as_dict() for subarea in subareas
-        # ]
         subareasSerializedObject = []
-        for subarea in subareas:
-            subarea_dict = subarea.as_dict()
-            # if (
-            #     any(subarea_delta_dict_manager)
-            #     and str(subarea.id) in subarea_delta_dict_manager
-            # ):
-            #     deltaResponseDict = {
-            #         "delta": {
-            #             "reviewer_delta": subarea_delta_dict_manager[str(subarea.id)]
-            #         }
-            #     }
-            # else:
-            #     deltaResponseDict = {"delta": {"reviewer_delta": 0}}
-
-            # response object update for delta count | start
-            if (
-                any(subarea_delta_dict_manager)
-                and str(subarea.id) in subarea_delta_dict_manager
-            ):
-                reviewer_delta = subarea_delta_dict_manager[str(subarea.id)]
-
-            else:
-                reviewer_delta = 0
-
-            if (
-                any(subarea_delta_dict_reviewer)
-                and str(subarea.id) in subarea_delta_dict_reviewer
-            ):
-                manager_delta = subarea_delta_dict_reviewer[str(subarea.id)]
-            else:
-                manager_delta = 0
-            # response object update for delta count | end
+        for subarea in snapshot.getChildren(area.id):
+            subarea_dict = dict(subarea.data)
 
             deltaResponseDict = {
                 "delta": {
-                    "reviewer_delta": manager_delta,
-                    "manager_delta": reviewer_delta,
+                    "reviewer_delta": subarea_delta_dict_reviewer.get(subarea.id, 0),
+                    "manager_delta": subarea_delta_dict_manager.get(subarea.id, 0),
                 }
             }
 
@@ -2,9 +2,12 @@ import json
 
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
 from microservices.userRoles.services.userRolesService import UserRole
+from models.database.dbConnection import release_session
 
 
+@release_session
 def createHandler(event, context):
 
     try:
@@ -53,4 +56,5 @@ def _checkAndCreateFunctionParametersDictionary(event):
 
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
     return kwargs
@@ -1,8 +1,10 @@
 from common.customExceptions import URLAttributeNotFound
 from common.responseBuilder import ResponseBuilder
 from microservices.userRoles.services.userRolesService import UserRole
+from models.database.dbConnection import release_session
 
 
+@release_session
 def deleteHandler(event, context):
 
     try:
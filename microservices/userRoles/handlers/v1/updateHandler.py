@@ -2,9 +2,12 @@ import json
 
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
 from microservices.userRoles.services.userRolesService import UserRole
+from models.database.dbConnection import release_session
 
 
+@release_session
 def updateHandler(event, context):
 
     try:
@@ -57,6 +60,7 @@ def _checkAndCreateFunctionParametersDictionary(event):
     user_id = event.get("pathParameters").get("user_id")
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
     kwargs["user_id"] = user_id
     kwargs["names"] = names
     return kwargs
@@ -2,9 +2,12 @@ import json
 
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
 from microservices.users.services.usersService import User
+from models.database.dbConnection import release_session
 
 
+@release_session
 def createHandler(event, context):
 
     try:
@@ -59,5 +62,6 @@ def _checkAndCreateFunctionParametersDictionary(event):
     kwargs["ps_no"] = ps_no
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
 
     return kwargs
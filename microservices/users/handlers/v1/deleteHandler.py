@@ -1,8 +1,11 @@
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
 from microservices.users.services.usersService import User
+from models.database.dbConnection import release_session
 
 
+@release_session
 def deleteHandler(event, context):
 
     try:
@@ -45,5 +48,6 @@ def _checkAndCreateFunctionParametersDictionary(event):
     kwargs["user_id"] = user_id
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
 
     return kwargs
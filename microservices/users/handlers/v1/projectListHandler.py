@@ -2,8 +2,11 @@ from common.customExceptions import URLAttributeNotFound
 from common.customExceptions import AttributeIdNotFound
 from common.decorator import decor
 from common.responseBuilder import ResponseBuilder
+from common.decorator import getPermissionContext
 from microservices.users.services.usersService import User
+from models.database.dbConnection import release_session
 
+@release_session
 def listHandler(event, context):
 
     try:
@@ -38,6 +41,7 @@ def _checkAndCreateFunctionParametersDictionary(event):
         authenticated_user_roles = [authenticated_user_roles]
     kwargs["authenticated_user_id"] = authenticated_user_id
     kwargs["authenticated_user_roles"] = authenticated_user_roles
+    kwargs.update(getPermissionContext(event))
 
     if not event.get("pathParameters").get("user_id"):
         raise URLAttributeNotFound("User Id")
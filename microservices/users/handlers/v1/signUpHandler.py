@@ -1,8 +1,10 @@
 from common.customExceptions import *
 from common.responseBuilder import ResponseBuilder
 from microservices.users.services.usersService import User
+from models.database.dbConnection import release_session
 
 
+@release_session
 def preSignUpHandler(event, context):
 
     try:
@@ -15,6 +17,7 @@ def preSignUpHandler(event, context):
     return event
 
 
+@release_session
 def postSignUpHandler(event, context):
 
     try:
@@ -18,6 +18,7 @@ from models.assessmentModels import AssessmentStatus
 from models.database.dbConnection import session
 from models.projectModels import Project as ProjectModel
 from models.projectUserModels import ProjectUser as ProjectUserModel
+from models.roleModels import Role as RoleModel
 from models.userModels import User as UserModel
 from models.userModels import UserStatus
 from models.userRoleModels import UserRole as UserRoleModel
@@ -58,6 +59,9 @@ def get_random_pass(pass_length=16):
     )
 
 
+USER_LIST_CHUNK_SIZE = 500
+
+
 class User:
     def _getAllUserRoleById(self, user_id):
         user_role = []
@@ -122,8 +126,32 @@ class User:
             else:
                 users = users.filter(UserModel.name.ilike(f"%{search}%"))
 
+        if kwargs["download"]:
+            # the whole filtered list is exported, users are streamed in
+            # chunks straight to the caller instead of paginated
+            paginate = Pagination(
+                UserModel,
+                **{
+                    "page_size": 0,
+                    "sort_key": kwargs["sort_key"],
+                    "sort_order": kwargs["sort_order"],
+                    "total_data_count": 0,
+                },
+            )
+            sort_key_order = paginate._getPaginationSetting()["sort_key_order"]
+            if sort_key_order is None:
+                sort_key_order = UserModel.id
+            return self._iterateUserListDetails(users.order_by(sort_key_order)), {}
+
         # Pagination logic | Start
-        total_data_count = users.count()
+        if kwargs.get("after") is not None:
+            # keyset pagination skips the full count, the unfiltered list
+            # gets the planner estimate
+            total_data_count = None
+            if not (kwargs["role"] or kwargs["status"] or kwargs["search"]):
+                total_data_count = Pagination._getEstimatedCount(session, UserModel)
+        else:
+            total_data_count = users.count()
 
         paginate = Pagination(
             UserModel,
@@ -133,45 +161,112 @@ class User:
                 "sort_key": kwargs["sort_key"],
                 "sort_order": kwargs["sort_order"],
                 "total_data_count": total_data_count,
+                "after": kwargs.get("after"),
             },
         )
 
-        pagination_setting = paginate._getPaginationSetting()
-        pagination_response_attributes = paginate._getResponseAttribute()
-        users = (
-            users.order_by(pagination_setting["sort_key_order"])
-            .limit(pagination_setting["page_size"])
-            .offset(pagination_setting["offset_value"])
-        )
+        if paginate._isKeysetMode():
+            users = paginate._getKeysetPage(users)
+            pagination_response_attributes = paginate._getResponseAttribute()
+        else:
+            pagination_setting = paginate._getPaginationSetting()
+            pagination_response_attributes = paginate._getResponseAttribute()
+            users = (
+                users.order_by(pagination_setting["sort_key_order"])
+                .limit(pagination_setting["page_size"])
+                .offset(pagination_setting["offset_value"])
+                .all()
+            )
         # Pagination logic | End
 
-        results = []
-        for user in users:
-
-            user_dict = user.as_dict()
-            role_object = RoleClass()
+        results = self._getUserListDetails(users)
 
-            # roles = role_object._getAllRoleById(user.id)
-            user_roles = self._getAllUserRoleById(user.id)
-            roles_lst = []
+        return results, pagination_response_attributes
 
-            for user_role in user_roles:
-                role = role_object._getRoleById(user_role.role_id)
-                role_dict = {"id": str(role.id), "name": role.name}
-                roles_lst.append(role_dict)
-            user_dict["roles"] = roles_lst
-            results.append(user_dict)
+    def _iterateUserListDetails(self, users, chunk_size=USER_LIST_CHUNK_SIZE):
+        """
+        Stream the details of the given users query chunk by chunk
+        Input: users query, number of users loaded per chunk
+        Output: generator of user dicts (with past projects for download)
+        """
+        chunk = []
+        for user in users.yield_per(chunk_size):
+            chunk.append(user)
+            if len(chunk) == chunk_size:
+                yield from self._getUserListDetails(chunk, download=True)
+                chunk = []
+        if chunk:
+            yield from self._getUserListDetails(chunk, download=True)
+
+    def _getUserListDetails(self, users, download=False):
+        """
+        Fetch roles, current project, past projects and last audited project
+        for all the given users in a fixed number of queries
+        Input: list of users
+        Output: List [] of user dicts
+        """
+        user_ids = [str(user.id) for user in users]
+        if not user_ids:
+            return []
+
+        user_roles = {}
+        roles = (
+            session.query(UserRoleModel.user_id, RoleModel.id, RoleModel.name)
+            .join(RoleModel, RoleModel.id == UserRoleModel.role_id)
+            .filter(UserRoleModel.user_id.in_(user_ids))
+        )
+        for role in roles:
+            user_roles.setdefault(str(role.user_id), []).append(
+                {"id": str(role.id), "name": role.name}
+            )
 
-            # Fetch user's last Audited Project with the assessment details and Current Projects
-            current_project = (
-                session.query(ProjectModel, ProjectUserModel)
-                .join(ProjectUserModel)
+        current_projects = {}
+        past_projects = {}
+        projects = (
+            session.query(ProjectModel, ProjectUserModel)
+            .join(ProjectUserModel)
+            .filter(ProjectUserModel.user_id.in_(user_ids))
+            .all()
+        )
+        for project in projects:
+            user_id = str(project[1].user_id)
+            if project[1].end_date is None:
+                current_projects.setdefault(user_id, project)
+            else:
+                past_projects.setdefault(user_id, []).append(project)
+
+        # latest reviewed assessment of every past project
+        past_project_ids = list(
+            {
+                str(project[0].id)
+                for user_past_projects in past_projects.values()
+                for project in user_past_projects
+            }
+        )
+        project_assessments = {}
+        if past_project_ids:
+            assessments = (
+                session.query(AssessmentModel)
                 .filter(
-                    ProjectUserModel.user_id == str(user.id),
-                    ProjectUserModel.end_date == None,
+                    AssessmentModel.project_id.in_(past_project_ids),
+                    AssessmentModel.end_date != None,
+                    AssessmentModel.status == AssessmentStatus.Reviewed,
                 )
-                .first()
+                .order_by(AssessmentModel.project_id, AssessmentModel.end_date.desc())
+                .distinct(AssessmentModel.project_id)
             )
+            project_assessments = {
+                str(assessment.project_id): assessment for assessment in assessments
+            }
+
+        results = []
+        for user in users:
+            user_id = str(user.id)
+            user_dict = user.as_dict()
+            user_dict["roles"] = list(user_roles.get(user_id, []))
+
+            # user's last Audited Project with the assessment details and Current Projects
+            current_project = current_projects.get(user_id)
             user_dict["current_project"] = (
                 current_project[0].as_dict() if current_project else dict()
             )
@@ -179,64 +274,30 @@ class User:
                 current_project[1].as_dict() if current_project else dict()
             )
 
-            projects = (
-                session.query(ProjectModel, ProjectUserModel)
-                .join(ProjectUserModel)
-                .filter(
-                    ProjectUserModel.user_id == str(user.id),
-                    ProjectUserModel.end_date != None,
-                )
-                .all()
-            )
-
-            project_ids = [str(project[0].id) for project in projects]
+            user_past_projects = past_projects.get(user_id, [])
             user_dict["last_audited_project"] = {}
-
-            assessments = (
-                session.query(AssessmentModel)
-                .filter(AssessmentModel.project_id.in_(project_ids))
-                .order_by(AssessmentModel.end_date.desc())
-            )
-
-            if kwargs["download"]:
-                # Append all the past projects of the users along with the latest project assessment details
-                user_dict["project_project_user_tuple_list"] = list()
-                for project in projects:
-                    last_audited_project = None
-                    for assessment in assessments:
-                        if (
-                            assessment.end_date
-                            and assessment.status == AssessmentStatus.Reviewed
-                        ):
-                            last_audited_project = (
-                                session.query(ProjectModel)
-                                .filter(ProjectModel.id == assessment.project_id)
-                                .first()
-                            )
-                            last_audited_project = last_audited_project.as_dict()
-                            last_audited_project["assessment"] = assessment.as_dict()
-                            user_dict["last_audited_project"] = last_audited_project
-                            break
-                    user_dict["project_project_user_tuple_list"].append(project)
-
-            else:
-                for assessment in assessments:
-                    if (
-                        assessment.end_date
-                        and assessment.status == AssessmentStatus.Reviewed
-                    ):
-                        last_audited_project = (
-                            session.query(ProjectModel)
-                            .filter(ProjectModel.id == assessment.project_id)
-                            .first()
-                        )
-                        last_audited_project = last_audited_project.as_dict()
-                        last_audited_project["assessment"] = assessment.as_dict()
-                        user_dict["last_audited_project"] = last_audited_project
-
-                        break
-
-        return results, pagination_response_attributes
+            last_audited_project = None
+            last_assessment = None
+            for project in user_past_projects:
+                assessment = project_assessments.get(str(project[0].id))
+                if assessment and (
+                    last_assessment is None
+                    or assessment.end_date > last_assessment.end_date
+                ):
+                    last_audited_project = project[0]
+                    last_assessment = assessment
+            if last_assessment:
+                last_audited_project = last_audited_project.as_dict()
+                last_audited_project["assessment"] = last_assessment.as_dict()
+                user_dict["last_audited_project"] = last_audited_project
+
+            if download:
+                # all the past projects of the users
+                user_dict["project_project_user_tuple_list"] = list(
+                    user_past_projects
+                )
+            results.append(user_dict)
+        return results
 
     def _checkCreateUserParameters(self, **kwargs):
         required_parameters = {
@@ -0,0 +1,55 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+# every model module is imported so that Base.metadata knows all the tables
+import models.accessControlModels
+import models.accountModels
+import models.assessmentModels
+import models.checklistModels
+import models.domainModels
+import models.notificationModels
+import models.projectModels
+import models.projectUserModels
+import models.resultModels
+import models.roleModels
+import models.rolePolicyModels
+import models.userModels
+import models.userRoleModels
+from models.commonImports import Base
+from models.database.dbConnection import get_engine
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    """
+    Emit the migration SQL to stdout instead of running it (alembic upgrade head --sql)
+    """
+    context.configure(
+        url=get_engine().url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    with get_engine().connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,129 @@
+"""composite and partial indexes for the hot query predicates
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, unique, partial index predicate)
+INDEXES = [
+    (
+        "ux_t_tenet_response_assessment_type_activity",
+        "t_tenet_response",
+        ["assessment_id", "type", "activity_id"],
+        True,
+        None,
+    ),
+    (
+        "ix_t_tenet_assessment_response_delta_assessment_type_activity",
+        "t_tenet_assessment_response_delta",
+        ["assessment_id", "type", "activity_id"],
+        False,
+        None,
+    ),
+    (
+        "ix_t_tenet_assessment_item_score_assessment_item",
+        "t_tenet_assessment_item_score",
+        ["assessment_id", "item_id"],
+        False,
+        None,
+    ),
+    # same name postgres gives the UniqueConstraint declared on the model,
+    # so that nothing is created where create_all already added it
+    (
+        "t_tenet_assessment_item_score_item_id_assessment_id_key",
+        "t_tenet_assessment_item_score",
+        ["item_id", "assessment_id"],
+        True,
+        None,
+    ),
+    (
+        "ux_t_tenet_assessment_subarea_score_assessment_subarea",
+        "t_tenet_assessment_subarea_score",
+        ["assessment_id", "subarea_id"],
+        True,
+        None,
+    ),
+    (
+        "ix_t_tenet_project_user_mapper_project_end_date",
+        "t_tenet_project_user_mapper",
+        ["project_id", "end_date"],
+        False,
+        None,
+    ),
+    (
+        "ix_t_tenet_project_user_mapper_user_end_date",
+        "t_tenet_project_user_mapper",
+        ["user_id", "end_date"],
+        False,
+        None,
+    ),
+    (
+        "ix_t_tenet_user_role_mapper_user",
+        "t_tenet_user_role_mapper",
+        ["user_id"],
+        False,
+        None,
+    ),
+    (
+        "CasbinRule_role_id_resource_action_key",
+        "CasbinRule",
+        ["role_id", "resource", "action"],
+        True,
+        None,
+    ),
+    (
+        "ix_t_tenet_grade_calculation_status_active_assessment",
+        "t_tenet_assessment_grade_calculation_status",
+        ["assessment_id"],
+        False,
+        "active",
+    ),
+    (
+        "ix_t_tenet_assessment_project_status_start_date",
+        "t_tenet_assessment",
+        ["project_id", "status", "start_date"],
+        False,
+        None,
+    ),
+]
+
+
+def upgrade():
+    # indexes are built CONCURRENTLY so that the tables stay writable,
+    # which cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=unique,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique, where in reversed(INDEXES):
+            if name.endswith("_key"):
+                # created along with the table by create_all
+                continue
+            op.drop_index(
+                name,
+                table_name=table,
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
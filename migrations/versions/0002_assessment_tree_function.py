@@ -0,0 +1,46 @@
+"""function description of the assessment tree endpoint
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+"""
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# (function name, resource, action) looked up by common.decorator.decor
+FUNCTION_DESCRIPTIONS = [
+    ("getAssessmentTree", "Assessment", "Read"),
+]
+
+
+def upgrade():
+    for name, resource, action in FUNCTION_DESCRIPTIONS:
+        op.execute(
+            sa.text(
+                "INSERT INTO t_tenet_function_description (id, name, resource, action) "
+                "SELECT :id, :name, :resource, :action "
+                "WHERE NOT EXISTS "
+                "(SELECT 1 FROM t_tenet_function_description WHERE name = :name)"
+            ).bindparams(
+                id=str(uuid.uuid4()), name=name, resource=resource, action=action
+            )
+        )
+
+
+def downgrade():
+    for name, resource, action in FUNCTION_DESCRIPTIONS:
+        op.execute(
+            sa.text(
+                "DELETE FROM t_tenet_function_description WHERE name = :name"
+            ).bindparams(name=name)
+        )
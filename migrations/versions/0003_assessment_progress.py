@@ -0,0 +1,67 @@
+"""assessment progress counters
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+COUNTER_COLUMNS = [
+    "manager_yes_count",
+    "manager_no_count",
+    "manager_na_count",
+    "manager_unanswered_count",
+    "reviewer_yes_count",
+    "reviewer_no_count",
+    "reviewer_na_count",
+    "reviewer_unanswered_count",
+]
+
+
+def _counterColumns():
+    return [
+        sa.Column(column, sa.Integer(), nullable=False, server_default="0")
+        for column in COUNTER_COLUMNS
+    ]
+
+
+def upgrade():
+    # the bootstrap command may already have created the tables from the models
+    existing_tables = sa.inspect(op.get_bind()).get_table_names()
+    if "t_tenet_assessment_progress" not in existing_tables:
+        op.create_table(
+            "t_tenet_assessment_progress",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column(
+                "assessment_id",
+                postgresql.UUID(),
+                sa.ForeignKey("t_tenet_assessment.id"),
+                nullable=False,
+            ),
+            *_counterColumns(),
+            sa.Column("created_on", sa.DateTime(), nullable=False),
+            sa.Column("modified_on", sa.DateTime()),
+        )
+    op.create_index(
+        "ux_t_tenet_assessment_progress_assessment",
+        "t_tenet_assessment_progress",
+        ["assessment_id"],
+        unique=True,
+        if_not_exists=True,
+    )
+    # the counters of existing assessments are filled by
+    # python -m microservices.assessments.rebuildProgress
+
+
+def downgrade():
+    op.drop_table("t_tenet_assessment_progress")
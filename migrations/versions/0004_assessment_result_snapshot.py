@@ -0,0 +1,53 @@
+"""frozen results document of Reviewed assessments
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # the bootstrap command may already have created the table from the models
+    existing_tables = sa.inspect(op.get_bind()).get_table_names()
+    if "t_tenet_assessment_result_snapshot" not in existing_tables:
+        op.create_table(
+            "t_tenet_assessment_result_snapshot",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column(
+                "assessment_id",
+                postgresql.UUID(),
+                sa.ForeignKey("t_tenet_assessment.id"),
+                nullable=False,
+            ),
+            sa.Column(
+                "grade_calculation_task_id",
+                postgresql.UUID(),
+                sa.ForeignKey("t_tenet_assessment_grade_calculation_status.id"),
+            ),
+            sa.Column("version", sa.Integer(), nullable=False),
+            sa.Column("result", postgresql.JSONB(), nullable=False),
+            sa.Column("created_on", sa.DateTime(), nullable=False),
+            sa.Column("modified_on", sa.DateTime()),
+        )
+    op.create_index(
+        "ux_t_tenet_assessment_result_snapshot_assessment",
+        "t_tenet_assessment_result_snapshot",
+        ["assessment_id"],
+        unique=True,
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_table("t_tenet_assessment_result_snapshot")
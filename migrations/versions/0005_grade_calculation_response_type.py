@@ -0,0 +1,44 @@
+"""response type of the grade calculation tasks, for incremental grading
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # the responsetype enum already exists for t_tenet_response
+    columns = [
+        column["name"]
+        for column in sa.inspect(op.get_bind()).get_columns(
+            "t_tenet_assessment_grade_calculation_status"
+        )
+    ]
+    if "response_type" not in columns:
+        op.add_column(
+            "t_tenet_assessment_grade_calculation_status",
+            sa.Column(
+                "response_type",
+                postgresql.ENUM(
+                    "ManagerResponse",
+                    "ReviewerResponse",
+                    name="responsetype",
+                    create_type=False,
+                ),
+            ),
+        )
+
+
+def downgrade():
+    op.drop_column("t_tenet_assessment_grade_calculation_status", "response_type")
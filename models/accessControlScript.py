@@ -39,6 +39,7 @@ function_description = {
     "createAssessment": ("Assessment", "Create"),
     "getAssessmentList": ("Assessment", "Read"),
     "getAssessmentDetails": ("Assessment", "Read"),
+    "getAssessmentTree": ("Assessment", "Read"),
     "updateAssessmentStatus": ("Assessment", "Write"),
     "updateAssessmentResponses": ("AssessmentResponse", "Write"),
     "getAreaList": ("Area", "Read"),
@@ -48,6 +49,7 @@ function_description = {
     "createDomain": ("Domain", "Create"),
     "getDomainDetails": ("Domain", "Read"),
     "getDomainList": ("Domain", "Read"),
+    "importChecklist": ("Checklist", "Create"),
 }
 
 
@@ -26,6 +26,14 @@ class AssessmentStatus(enum.Enum):
 
 class Assessment(Base):
     __tablename__ = "t_tenet_assessment"
+    __table_args__ = (
+        Index(
+            "ix_t_tenet_assessment_project_status_start_date",
+            "project_id",
+            "status",
+            "start_date",
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(Text, nullable=False)
@@ -80,6 +88,15 @@ class ResponseType(enum.Enum):
 class Response(Base):
 
     __tablename__ = "t_tenet_response"
+    __table_args__ = (
+        Index(
+            "ux_t_tenet_response_assessment_type_activity",
+            "assessment_id",
+            "type",
+            "activity_id",
+            unique=True,
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
@@ -122,6 +139,14 @@ class DeltaType(enum.Enum):
 
 class AssessmentResponseDelta(Base):
     __tablename__ = "t_tenet_assessment_response_delta"
+    __table_args__ = (
+        Index(
+            "ix_t_tenet_assessment_response_delta_assessment_type_activity",
+            "assessment_id",
+            "type",
+            "activity_id",
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     activity_id = Column(UUID, ForeignKey(
@@ -160,12 +185,22 @@ class AssessmentResponseDelta(Base):
 
 class GradeCalculationTask(Base):
     __tablename__ = "t_tenet_assessment_grade_calculation_status"
+    __table_args__ = (
+        Index(
+            "ix_t_tenet_grade_calculation_status_active_assessment",
+            "assessment_id",
+            postgresql_where=text("active"),
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     assessment_id = Column(UUID, ForeignKey(
         "t_tenet_assessment.id"), nullable=False)
     status = Column(Boolean, default=False)
     active = Column(Boolean, default=True)
+    # responses the item grades were calculated from, incremental runs only
+    # build on a completed task of the same response type
+    response_type = Column(Enum(ResponseType))
     created_on = Column(
         DateTime, default=datetime.datetime.utcnow, nullable=False)
     modified_on = Column(DateTime)
@@ -184,3 +219,44 @@ class GradeCalculationTask(Base):
                 _value = str(_value)
             _json[_column_name] = _value
         return _json
+
+
+class AssessmentProgress(Base):
+    # response counters of an assessment, kept in step with t_tenet_response
+    __tablename__ = "t_tenet_assessment_progress"
+    __table_args__ = (
+        Index(
+            "ux_t_tenet_assessment_progress_assessment",
+            "assessment_id",
+            unique=True,
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    assessment_id = Column(UUID, ForeignKey(
+        "t_tenet_assessment.id"), nullable=False)
+    manager_yes_count = Column(Integer, default=0, nullable=False)
+    manager_no_count = Column(Integer, default=0, nullable=False)
+    manager_na_count = Column(Integer, default=0, nullable=False)
+    manager_unanswered_count = Column(Integer, default=0, nullable=False)
+    reviewer_yes_count = Column(Integer, default=0, nullable=False)
+    reviewer_no_count = Column(Integer, default=0, nullable=False)
+    reviewer_na_count = Column(Integer, default=0, nullable=False)
+    reviewer_unanswered_count = Column(Integer, default=0, nullable=False)
+    created_on = Column(
+        DateTime, default=datetime.datetime.utcnow, nullable=False)
+    modified_on = Column(DateTime)
+
+    def as_dict(self):
+        _json = {}
+        for c in self.__table__.columns:
+            _column_name = c.name
+            _value = getattr(self, _column_name)
+            if type(_value) in [type(None)] or isinstance(_value, bool):
+                pass
+            elif isinstance(_value, enum.Enum):
+                _value = _value.value
+            else:
+                _value = str(_value)
+            _json[_column_name] = _value
+        return _json
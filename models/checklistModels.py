@@ -63,7 +63,7 @@ class Area(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(Text, unique=True, nullable=False)
     weightage = Column(FLOAT(precision=10, scale=2))
-    checklist_id = Column(Integer, ForeignKey("t_tenet_checklist.id"))
+    checklist_id = Column(UUID, ForeignKey("t_tenet_checklist.id"))
     created_by = Column(UUID, ForeignKey("t_tenet_user.id"), nullable=False)
     created_on = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
     modified_by = Column(UUID, ForeignKey("t_tenet_user.id"))
@@ -92,7 +92,7 @@ class Subarea(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(Text, unique=True, nullable=False)
     weightage = Column(FLOAT(precision=10, scale=2))
-    area_id = Column(Integer, ForeignKey("t_tenet_area.id"))
+    area_id = Column(UUID, ForeignKey("t_tenet_area.id"))
     created_by = Column(UUID, ForeignKey("t_tenet_user.id"), nullable=False)
     created_on = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
     modified_by = Column(UUID, ForeignKey("t_tenet_user.id"))
@@ -150,7 +150,7 @@ class Activity(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(Text, nullable=False)
     importance = Column(Enum(ActivityImportance))
-    item_id = Column(Integer, ForeignKey("t_tenet_item.id"))
+    item_id = Column(UUID, ForeignKey("t_tenet_item.id"))
     created_by = Column(UUID, ForeignKey("t_tenet_user.id"), nullable=False)
     created_on = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
     modified_by = Column(UUID, ForeignKey("t_tenet_user.id"))
@@ -0,0 +1,24 @@
+"""
+Creates the database and the tables which do not exist yet.
+Run once per environment before deploying, lambdas never do this on cold start:
+    python -m models.database.bootstrap
+"""
+# every model module is imported so that Base.metadata knows all the tables
+import models.accessControlModels
+import models.accountModels
+import models.assessmentModels
+import models.checklistModels
+import models.domainModels
+import models.notificationModels
+import models.projectModels
+import models.projectUserModels
+import models.resultModels
+import models.roleModels
+import models.rolePolicyModels
+import models.userModels
+import models.userRoleModels
+from models.commonImports import Base
+from models.database.dbConnection import database
+
+if __name__ == "__main__":
+    database.bootstrap(Base.metadata)
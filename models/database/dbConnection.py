@@ -1,21 +1,26 @@
+import functools
 import logging
 import os
+from contextlib import contextmanager
 from pathlib import Path
 
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
-from sqlalchemy.orm import backref, relation, sessionmaker
+from sqlalchemy.orm import Session, scoped_session
+from sqlalchemy.pool import NullPool
 from sqlalchemy_utils import create_database, database_exists
-from sqlalchemy_utils.functions.orm import naturally_equivalent
 
 dotenv_path = Path("./.env")
 load_dotenv(dotenv_path=dotenv_path)
-from sqlalchemy.orm import relationship
 
 log = logging.getLogger(__name__)
-print("###" * 8)
-print(os.getcwd())
-print(os.getenv("PG_USER"))
+
+# connection settings tuned for lambda, the engine lives as long as the warm container
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 2))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 0))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 300))
+# RDS Proxy does the pooling, connections are then not kept in the container
+DB_USE_NULL_POOL = os.getenv("DB_USE_NULL_POOL", "false").lower() == "true"
 
 
 class Database:
@@ -34,20 +39,14 @@ class Database:
 
         return engine
 
-    def get_engine_from_settings(self):
+    def get_url_from_settings(self):
         """
-        Sets up database connection from en file
+        Builds the database url from env file
         Input:
-            Dictionary containing pghost, pguser, pgpassword, pgdatabase and pgport.
+            pghost, pguser, pgpassword, pgdatabase and pgport env variables.
         Returns:
-            Call to get_database returning engine
+            database url
         """
-        from pathlib import Path
-
-        from dotenv import load_dotenv
-
-        dotenv_path = Path("./.env")
-        load_dotenv(dotenv_path=dotenv_path)
         if (
             not os.getenv("PG_USER")
             and not os.getenv("PG_PASSWORD")
@@ -58,7 +57,7 @@ class Database:
 
             raise Exception("Bad config file")
 
-        return self.get_engine(
+        return self.get_url(
             os.getenv("PG_USER"),
             os.getenv("PG_PASSWORD"),
             os.getenv("PG_HOST"),
@@ -66,42 +65,121 @@ class Database:
             os.getenv("PG_DB"),
         )
 
-    def get_engine(self, user, passwd, host, port, db):
+    def get_url(self, user, passwd, host, port, db):
+        url = "postgresql://{user}:{passwd}@{host}:{port}/{db}".format(
+            user=user, passwd=passwd, host=host, port=port, db=db
+        )
+        return url
+
+    def get_engine_from_settings(self):
         """
-        Get SQLalchemy engine using credentials.
+        Sets up database connection from en file
+        Returns:
+            Call to get_engine returning engine
+        """
+        return self.get_engine(self.get_url_from_settings())
+
+    def get_engine_options(self):
+        """
+        Engine options for warm lambda reuse.
+        Returns:
+            dict of create_engine keyword arguments
+        """
+        options = {
+            "echo": False,
+            "pool_pre_ping": True,
+            "pool_recycle": DB_POOL_RECYCLE,
+            "executemany_mode": "values_plus_batch",
+        }
+        if DB_USE_NULL_POOL:
+            options["poolclass"] = NullPool
+        else:
+            options["pool_size"] = DB_POOL_SIZE
+            options["max_overflow"] = DB_MAX_OVERFLOW
+        return options
+
+    def get_engine(self, url):
+        """
+        Get SQLalchemy engine for the database url.
         Input:
-            db: database name
-            user: Username
-            host: Hostname of the database server
-            port: Port number
-            passwd: Password for the database
+            url: database url
         Returns:
             Database engine
         """
-
-        url = "postgresql://{user}:{passwd}@{host}:{port}/{db}".format(
-            user=user, passwd=passwd, host=host, port=port, db=db
-        )
-        if not database_exists(url):
-            create_database(url)
-        engine = create_engine(url, pool_size=2, echo=False)
+        engine = create_engine(url, **self.get_engine_options())
         return engine
 
-    def get_session(self):
+    def bootstrap(self, metadata):
         """
-        Return an SQLAlchemy session
+        Creates the database and the tables of the metadata if they do not exist.
+        Only to be run from the bootstrap command, never on a lambda cold start.
         Input:
-            engine: an SQLAlchemy engine
+            metadata: SQLAlchemy metadata of the models
         """
-        engine = self.get_database()
-        # conn = engine.connect()
-        # results = conn.execute('SELECT * from  comment;')
-        # print(results.fetchall())   # [(100, 'Joe'), (100, 'Jane')]
-        # conn.close()
-        session = sessionmaker(bind=engine)()
-        # session = Session()
-        return session, engine
+        url = self.get_url_from_settings()
+        if not database_exists(url):
+            create_database(url)
+        metadata.create_all(get_engine())
 
 
 database = Database()
-session, engine = database.get_session()
+_engine = None
+
+
+def get_engine():
+    """
+    Engine of the container, created on first use.
+    """
+    global _engine
+    if _engine is None:
+        _engine = database.get_database()
+    return _engine
+
+
+class _LazyEngine:
+    """
+    Stand-in for the engine which is only created when it is first used,
+    so that importing the models does not connect to the database.
+    """
+
+    def __getattr__(self, name):
+        return getattr(get_engine(), name)
+
+
+engine = _LazyEngine()
+
+# shared session of the services, bound to the engine on first use
+session = scoped_session(lambda: Session(bind=get_engine()))
+
+
+@contextmanager
+def session_scope():
+    """
+    Session for one lambda invocation, commits on success, rolls back on error
+    and releases the connection and the identity map at the end.
+    """
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.remove()
+
+
+def release_session(handler):
+    """
+    Decorator of the lambda entry points, the session of the invocation is
+    removed when the handler returns: uncommitted changes are rolled back, the
+    identity map is dropped and the connection goes back to the pool.
+    """
+
+    @functools.wraps(handler)
+    def inner(event, context):
+        try:
+            return handler(event, context)
+        finally:
+            session.remove()
+
+    return inner
@@ -45,6 +45,3 @@ class Notification(Base):
                 _value = str(_value)
             _json[_column_name] = _value
         return _json
-
-
-Base.metadata.create_all(engine)
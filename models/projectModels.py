@@ -47,6 +47,3 @@ class Project(Base):
                 _value = str(_value)
             _json[_column_name] = _value
         return _json
-
-
-Base.metadata.create_all(engine)
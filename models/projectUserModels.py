@@ -11,6 +11,18 @@ from models.userModels import *
 
 class ProjectUser(Base):
     __tablename__ = "t_tenet_project_user_mapper"
+    __table_args__ = (
+        Index(
+            "ix_t_tenet_project_user_mapper_project_end_date",
+            "project_id",
+            "end_date",
+        ),
+        Index(
+            "ix_t_tenet_project_user_mapper_user_end_date",
+            "user_id",
+            "end_date",
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     project_id = Column(UUID, ForeignKey("t_tenet_project.id"), nullable=False)
@@ -34,6 +46,3 @@ class ProjectUser(Base):
                 _value = str(_value)
             _json[_column_name] = _value
         return _json
-
-
-Base.metadata.create_all(engine)
@@ -1,6 +1,7 @@
 # from commonImports import *
 # from userModels import *
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
 
 from models.assessmentModels import *
 from models.checklistModels import *
@@ -21,6 +22,14 @@ from models.userModels import *
 
 class AssessmentSubareaScore(Base):
     __tablename__ = "t_tenet_assessment_subarea_score"
+    __table_args__ = (
+        Index(
+            "ux_t_tenet_assessment_subarea_score_assessment_subarea",
+            "assessment_id",
+            "subarea_id",
+            unique=True,
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     subarea_id = Column(UUID, ForeignKey("t_tenet_subarea.id"), nullable=False)
@@ -62,6 +71,13 @@ class ItemGrade(enum.Enum):
 
 class AssessmentItemScore(Base):
     __tablename__ = "t_tenet_assessment_item_score"
+    __table_args__ = (
+        Index(
+            "ix_t_tenet_assessment_item_score_assessment_item",
+            "assessment_id",
+            "item_id",
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     item_id = Column(UUID, ForeignKey("t_tenet_item.id"), nullable=False)
@@ -91,4 +107,40 @@ class AssessmentItemScore(Base):
         return _json
 
 
-Base.metadata.create_all(engine)
+class AssessmentResultSnapshot(Base):
+    # results document of a Reviewed assessment, written when its grade calculation finishes
+    __tablename__ = "t_tenet_assessment_result_snapshot"
+    __table_args__ = (
+        Index(
+            "ux_t_tenet_assessment_result_snapshot_assessment",
+            "assessment_id",
+            unique=True,
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    assessment_id = Column(UUID, ForeignKey("t_tenet_assessment.id"), nullable=False)
+    grade_calculation_task_id = Column(
+        UUID, ForeignKey("t_tenet_assessment_grade_calculation_status.id")
+    )
+    # version of the document format, older versions are not served
+    version = Column(Integer, nullable=False)
+    result = Column(JSONB, nullable=False)
+    created_on = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    modified_on = Column(DateTime)
+
+    def as_dict(self):
+        _json = {}
+        for c in self.__table__.columns:
+            _column_name = c.name
+            _value = getattr(self, _column_name)
+            if type(_value) in [type(None)] or isinstance(_value, bool):
+                pass
+            elif isinstance(_value, enum.Enum):
+                _value = _value.value
+            elif isinstance(_value, (dict, list)):
+                pass
+            else:
+                _value = str(_value)
+            _json[_column_name] = _value
+        return _json
@@ -30,6 +30,3 @@ class Role(Base):
                 _value = str(_value)
             _json[_column_name] = _value
         return _json
-
-
-Base.metadata.create_all(engine)
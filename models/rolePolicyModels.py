@@ -82,6 +82,3 @@ class RolePolicy(Base):
                 _value = str(_value)
             _json[_column_name] = _value
         return _json
-
-
-Base.metadata.create_all(engine)
@@ -7,6 +7,9 @@ from models.userModels import *
 
 class UserRole(Base):
     __tablename__ = "t_tenet_user_role_mapper"
+    __table_args__ = (
+        Index("ix_t_tenet_user_role_mapper_user", "user_id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     role_id = Column(UUID, ForeignKey("t_tenet_role.id"), nullable=False)
@@ -30,6 +33,3 @@ class UserRole(Base):
                 _value = str(_value)
             _json[_column_name] = _value
         return _json
-
-
-Base.metadata.create_all(engine)
@@ -0,0 +1,74 @@
+"""
+Shared fixtures of the test suite.
+The database tests run against an empty Postgres database whose name ends
+with "test", given with the usual PG_* settings, e.g.
+    PG_USER=postgres PG_PASSWORD= PG_HOST=localhost PG_PORT=5432 PG_DB=tenet_test python -m pytest
+The tables are created by the bootstrap command and the migrations, and are
+truncated after every test. Without such a database the database tests are skipped.
+"""
+import os
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, text
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+def _isTestDatabase():
+    return (os.getenv("PG_DB") or "").endswith("test")
+
+
+@pytest.fixture(scope="session")
+def database():
+    """
+    Engine of the test database with the tables of the models and the migrations
+    """
+    if not _isTestDatabase():
+        pytest.skip("PG_DB is not a test database (name ending with test)")
+    from alembic import command
+    from alembic.config import Config
+
+    import models.database.bootstrap
+    from models.commonImports import Base
+    from models.database.dbConnection import database as connection, get_engine
+
+    connection.bootstrap(Base.metadata)
+    alembic_config = Config(str(ROOT_DIR / "alembic.ini"))
+    alembic_config.set_main_option("script_location", str(ROOT_DIR / "migrations"))
+    command.upgrade(alembic_config, "head")
+    return get_engine()
+
+
+@pytest.fixture
+def db(database):
+    """
+    Shared session of the services, every table is emptied after the test
+    """
+    from common.decorator import invalidatePolicyCache
+    from models.commonImports import Base
+    from models.database.dbConnection import session
+
+    yield session
+    session.rollback()
+    session.remove()
+    invalidatePolicyCache()
+    tables = ", ".join(f'"{table.name}"' for table in Base.metadata.sorted_tables)
+    with database.begin() as connection:
+        connection.execute(text(f"TRUNCATE {tables} CASCADE"))
+
+
+@pytest.fixture
+def statements(database):
+    """
+    SQL statements sent to the database while the test runs, call clear()
+    before the part of the test whose queries are counted
+    """
+    executed_statements = []
+
+    def _record(connection, cursor, statement, parameters, context, executemany):
+        executed_statements.append(statement)
+
+    event.listen(database, "before_cursor_execute", _record)
+    yield executed_statements
+    event.remove(database, "before_cursor_execute", _record)
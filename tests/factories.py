@@ -0,0 +1,275 @@
+"""
+Rows of the test database, inserted through the shared session.
+Every function returns the string id(s) of what it created.
+"""
+import random
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import insert
+
+from models.accountModels import Account as AccountModel
+from models.assessmentModels import Assessment as AssessmentModel
+from models.assessmentModels import GradeCalculationTask as GradeCalculationTaskModel
+from models.assessmentModels import Response as ResponseModel
+from models.checklistModels import Activity as ActivityModel
+from models.checklistModels import Area as AreaModel
+from models.checklistModels import Checklist as ChecklistModel
+from models.checklistModels import Item as ItemModel
+from models.checklistModels import Subarea as SubareaModel
+from models.database.dbConnection import session
+from models.projectModels import Project as ProjectModel
+from models.projectUserModels import ProjectUser as ProjectUserModel
+from models.roleModels import Role as RoleModel
+from models.userModels import User as UserModel
+from models.userRoleModels import UserRole as UserRoleModel
+
+IMPORTANCES = ["MIMH", "MH", "GH"]
+
+
+def _newId():
+    return str(uuid.uuid4())
+
+
+def createUser(name="Test User", status="Verified", created_by=None, ps_no=None):
+    user_id = _newId()
+    session.execute(
+        insert(UserModel).values(
+            id=user_id,
+            name=name,
+            username=name.lower().replace(" ", "."),
+            status=status,
+            created_by=created_by or user_id,
+            ps_no=ps_no if ps_no is not None else random.randint(1, 10**9),
+        )
+    )
+    session.commit()
+    return user_id
+
+
+def createRole(name, created_by):
+    role_id = _newId()
+    session.execute(
+        insert(RoleModel).values(id=role_id, name=name, created_by=created_by)
+    )
+    session.commit()
+    return role_id
+
+
+def addUserRole(user_id, role_id, created_by):
+    session.execute(
+        insert(UserRoleModel).values(
+            id=_newId(), user_id=user_id, role_id=role_id, created_by=created_by
+        )
+    )
+    session.commit()
+
+
+def createProject(created_by, name=None, audit_frequency="Monthly"):
+    account_id = _newId()
+    session.execute(
+        insert(AccountModel).values(
+            id=account_id, name=f"Account {account_id}", created_by=created_by
+        )
+    )
+    project_id = _newId()
+    session.execute(
+        insert(ProjectModel).values(
+            id=project_id,
+            name=name or f"Project {project_id}",
+            details="Project details",
+            audit_frequency=audit_frequency,
+            trello_link="https://trello.com/b/test",
+            start_date=date(2024, 1, 1),
+            account_id=account_id,
+            is_active=True,
+            created_by=created_by,
+        )
+    )
+    session.commit()
+    return project_id
+
+
+def addProjectUser(project_id, user_id, created_by):
+    session.execute(
+        insert(ProjectUserModel).values(
+            id=_newId(),
+            project_id=project_id,
+            user_id=user_id,
+            created_by=created_by,
+            created_on=datetime(2024, 1, 1),
+        )
+    )
+    session.commit()
+
+
+def createChecklist(
+    created_by, areas=2, subareas=2, items=3, activities=4, seed=0, name=None
+):
+    """
+    Published checklist of areas x subareas x items x activities with
+    random weightages and importances
+    Output: checklist id
+    """
+    generator = random.Random(seed)
+    checklist_id = _newId()
+    session.execute(
+        insert(ChecklistModel).values(
+            id=checklist_id,
+            name=name or f"Checklist {checklist_id}",
+            is_active=True,
+            status="Published",
+            comments="Test checklist",
+            created_by=created_by,
+        )
+    )
+    rows = {"area": [], "subarea": [], "item": [], "activity": []}
+    for _ in range(areas):
+        area_id = _newId()
+        rows["area"].append(
+            {
+                "id": area_id,
+                "name": f"Area {area_id}",
+                "weightage": 100 / areas,
+                "checklist_id": checklist_id,
+                "created_by": created_by,
+            }
+        )
+        for _ in range(subareas):
+            subarea_id = _newId()
+            rows["subarea"].append(
+                {
+                    "id": subarea_id,
+                    "name": f"Subarea {subarea_id}",
+                    "weightage": 100 / subareas,
+                    "area_id": area_id,
+                    "created_by": created_by,
+                }
+            )
+            for _ in range(items):
+                item_id = _newId()
+                rows["item"].append(
+                    {
+                        "id": item_id,
+                        "name": f"Item {item_id}",
+                        "weightage": 100 / items,
+                        "effective_weightage": round(generator.uniform(0.5, 5), 2),
+                        "subarea_id": subarea_id,
+                        "created_by": created_by,
+                    }
+                )
+                for index in range(activities):
+                    rows["activity"].append(
+                        {
+                            "id": _newId(),
+                            "name": f"Activity {index}",
+                            "importance": generator.choice(IMPORTANCES),
+                            "item_id": item_id,
+                            "created_by": created_by,
+                        }
+                    )
+    for Model, key in [
+        (AreaModel, "area"),
+        (SubareaModel, "subarea"),
+        (ItemModel, "item"),
+        (ActivityModel, "activity"),
+    ]:
+        session.execute(insert(Model), rows[key])
+    session.commit()
+    return checklist_id
+
+
+def getActivityIds(checklist_id):
+    activities = (
+        session.query(ActivityModel.id)
+        .join(ItemModel, ItemModel.id == ActivityModel.item_id)
+        .join(SubareaModel, SubareaModel.id == ItemModel.subarea_id)
+        .join(AreaModel, AreaModel.id == SubareaModel.area_id)
+        .filter(AreaModel.checklist_id == checklist_id)
+        .order_by(ActivityModel.id)
+    )
+    return [str(activity.id) for activity in activities]
+
+
+def createAssessment(
+    project_id,
+    checklist_id,
+    created_by,
+    status="InProgress",
+    start_date=date(2024, 1, 1),
+    name=None,
+):
+    assessment_id = _newId()
+    session.execute(
+        insert(AssessmentModel).values(
+            id=assessment_id,
+            name=name or f"Assessment {assessment_id}",
+            project_id=project_id,
+            checklist_id=checklist_id,
+            start_date=start_date,
+            end_date=start_date,
+            status=status,
+            created_by=created_by,
+        )
+    )
+    session.commit()
+    return assessment_id
+
+
+def createResponses(assessment_id, created_by, values):
+    """
+    Input: dict {(activity_id, response type): (value, comments)}
+    """
+    session.execute(
+        insert(ResponseModel),
+        [
+            {
+                "id": _newId(),
+                "assessment_id": assessment_id,
+                "activity_id": activity_id,
+                "type": response_type,
+                "value": value,
+                "comments": comments,
+                "created_by": created_by,
+            }
+            for (activity_id, response_type), (value, comments) in values.items()
+        ],
+    )
+    session.commit()
+
+
+def randomResponses(activity_ids, seed=0, values=("Yes", "No", "NA", None)):
+    """
+    Manager and reviewer responses with random values, weighted towards Yes
+    Output: dict {(activity_id, response type): (value, comments)}
+    """
+    generator = random.Random(seed)
+    weights = [6, 2, 1, 1][: len(values)]
+    responses = {}
+    for activity_id in activity_ids:
+        for response_type in ["ManagerResponse", "ReviewerResponse"]:
+            value = generator.choices(values, weights)[0]
+            responses[(activity_id, response_type)] = (
+                value,
+                None if value is None else f"{value} comment",
+            )
+    return responses
+
+
+def createGradeCalculationTask(assessment_id):
+    # like a status transition, the new task supersedes the active one
+    session.query(GradeCalculationTaskModel).filter(
+        GradeCalculationTaskModel.assessment_id == assessment_id,
+        GradeCalculationTaskModel.active == True,
+    ).update({"active": False}, synchronize_session=False)
+    task_id = _newId()
+    session.execute(
+        insert(GradeCalculationTaskModel).values(
+            id=task_id,
+            assessment_id=assessment_id,
+            status=False,
+            active=True,
+        )
+    )
+    session.commit()
+    return task_id
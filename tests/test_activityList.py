@@ -0,0 +1,110 @@
+import uuid
+
+from sqlalchemy import insert
+
+from factories import (
+    createAssessment,
+    createChecklist,
+    createProject,
+    createResponses,
+    createUser,
+    getActivityIds,
+    randomResponses,
+)
+from microservices.activities.services.activitiesService import Activity
+from models.assessmentModels import (
+    AssessmentResponseDelta as AssessmentResponseDeltaModel,
+)
+from models.checklistModels import Activity as ActivityModel
+from models.checklistModels import Area as AreaModel
+from models.checklistModels import Item as ItemModel
+from models.checklistModels import Subarea as SubareaModel
+from models.database.dbConnection import session
+
+
+def _getItemPath(checklist_id):
+    area_id, subarea_id, item_id = (
+        session.query(AreaModel.id, SubareaModel.id, ItemModel.id)
+        .join(SubareaModel, SubareaModel.area_id == AreaModel.id)
+        .join(ItemModel, ItemModel.subarea_id == SubareaModel.id)
+        .filter(AreaModel.checklist_id == checklist_id)
+        .one()
+    )
+    return str(area_id), str(subarea_id), str(item_id)
+
+
+def _createAssessedItem(admin_id, project_id, activities):
+    """
+    Assessment of a checklist with a single item, every activity has both
+    responses and a manager delta
+    Output: list kwargs of getActivityList, responses
+    """
+    checklist_id = createChecklist(
+        admin_id, areas=1, subareas=1, items=1, activities=activities
+    )
+    assessment_id = createAssessment(project_id, checklist_id, admin_id)
+    previous_assessment_id = createAssessment(project_id, checklist_id, admin_id)
+    activity_ids = getActivityIds(checklist_id)
+    responses = randomResponses(activity_ids, values=("Yes", "No", "NA"))
+    createResponses(assessment_id, admin_id, responses)
+    session.execute(
+        insert(AssessmentResponseDeltaModel),
+        [
+            {
+                "id": uuid.uuid4(),
+                "activity_id": activity_id,
+                "assessment_id": assessment_id,
+                "previous_assessment_id": previous_assessment_id,
+                "type": "ManagerDelta",
+                "previous_value": "No",
+                "previous_comments": "Previous comment",
+                "created_by": admin_id,
+            }
+            for activity_id in activity_ids
+        ],
+    )
+    session.commit()
+    area_id, subarea_id, item_id = _getItemPath(checklist_id)
+    parameters = {
+        "project_id": project_id,
+        "assessment_id": assessment_id,
+        "area_id": area_id,
+        "subarea_id": subarea_id,
+        "item_id": item_id,
+        "authenticated_user_id": admin_id,
+        "authenticated_user_roles": ["Admin"],
+    }
+    return parameters, responses
+
+
+def _countListStatements(statements, parameters):
+    statements.clear()
+    activities = Activity().getActivityList(**parameters)
+    return activities, len(statements)
+
+
+def test_activity_list_runs_a_constant_number_of_queries(db, statements):
+    admin_id = createUser(name="Admin")
+    project_id = createProject(admin_id)
+
+    parameters, _ = _createAssessedItem(admin_id, project_id, activities=2)
+    activities, small_item_count = _countListStatements(statements, parameters)
+    assert len(activities) == 2
+
+    parameters, responses = _createAssessedItem(admin_id, project_id, activities=40)
+    activities, large_item_count = _countListStatements(statements, parameters)
+    assert len(activities) == 40
+    assert large_item_count == small_item_count
+
+    for activity in activities:
+        manager_response = activity["user_response_details"]
+        reviewer_response = activity["reviewer_response_details"]
+        assert manager_response["value"] == responses[
+            (activity["id"], "ManagerResponse")
+        ][0]
+        assert reviewer_response["value"] == responses[
+            (activity["id"], "ReviewerResponse")
+        ][0]
+        # the manager delta is shown on the reviewer response
+        assert reviewer_response["delta"]["value"] == "No"
+        assert manager_response["delta"] == {}
@@ -0,0 +1,90 @@
+from datetime import date
+
+import pytest
+
+from factories import createAssessment, createChecklist, createProject, createUser
+from microservices.assessments.services.assessmentsService import Assessment
+
+START_DATES = [
+    date(2024, 1, 1),
+    date(2024, 3, 1),
+    date(2024, 2, 1),
+    date(2024, 3, 1),
+    date(2024, 2, 1),
+    date(2024, 3, 1),
+    date(2024, 4, 1),
+]
+
+
+def _createAssessments():
+    admin_id = createUser(name="Admin")
+    checklist_id = createChecklist(admin_id, areas=1, subareas=1, items=1)
+    project_id = createProject(admin_id)
+    for start_date in START_DATES:
+        createAssessment(project_id, checklist_id, admin_id, start_date=start_date)
+    return {
+        "project_id": project_id,
+        "authenticated_user_id": admin_id,
+        "authenticated_user_roles": ["Admin"],
+        "status": None,
+        "page_size": 3,
+    }
+
+
+def _getOffsetPages(parameters, sort_key=None, sort_order=None):
+    assessments = []
+    for page_number in range(1, 4):
+        page = Assessment().getAssessmentList(
+            **parameters,
+            page_number=page_number,
+            sort_key=sort_key,
+            sort_order=sort_order,
+        )
+        assessments.extend(page["data"])
+    return assessments
+
+
+def _getKeysetPages(parameters, sort_key=None, sort_order=None):
+    assessments = []
+    after = ""
+    while after is not None:
+        page = Assessment().getAssessmentList(
+            **parameters, after=after, sort_key=sort_key, sort_order=sort_order
+        )
+        assessments.extend(page["data"])
+        after = page["nextCursor"]
+    return assessments
+
+
+def _getIds(assessments):
+    return [assessment["id"] for assessment in assessments]
+
+
+def test_both_modes_list_the_latest_assessments_first_by_default(db):
+    parameters = _createAssessments()
+    offset_assessments = _getOffsetPages(parameters)
+    keyset_assessments = _getKeysetPages(parameters)
+
+    assert len(offset_assessments) == len(START_DATES)
+    assert _getIds(keyset_assessments) == _getIds(offset_assessments)
+    # same start date -> tie-broken by id
+    assert [
+        (assessment["start_date"], assessment["id"])
+        for assessment in offset_assessments
+    ] == sorted(
+        (
+            (assessment["start_date"], assessment["id"])
+            for assessment in offset_assessments
+        ),
+        reverse=True,
+    )
+
+
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+def test_both_modes_list_the_same_order_for_a_sort_key(db, sort_order):
+    parameters = _createAssessments()
+    offset_assessments = _getOffsetPages(parameters, "start_date", sort_order)
+    keyset_assessments = _getKeysetPages(parameters, "start_date", sort_order)
+
+    assert len(offset_assessments) == len(START_DATES)
+    assert _getIds(keyset_assessments) == _getIds(offset_assessments)
@@ -0,0 +1,73 @@
+from factories import (
+    createAssessment,
+    createChecklist,
+    createProject,
+    createResponses,
+    createUser,
+    getActivityIds,
+    randomResponses,
+)
+from microservices.assessments.services.progressService import AssessmentProgress
+from models.assessmentModels import Response as ResponseModel
+from models.database.dbConnection import session
+
+
+def _createAssessment():
+    user_id = createUser(name="Admin")
+    project_id = createProject(user_id)
+    checklist_id = createChecklist(user_id, seed=7, areas=2, subareas=2, items=2)
+    assessment_id = createAssessment(project_id, checklist_id, user_id)
+    createResponses(
+        assessment_id,
+        user_id,
+        randomResponses(getActivityIds(checklist_id), seed=7),
+    )
+    return assessment_id
+
+
+def _countedSummary(assessment_id, response_type):
+    summary = {"yes": 0, "no": 0, "n/a": 0}
+    responses = session.query(ResponseModel.value).filter(
+        ResponseModel.assessment_id == assessment_id,
+        ResponseModel.type == response_type,
+    )
+    for response in responses:
+        if response.value is None:
+            summary["none"] = summary.get("none", 0) + 1
+        else:
+            key = {"Yes": "yes", "No": "no", "NA": "n/a"}[response.value.value]
+            summary[key] += 1
+    summary["total"] = sum(summary.values())
+    return summary
+
+
+def test_counters_follow_the_response_changes(db):
+    assessment_id = _createAssessment()
+    progress_object = AssessmentProgress()
+
+    # counters are built for assessments created without them
+    assert progress_object.rebuildProgress(assessment_id)
+    session.commit()
+    assert progress_object.rebuildProgress(assessment_id, repair=False) == {}
+
+    responses = session.query(ResponseModel).filter(
+        ResponseModel.assessment_id == assessment_id,
+        ResponseModel.type == "ManagerResponse",
+    )
+    changes = []
+    for response in list(responses)[:5]:
+        changes.append(
+            (str(response.activity_id), "ManagerResponse", response.value, "No")
+        )
+        response.value = "No"
+    progress_object.applyResponseChanges(assessment_id, changes)
+    session.commit()
+
+    assert progress_object.rebuildProgress(assessment_id, repair=False) == {}
+    summaries = progress_object.getProgressSummaries([assessment_id])
+    assert summaries == {
+        assessment_id: {
+            "manager": _countedSummary(assessment_id, "ManagerResponse"),
+            "reviewer": _countedSummary(assessment_id, "ReviewerResponse"),
+        }
+    }
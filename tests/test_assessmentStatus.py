@@ -0,0 +1,141 @@
+import json
+
+import pytest
+from sqlalchemy import func, select
+
+from factories import (
+    createAssessment,
+    createChecklist,
+    createProject,
+    createResponses,
+    createUser,
+    getActivityIds,
+    randomResponses,
+)
+from microservices.assessments.handlers.v1.gradeCalculationHandler import (
+    gradeCalculationHandler,
+)
+from microservices.assessments.services import assessmentsService
+from microservices.assessments.services.assessmentsService import Assessment
+from models.assessmentModels import (
+    GradeCalculationTask as GradeCalculationTaskModel,
+)
+from models.assessmentModels import Response as ResponseModel
+from models.database.dbConnection import get_engine
+
+
+class FakeAws:
+    """
+    Stand-in of the SNS and SQS clients, the queued grade calculation messages are
+    kept with the committed state of the database seen by a consumer at that time
+    """
+
+    def __init__(self):
+        self.messages = []
+
+    def publish(self, TargetArn, Message):
+        return {"MessageId": "published"}
+
+    def send_message(self, QueueUrl, MessageBody):
+        body = json.loads(MessageBody)
+        # separate connections only see what was committed
+        with get_engine().connect() as connection:
+            active_task_ids = connection.execute(
+                select(GradeCalculationTaskModel.id).where(
+                    GradeCalculationTaskModel.assessment_id == body["assessment_id"],
+                    GradeCalculationTaskModel.active == True,
+                )
+            ).scalars().all()
+        null_manager_response_count = _nullResponseCount(
+            body["assessment_id"], "ManagerResponse"
+        )
+        self.messages.append(
+            (
+                body,
+                [str(task_id) for task_id in active_task_ids],
+                null_manager_response_count,
+            )
+        )
+        return {"MessageId": f"message-{len(self.messages)}"}
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    fake_aws = FakeAws()
+    monkeypatch.setattr(
+        assessmentsService.boto3, "client", lambda service, **kwargs: fake_aws
+    )
+    return fake_aws
+
+
+@pytest.fixture
+def assessment(db):
+    user_id = createUser(name="Admin")
+    project_id = createProject(user_id)
+    checklist_id = createChecklist(user_id, seed=5, areas=2, subareas=2, items=3)
+    assessment_id = createAssessment(project_id, checklist_id, user_id)
+    createResponses(
+        assessment_id,
+        user_id,
+        randomResponses(getActivityIds(checklist_id), seed=5),
+    )
+    return {
+        "project_id": project_id,
+        "assessment_id": assessment_id,
+        "authenticated_user_id": user_id,
+    }
+
+
+def _updateStatus(assessment, status):
+    return Assessment().updateAssessmentStatus(
+        **assessment,
+        status=status,
+        authenticated_user_status="Verified",
+        authenticated_user_roles=["Admin"],
+    )
+
+
+def _nullResponseCount(assessment_id, response_type):
+    # counted on a separate connection, only what was committed
+    with get_engine().connect() as connection:
+        return connection.execute(
+            select(func.count(ResponseModel.id)).where(
+                ResponseModel.assessment_id == assessment_id,
+                ResponseModel.value == None,
+                ResponseModel.type == response_type,
+            )
+        ).scalar()
+
+
+def test_grade_calculation_is_queued_after_the_commit(assessment, aws):
+    assert _nullResponseCount(assessment["assessment_id"], "ManagerResponse") > 0
+    response = _updateStatus(assessment, "Submitted")
+
+    [(body, active_task_ids, null_manager_response_count)] = aws.messages
+    assert body["grade_calculation_task_id"] == response["calculation_task_id"]
+    assert active_task_ids == [response["calculation_task_id"]]
+    assert null_manager_response_count == 0
+
+
+def test_superseded_submission_still_defaults_the_manager_responses(
+    assessment, aws
+):
+    for status in ("Submitted", "UnderReview", "Reviewed"):
+        _updateStatus(assessment, status)
+    assert [body["status"] for body, _, _ in aws.messages] == [
+        "Submitted",
+        "Reviewed",
+    ]
+
+    # both messages in one batch, only the Reviewed calculation runs
+    response = gradeCalculationHandler(
+        {
+            "Records": [
+                {"messageId": f"m{index}", "body": json.dumps(body)}
+                for index, (body, _, _) in enumerate(aws.messages)
+            ]
+        },
+        None,
+    )
+    assert response == {"batchItemFailures": []}
+    assert _nullResponseCount(assessment["assessment_id"], "ReviewerResponse") == 0
@@ -0,0 +1,200 @@
+"""
+Authorizer against a local RSA key pair, the user pool JWKS endpoint is stood in
+by an http server on localhost (JWKS_URL).
+"""
+import importlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+CLIENT_ID = "test-client"
+
+
+def _createKey(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": kid, "alg": "RS256", "use": "sig"})
+    return private_key, jwk
+
+
+class JwksServer:
+    """
+    Serves the public keys of the key set, counts the fetches
+    """
+
+    def __init__(self):
+        self.keys = {}
+        self.fetch_count = 0
+        jwks_server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                jwks_server.fetch_count += 1
+                body = json.dumps(
+                    {"keys": [jwk for _, jwk in jwks_server.keys.values()]}
+                ).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = HTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/.well-known/jwks.json"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def addKey(self, kid):
+        self.keys[kid] = _createKey(kid)
+
+    def sign(self, kid, private_key=None, **claims):
+        now = int(time.time())
+        payload = {
+            "sub": "user-1",
+            "client_id": CLIENT_ID,
+            "cognito:groups": ["Reviewer"],
+            "iat": now,
+            "exp": now + 3600,
+        }
+        payload.update(claims)
+        if private_key is None:
+            private_key, _ = self.keys[kid]
+        return jwt.encode(
+            payload, private_key, algorithm="RS256", headers={"kid": kid}
+        )
+
+
+@pytest.fixture
+def jwks_server():
+    jwks_server = JwksServer()
+    jwks_server.addKey("key-1")
+    yield jwks_server
+    jwks_server.server.shutdown()
+
+
+class PermissionContexts:
+    """
+    Stand-in of resolvePermissionContext with the current status of each user
+    """
+
+    def __init__(self):
+        self.user_statuses = {"user-1": "Verified"}
+        self.resolved_users = []
+
+    def resolve(self, user_id, role_names):
+        self.resolved_users.append(user_id)
+        return {
+            "tenet:user_id": user_id,
+            "tenet:user_status": self.user_statuses[user_id],
+            "tenet:role_ids": ["role-1"],
+            "tenet:permissions": [f"{role_name}:Read" for role_name in role_names],
+        }
+
+
+@pytest.fixture
+def permission_contexts():
+    return PermissionContexts()
+
+
+@pytest.fixture
+def authorizer(jwks_server, permission_contexts, monkeypatch):
+    monkeypatch.setenv("JWKS_URL", jwks_server.url)
+    monkeypatch.setenv("CLIENT_ID", CLIENT_ID)
+    from microservices.authorization import authorizer
+
+    jwks_server.fetch_count = 0
+    # module state (url, key set, token cache) is built at import
+    authorizer = importlib.reload(authorizer)
+    monkeypatch.setattr(
+        authorizer, "resolvePermissionContext", permission_contexts.resolve
+    )
+    return authorizer
+
+
+def _authorize(authorizer, token):
+    event = {"headers": {"authorization": f"Bearer {token}"}}
+    return authorizer.handler(event, None)
+
+
+def test_valid_token_is_authorized_with_its_permission_context(
+    authorizer, jwks_server
+):
+    response = _authorize(authorizer, jwks_server.sign("key-1"))
+    assert response["isAuthorized"] is True
+    assert response["context"]["sub"] == "user-1"
+    assert response["context"]["tenet:user_status"] == "Verified"
+    assert response["context"]["tenet:permissions"] == ["Reviewer:Read"]
+    # the key set was fetched once, on cold start
+    assert jwks_server.fetch_count == 1
+
+
+def test_cached_token_gets_a_fresh_permission_context(
+    authorizer, jwks_server, permission_contexts, monkeypatch
+):
+    token = jwks_server.sign("key-1")
+    assert _authorize(authorizer, token)["isAuthorized"] is True
+
+    decode_count = []
+    decode = authorizer.jwt.decode
+    monkeypatch.setattr(
+        authorizer.jwt,
+        "decode",
+        lambda *args, **kwargs: decode_count.append(1) or decode(*args, **kwargs),
+    )
+    permission_contexts.user_statuses["user-1"] = "Disabled"
+    response = _authorize(authorizer, token)
+    assert response["isAuthorized"] is True
+    assert decode_count == []
+    assert response["context"]["tenet:user_status"] == "Disabled"
+    assert permission_contexts.resolved_users == ["user-1", "user-1"]
+
+
+def test_expired_token_is_not_served_from_the_cache(authorizer, jwks_server):
+    token = jwks_server.sign("key-1", exp=int(time.time()) + 1)
+    assert _authorize(authorizer, token)["isAuthorized"] is True
+    time.sleep(2)
+    assert _authorize(authorizer, token) == {"isAuthorized": False, "context": {}}
+
+
+@pytest.mark.parametrize(
+    "claims",
+    [
+        {"client_id": "other-client"},
+        {"exp": int(time.time()) - 10},
+    ],
+)
+def test_invalid_tokens_are_denied(
+    authorizer, jwks_server, permission_contexts, claims
+):
+    response = _authorize(authorizer, jwks_server.sign("key-1", **claims))
+    assert response == {"isAuthorized": False, "context": {}}
+    assert permission_contexts.resolved_users == []
+
+
+def test_token_of_another_key_pair_is_denied(authorizer, jwks_server):
+    # kid of the user pool, signed with a key pair it does not serve
+    other_private_key, _ = _createKey("key-1")
+    forged_token = jwks_server.sign("key-1", private_key=other_private_key)
+    assert _authorize(authorizer, forged_token)["isAuthorized"] is False
+
+
+def test_rotated_key_refetches_the_key_set_once_per_interval(
+    authorizer, jwks_server, monkeypatch
+):
+    jwks_server.addKey("key-2")
+    monkeypatch.setattr(authorizer, "_signing_keys_fetched_at", 0)
+    assert _authorize(authorizer, jwks_server.sign("key-2"))["isAuthorized"] is True
+    assert jwks_server.fetch_count == 2
+
+    # unknown key ids within the interval do not hit the endpoint again
+    jwks_server.addKey("key-3")
+    assert _authorize(authorizer, jwks_server.sign("key-3"))["isAuthorized"] is False
+    assert jwks_server.fetch_count == 2
@@ -0,0 +1,117 @@
+import csv
+from pathlib import Path
+
+import pytest
+
+from factories import createUser
+from common.customExceptions import AnyExceptionHandler
+from microservices.checklists.services.checklistsService import Checklist
+from models.checklistModels import Activity as ActivityModel
+from models.checklistModels import Area as AreaModel
+from models.checklistModels import Checklist as ChecklistModel
+from models.checklistModels import Item as ItemModel
+from models.checklistModels import Subarea as SubareaModel
+from models.database.dbConnection import session
+
+REFERENCE_SHEET = Path(__file__).resolve().parent.parent / "models" / "Version1.xlsx"
+CSV_HEADER = [
+    "Area",
+    "Area Weightage",
+    "Sub-Areas",
+    "Subarea Weightage",
+    "Item",
+    "Item Weightage",
+    "Activity",
+    "Importance of priority",
+]
+
+
+def _importChecklist(user_id, file_path, name, **kwargs):
+    return Checklist().importChecklist(
+        file_path=str(file_path),
+        name=name,
+        authenticated_user_id=user_id,
+        authenticated_user_roles=["Admin"],
+        **kwargs,
+    )
+
+
+def _storedCounts():
+    return [
+        session.query(Model).count()
+        for Model in (ChecklistModel, AreaModel, SubareaModel, ItemModel, ActivityModel)
+    ]
+
+
+def _writeCsv(path, rows):
+    with open(path, "w", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(CSV_HEADER)
+        writer.writerows(rows)
+    return path
+
+
+def test_reference_sheet_is_imported(db):
+    user_id = createUser(name="Admin")
+    checklist = _importChecklist(
+        user_id,
+        REFERENCE_SHEET,
+        "Version 1",
+        sheet_name="with Importance of priority",
+    )
+    assert (
+        checklist["area_count"],
+        checklist["subarea_count"],
+        checklist["item_count"],
+        checklist["activity_count"],
+    ) == (5, 11, 62, 643)
+    assert _storedCounts() == [1, 5, 11, 62, 643]
+
+    # every activity hangs under an item, subarea and area of the checklist
+    linked_activity_count = (
+        session.query(ActivityModel)
+        .join(ItemModel, ItemModel.id == ActivityModel.item_id)
+        .join(SubareaModel, SubareaModel.id == ItemModel.subarea_id)
+        .join(AreaModel, AreaModel.id == SubareaModel.area_id)
+        .filter(AreaModel.checklist_id == checklist["id"])
+        .count()
+    )
+    assert linked_activity_count == 643
+    assert (
+        session.query(ItemModel)
+        .filter(ItemModel.effective_weightage.is_(None))
+        .count()
+        == 0
+    )
+
+
+def test_checklist_with_existing_names_is_not_imported(db):
+    user_id = createUser(name="Admin")
+    _importChecklist(
+        user_id,
+        REFERENCE_SHEET,
+        "Version 1",
+        sheet_name="with Importance of priority",
+    )
+    with pytest.raises(AnyExceptionHandler):
+        _importChecklist(
+            user_id,
+            REFERENCE_SHEET,
+            "Version 2",
+            sheet_name="with Importance of priority",
+        )
+    assert _storedCounts() == [1, 5, 11, 62, 643]
+
+
+def test_invalid_sheet_writes_nothing(db, tmp_path):
+    user_id = createUser(name="Admin")
+    file_path = _writeCsv(
+        tmp_path / "checklist.csv",
+        [
+            ["Security", 60, "Access", 100, "Login", 100, "Use MFA", "MH"],
+            ["Quality", 60, "Testing", 100, "Coverage", 100, "Add tests", "GH"],
+        ],
+    )
+    with pytest.raises(AnyExceptionHandler, match="add up to 120.0"):
+        _importChecklist(user_id, file_path, "Invalid")
+    assert _storedCounts() == [0, 0, 0, 0, 0]
@@ -0,0 +1,22 @@
+import uuid
+
+from factories import createChecklist, createUser, getActivityIds
+from common.checklistSnapshot import getChecklistSnapshot
+
+
+def test_upper_case_and_uuid_ids_find_the_same_nodes(db):
+    user_id = createUser(name="Admin")
+    checklist_id = createChecklist(user_id, seed=3, areas=1, subareas=1, items=2)
+    snapshot = getChecklistSnapshot(checklist_id.upper())
+    assert snapshot is not None
+
+    activity_id = getActivityIds(checklist_id)[0]
+    item_id = snapshot.getAncestorId(activity_id, "item")
+    for node_id in (activity_id, activity_id.upper(), uuid.UUID(activity_id)):
+        assert snapshot.getNode("activity", node_id).id == activity_id
+        assert snapshot.getAncestorId(node_id, "item") == item_id
+    for node_id in (item_id, item_id.upper(), uuid.UUID(item_id)):
+        assert [activity.id for activity in snapshot.getChildren(node_id)] == [
+            activity.id for activity in snapshot.getActivitiesByItem()[item_id]
+        ]
+        assert len(snapshot.getChildren(node_id)) == 4
@@ -0,0 +1,36 @@
+import pytest
+
+from factories import createUser
+from models.database.dbConnection import release_session, session
+from models.userModels import User as UserModel
+
+
+def _renameUser(user_id, name, fail=False):
+    @release_session
+    def handler(event, context):
+        # an uncommitted change, like a service which raised before its commit
+        session.query(UserModel).get(event["user_id"]).name = event["name"]
+        session.flush()
+        if fail:
+            raise Exception("Service failed")
+        return session
+
+    return handler({"user_id": user_id, "name": name}, None)
+
+
+def test_the_session_of_an_invocation_is_removed(db):
+    user_id = createUser(name="Before")
+    invocation_session = _renameUser(user_id, "After")
+
+    # the next invocation gets a new session without the uncommitted change
+    assert not session.registry.has()
+    assert session() is not invocation_session
+    assert session.query(UserModel).get(user_id).name == "Before"
+
+
+def test_the_session_is_removed_when_the_handler_raises(db):
+    user_id = createUser(name="Before")
+    with pytest.raises(Exception, match="Service failed"):
+        _renameUser(user_id, "After", fail=True)
+    assert not session.registry.has()
+    assert session.query(UserModel).get(user_id).name == "Before"
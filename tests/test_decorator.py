@@ -0,0 +1,113 @@
+import uuid
+
+import pytest
+from sqlalchemy import insert
+
+from common import decorator
+from common.customExceptions import AnyExceptionHandler
+from factories import createRole, createUser
+from models.accessControlModels import (
+    FunctionDescription as FunctionDescriptionModel,
+)
+from models.database.dbConnection import session
+from models.rolePolicyModels import RolePolicy as RolePolicyModel
+
+
+def _addFunctionDescription(name, resource, action):
+    session.execute(
+        insert(FunctionDescriptionModel).values(
+            id=str(uuid.uuid4()), name=name, resource=resource, action=action
+        )
+    )
+    session.commit()
+
+
+def _expirePolicyCache():
+    # another container changed the tables, this one only sees it after the ttl
+    decorator._policy_cache["expires_at"] = 0
+
+
+def test_new_function_descriptions_reload_the_policy_cache(db):
+    user_id = createUser(name="Admin")
+    createRole("Reviewer", user_id)
+    _addFunctionDescription("getProjectList", "Project", "Read")
+    assert "getProjectList" in decorator._getPolicyCache()["functions"]
+
+    _addFunctionDescription("importChecklist", "Checklist", "Create")
+    _expirePolicyCache()
+    assert decorator._getPolicyCache()["functions"]["importChecklist"] == (
+        "Checklist",
+        "Create",
+    )
+
+
+def test_changed_function_descriptions_reload_the_policy_cache(db):
+    _addFunctionDescription("getProjectList", "Project", "Read")
+    decorator._getPolicyCache()
+
+    session.query(FunctionDescriptionModel).filter(
+        FunctionDescriptionModel.name == "getProjectList"
+    ).update({"action": "Write"})
+    session.commit()
+    _expirePolicyCache()
+    assert decorator._getPolicyCache()["functions"]["getProjectList"] == (
+        "Project",
+        "Write",
+    )
+
+
+class Service:
+    @decorator.decor
+    def getProjectList(self, **kwargs):
+        return "listed"
+
+
+def _addRolePolicy(role_id, resource, action, created_by):
+    session.execute(
+        insert(RolePolicyModel).values(
+            id=str(uuid.uuid4()),
+            ptype="p",
+            role_id=role_id,
+            resource=resource,
+            action=action,
+            created_by=created_by,
+        )
+    )
+    session.commit()
+
+
+def _callService(**kwargs):
+    try:
+        return Service().getProjectList(**kwargs)
+    except AnyExceptionHandler as ex:
+        return str(ex)
+
+
+@pytest.mark.parametrize(
+    "roles",
+    [
+        ["Reviewer"],
+        ["Manager"],
+        ["Reviewer", "Manager"],
+        ["Manager", "Reviewer"],
+        ["Unknown", "Reviewer"],
+        [None, "Reviewer"],
+        [None],
+        ["Manager", "Admin"],
+    ],
+)
+def test_authorizer_permissions_decide_like_the_database_checks(db, roles):
+    user_id = createUser(name="Reviewer")
+    reviewer_id = createRole("Reviewer", user_id)
+    createRole("Manager", user_id)
+    _addRolePolicy(reviewer_id, "Project", "Read", user_id)
+    _addFunctionDescription("getProjectList", "Project", "Read")
+
+    context = decorator.resolvePermissionContext(user_id, roles)
+    trusted_kwargs = decorator.getPermissionContext(
+        {"requestContext": {"authorizer": {"lambda": context}}}
+    )
+    assert trusted_kwargs["authenticated_user_permissions"] is not None
+    assert _callService(
+        authenticated_user_roles=roles, **trusted_kwargs
+    ) == _callService(authenticated_user_roles=roles)
@@ -0,0 +1,117 @@
+import json
+
+import pytest
+from botocore.exceptions import ClientError
+
+from microservices.email.handlers.v1.createHandler import createHandler
+from microservices.email.services import emailService
+
+
+class FakeSes:
+    """
+    Local stand-in of the SES client, an email to a rejected address is refused
+    as a whole like SES does, error_code fails every email with that code
+    """
+
+    def __init__(self, rejected_addresses=(), error_code=None):
+        self.rejected_addresses = set(rejected_addresses)
+        self.error_code = error_code
+        self.calls = []
+
+    def send_email(self, Destination, Message, Source):
+        addresses = Destination.get("ToAddresses", []) + Destination.get(
+            "BccAddresses", []
+        )
+        self.calls.append(addresses)
+        if self.error_code is not None:
+            raise ClientError(
+                {"Error": {"Code": self.error_code, "Message": "Failed"}},
+                "SendEmail",
+            )
+        if self.rejected_addresses & set(addresses):
+            raise ClientError(
+                {"Error": {"Code": "MessageRejected", "Message": "Not verified"}},
+                "SendEmail",
+            )
+        return {"MessageId": f"message-{len(self.calls)}"}
+
+
+@pytest.fixture
+def ses(monkeypatch):
+    def _install(**kwargs):
+        fake_ses = FakeSes(**kwargs)
+        monkeypatch.setattr(emailService, "_ses_client", fake_ses)
+        monkeypatch.setattr(
+            emailService,
+            "_getUsernames",
+            lambda user_ids: {
+                user_id: f"{user_id}@example.com"
+                for user_id in user_ids
+                if user_id != "unknown"
+            },
+        )
+        return fake_ses
+
+    return _install
+
+
+def _records(user_ids, message="Assessment reviewed"):
+    return [
+        {
+            "messageId": f"m{index}",
+            "body": json.dumps(
+                {"user_id": user_id, "message": message, "description": "Details"}
+            ),
+        }
+        for index, user_id in enumerate(user_ids)
+    ]
+
+
+def _failedMessageIds(response):
+    return sorted(
+        failure["itemIdentifier"] for failure in response["batchItemFailures"]
+    )
+
+
+def test_records_are_sent_as_grouped_bcc_emails(ses):
+    fake_ses = ses()
+    records = _records([f"user-{index}" for index in range(60)])
+    records += _records(["user-0"], message="Assessment created")
+    response = createHandler({"Records": records}, None)
+    assert [len(addresses) for addresses in fake_ses.calls] == [50, 10, 1]
+    assert _failedMessageIds(response) == []
+
+
+def test_a_rejected_address_only_fails_its_records(ses):
+    fake_ses = ses(rejected_addresses={"user-7@example.com"})
+    user_ids = [f"user-{index}" for index in range(60)]
+    response = createHandler({"Records": _records(user_ids)}, None)
+
+    # the first chunk is refused and sent again one recipient at a time
+    assert [len(addresses) for addresses in fake_ses.calls] == [50] + [1] * 50 + [10]
+    assert _failedMessageIds(response) == ["m7"]
+
+
+def test_a_rejected_address_in_the_second_chunk(ses):
+    fake_ses = ses(rejected_addresses={"user-55@example.com"})
+    user_ids = [f"user-{index}" for index in range(60)] + ["user-55"]
+    response = createHandler({"Records": _records(user_ids)}, None)
+    assert [len(addresses) for addresses in fake_ses.calls] == [50, 10] + [1] * 10
+    # the user is sent to once, both of its records are redelivered
+    assert _failedMessageIds(response) == ["m55", "m60"]
+
+
+def test_other_ses_errors_fail_the_chunk_without_single_sends(ses):
+    fake_ses = ses(error_code="Throttling")
+    user_ids = [f"user-{index}" for index in range(3)]
+    response = createHandler({"Records": _records(user_ids)}, None)
+    assert len(fake_ses.calls) == 1
+    assert _failedMessageIds(response) == ["m0", "m1", "m2"]
+
+
+def test_invalid_messages_and_unknown_users_are_not_redelivered(ses):
+    fake_ses = ses()
+    records = [{"messageId": "bad", "body": "{}"}] + _records(["unknown", "user-1"])
+    response = createHandler({"Records": records}, None)
+    assert fake_ses.calls == [["user-1@example.com"]]
+    assert _failedMessageIds(response) == []
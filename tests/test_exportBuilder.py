@@ -0,0 +1,133 @@
+import base64
+import csv
+import io
+import json
+import os
+
+import pytest
+from openpyxl import load_workbook
+
+from common import exportBuilder
+from common.exportBuilder import ExportBuilder
+
+HEADERS = ["Name", "Email", "Roles"]
+
+
+class FakeS3:
+    """
+    Local stand-in of the S3 client, uploads are kept in memory
+    """
+
+    def __init__(self):
+        self.uploads = {}
+
+    def upload_file(self, file_path, bucket, key, ExtraArgs=None):
+        with open(file_path, "rb") as upload_file:
+            self.uploads[(bucket, key)] = (upload_file.read(), ExtraArgs)
+
+    def generate_presigned_url(self, client_method, Params=None, ExpiresIn=None):
+        return (
+            f"https://{Params['Bucket']}.s3.amazonaws.com/{Params['Key']}"
+            f"?expires={ExpiresIn}&disposition={Params['ResponseContentDisposition']}"
+        )
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    fake_s3 = FakeS3()
+    monkeypatch.setattr(exportBuilder.boto3, "client", lambda service: fake_s3)
+    monkeypatch.setenv("EXPORT_BUCKET_NAME", "tenet-exports")
+    return fake_s3
+
+
+def _rows(count):
+    # generator, the builder must not need the rows in memory
+    for index in range(count):
+        yield (
+            f"User {index}",
+            f"user{index}@example.com",
+            None if index % 2 else "Admin",
+        )
+
+
+def _readXlsx(content):
+    worksheet = load_workbook(io.BytesIO(content)).worksheets[0]
+    return [list(row) for row in worksheet.iter_rows(values_only=True)]
+
+
+def test_small_xlsx_export_is_returned_inline(s3):
+    response = ExportBuilder("users", HEADERS, sheet_title="Users").buildResponse(
+        _rows(3)
+    )
+    assert response["statusCode"] == 200
+    assert response["isBase64Encoded"] is True
+    assert response["headers"] == {
+        "Content-Type": exportBuilder.EXPORT_CONTENT_TYPES["xlsx"],
+        "Content-Disposition": "attachment; filename=users.xlsx",
+    }
+    assert _readXlsx(base64.b64decode(response["body"])) == [HEADERS] + [
+        list(row) for row in _rows(3)
+    ]
+    assert s3.uploads == {}
+
+
+def test_small_csv_export_is_returned_inline(s3):
+    response = ExportBuilder("users", HEADERS, file_format="csv").buildResponse(
+        _rows(3)
+    )
+    assert response["statusCode"] == 200
+    content = base64.b64decode(response["body"]).decode("utf-8")
+    assert list(csv.reader(io.StringIO(content))) == [HEADERS] + [
+        ["" if value is None else value for value in row] for row in _rows(3)
+    ]
+
+
+@pytest.mark.parametrize("file_format", ["xlsx", "csv"])
+def test_big_export_is_uploaded_behind_a_presigned_url(s3, monkeypatch, file_format):
+    monkeypatch.setattr(exportBuilder, "INLINE_EXPORT_MAX_BYTES", 1024)
+    response = ExportBuilder("users", HEADERS, file_format=file_format).buildResponse(
+        _rows(2000)
+    )
+    assert response["statusCode"] == 303
+    url = json.loads(response["body"])["data"]["url"]
+    assert response["headers"]["Location"] == url
+    assert "disposition=attachment; filename=users." + file_format in url
+
+    [((bucket, key), (content, extra_args))] = s3.uploads.items()
+    assert bucket == "tenet-exports"
+    assert key.startswith("exports/") and key.endswith(f"/users.{file_format}")
+    assert extra_args == {
+        "ContentType": exportBuilder.EXPORT_CONTENT_TYPES[file_format]
+    }
+    if file_format == "xlsx":
+        rows = _readXlsx(content)
+    else:
+        rows = list(csv.reader(io.StringIO(content.decode("utf-8"))))
+    assert len(rows) == 2001
+    assert rows[0] == HEADERS
+
+
+def test_export_file_is_removed_from_tmp(s3, monkeypatch, tmp_path):
+    monkeypatch.setattr(exportBuilder.tempfile, "tempdir", str(tmp_path))
+    ExportBuilder("users", HEADERS).buildResponse(_rows(3))
+    assert os.listdir(tmp_path) == []
+
+
+def test_big_export_needs_the_export_bucket(s3, monkeypatch):
+    monkeypatch.setattr(exportBuilder, "INLINE_EXPORT_MAX_BYTES", 10)
+    monkeypatch.delenv("EXPORT_BUCKET_NAME")
+    with pytest.raises(Exception, match="Export bucket not configured"):
+        ExportBuilder("users", HEADERS, file_format="csv").buildResponse(_rows(3))
+
+
+def test_column_width_is_set_beyond_column_z(s3):
+    headers = [f"Column {index}" for index in range(30)]
+    response = ExportBuilder("wide", headers, column_width=25).buildResponse(
+        [tuple(range(30))]
+    )
+    worksheet = load_workbook(
+        io.BytesIO(base64.b64decode(response["body"]))
+    ).worksheets[0]
+    assert worksheet["AD1"].value == "Column 29"
+    for column_letter in ("A", "Z", "AA", "AD"):
+        assert worksheet.column_dimensions[column_letter].width == 25
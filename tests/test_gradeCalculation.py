@@ -0,0 +1,249 @@
+"""
+Parity of the bulk grade calculation with the per activity calculation it
+replaced, the reference below is the old gradeCalculator loop query by query.
+"""
+import pytest
+
+from factories import (
+    createAssessment,
+    createChecklist,
+    createGradeCalculationTask,
+    createProject,
+    createResponses,
+    createUser,
+    getActivityIds,
+    randomResponses,
+)
+from microservices.assessments.services.assessmentsService import Assessment
+from models.assessmentModels import Assessment as AssessmentModel
+from models.assessmentModels import Response as ResponseModel
+from models.checklistModels import Activity as ActivityModel
+from models.checklistModels import Area as AreaModel
+from models.checklistModels import Item as ItemModel
+from models.checklistModels import Subarea as SubareaModel
+from models.database.dbConnection import session
+from models.resultModels import AssessmentItemScore as AssessmentItemScoreModel
+from models.resultModels import AssessmentSubareaScore as AssessmentSubareaScoreModel
+
+
+def _legacyItemScores(assessment_id, checklist_id, response_type):
+    areas = session.query(AreaModel.id).filter(AreaModel.checklist_id == checklist_id)
+    subareas = session.query(SubareaModel.id).filter(SubareaModel.area_id.in_(areas))
+    items = session.query(ItemModel).filter(ItemModel.subarea_id.in_(subareas))
+    item_scores = {}
+    for item in items:
+        activities = session.query(ActivityModel).filter(
+            ActivityModel.item_id == str(item.id)
+        )
+        is_mimh = is_mh = is_gh = False
+        na_count = no_count = 0
+        for activity in activities:
+            response = (
+                session.query(ResponseModel)
+                .filter(
+                    ResponseModel.activity_id == str(activity.id),
+                    ResponseModel.type == response_type,
+                    ResponseModel.assessment_id == assessment_id,
+                )
+                .first()
+            )
+            if response.value.name == "No":
+                no_count += 1
+                if activity.importance.name == "MIMH":
+                    is_mimh = True
+                elif activity.importance.name == "MH":
+                    is_mh = True
+                elif activity.importance.name == "GH":
+                    is_gh = True
+            if response.value.name == "NA":
+                na_count += 1
+
+        if na_count == activities.count():
+            grade = "NA"
+        elif no_count == activities.count():
+            grade = "D"
+        elif no_count + na_count == activities.count():
+            grade = "D"
+        elif is_mimh:
+            grade = "D"
+        elif is_mh:
+            grade = "C"
+        elif is_gh:
+            grade = "B"
+        else:
+            grade = "A"
+        effective_weightage = item.effective_weightage
+        score = {
+            "A": effective_weightage,
+            "B": effective_weightage / 2,
+            "C": effective_weightage / 4,
+            "D": 0,
+            "NA": None,
+        }.get(grade)
+        item_scores[str(item.id)] = (grade, score, effective_weightage, item.subarea_id)
+    return item_scores
+
+
+def _legacyResults(assessment_id, item_scores):
+    subarea_item_scores = {}
+    for grade, score, effective_weightage, subarea_id in item_scores.values():
+        subarea_item_scores.setdefault(str(subarea_id), []).append(
+            (score, effective_weightage)
+        )
+    subarea_scores = {}
+    for subarea_id, values in subarea_item_scores.items():
+        numerator = denominator = float(0)
+        for score, effective_weightage in values:
+            if score is not None:
+                numerator += float(score)
+                denominator += float(effective_weightage)
+        subarea_scores[subarea_id] = (
+            None if denominator == 0 else (numerator / denominator) * 100
+        )
+    scored = [score for score in subarea_scores.values() if score is not None]
+    overall_score = round(sum(scored) / len(scored), 2) if scored else 100
+
+    techdebt_counts = {}
+    for subarea_id in subarea_scores:
+        techdebt_counts[subarea_id] = (
+            session.query(ResponseModel.id)
+            .join(ActivityModel, ActivityModel.id == ResponseModel.activity_id)
+            .join(ItemModel, ItemModel.id == ActivityModel.item_id)
+            .filter(
+                ItemModel.subarea_id == subarea_id,
+                ResponseModel.assessment_id == assessment_id,
+                ResponseModel.type == "ReviewerResponse",
+                ResponseModel.value == "No",
+            )
+            .count()
+        )
+    return subarea_scores, techdebt_counts, overall_score
+
+
+def _storedItemScores(assessment_id):
+    item_scores = session.query(AssessmentItemScoreModel).filter(
+        AssessmentItemScoreModel.assessment_id == assessment_id
+    )
+    return {
+        str(item_score.item_id): (item_score.item_grade.name, item_score.item_score)
+        for item_score in item_scores
+    }
+
+
+def _assertItemScores(assessment_id, expected_item_scores):
+    stored_item_scores = _storedItemScores(assessment_id)
+    assert set(stored_item_scores) == set(expected_item_scores)
+    for item_id, (grade, score, _, _) in expected_item_scores.items():
+        assert stored_item_scores[item_id][0] == grade
+        assert stored_item_scores[item_id][1] == pytest.approx(score, abs=0.01)
+
+
+def _expectedDefaults(responses):
+    # manager blanks become No on submission, reviewer blanks take the manager value
+    defaulted = dict(responses)
+    for (activity_id, response_type), (value, comments) in responses.items():
+        if response_type == "ManagerResponse" and value is None:
+            defaulted[(activity_id, response_type)] = ("No", comments)
+    for (activity_id, response_type), (value, comments) in responses.items():
+        if response_type == "ReviewerResponse" and value is None:
+            defaulted[(activity_id, response_type)] = (
+                defaulted[(activity_id, "ManagerResponse")][0],
+                comments,
+            )
+    return defaulted
+
+
+def _storedResponseValues(assessment_id):
+    responses = session.query(ResponseModel).filter(
+        ResponseModel.assessment_id == assessment_id
+    )
+    return {
+        (str(response.activity_id), response.type.name): response.value.name
+        for response in responses
+    }
+
+
+def _gradeAssessment(assessment_id, status):
+    task_id = createGradeCalculationTask(assessment_id)
+    Assessment().gradeCalculator(
+        assessment_id=assessment_id,
+        grade_calculation_task_id=task_id,
+        status=status,
+    )
+
+
+@pytest.mark.parametrize(
+    "seed, shape",
+    [
+        (0, dict(areas=2, subareas=2, items=3, activities=4)),
+        (1, dict(areas=3, subareas=3, items=4, activities=6)),
+        (2, dict(areas=1, subareas=4, items=5, activities=1)),
+        (3, dict(areas=2, subareas=1, items=2, activities=10)),
+    ],
+)
+def test_grades_match_the_per_activity_calculation(db, seed, shape):
+    user_id = createUser(name="Admin")
+    project_id = createProject(user_id)
+    checklist_id = createChecklist(user_id, seed=seed, **shape)
+    assessment_id = createAssessment(project_id, checklist_id, user_id)
+    responses = randomResponses(getActivityIds(checklist_id), seed=seed)
+    createResponses(assessment_id, user_id, responses)
+
+    _gradeAssessment(assessment_id, "Submitted")
+    legacy_manager_scores = _legacyItemScores(
+        assessment_id, checklist_id, "ManagerResponse"
+    )
+    _assertItemScores(assessment_id, legacy_manager_scores)
+
+    _gradeAssessment(assessment_id, "Reviewed")
+    assert _storedResponseValues(assessment_id) == {
+        key: value for key, (value, _) in _expectedDefaults(responses).items()
+    }
+    legacy_reviewer_scores = _legacyItemScores(
+        assessment_id, checklist_id, "ReviewerResponse"
+    )
+    _assertItemScores(assessment_id, legacy_reviewer_scores)
+
+    subarea_scores, techdebt_counts, overall_score = _legacyResults(
+        assessment_id, legacy_reviewer_scores
+    )
+    stored_subarea_scores = {
+        str(subarea_score.subarea_id): subarea_score
+        for subarea_score in session.query(AssessmentSubareaScoreModel).filter(
+            AssessmentSubareaScoreModel.assessment_id == assessment_id
+        )
+    }
+    assert set(stored_subarea_scores) == set(subarea_scores)
+    for subarea_id, score in subarea_scores.items():
+        stored = stored_subarea_scores[subarea_id]
+        if score is None:
+            assert stored.subarea_score is None
+        else:
+            assert stored.subarea_score == pytest.approx(score, abs=0.0001)
+        assert stored.subarea_techdebt_count == techdebt_counts[subarea_id]
+
+    assessment = session.query(AssessmentModel).get(assessment_id)
+    assert assessment.overall_score == pytest.approx(overall_score, abs=0.01)
+    assert assessment.tech_debt == sum(techdebt_counts.values())
+
+
+@pytest.mark.parametrize(
+    "values",
+    [("NA",), ("No",), ("No", "NA"), ("Yes",), ("Yes", "NA")],
+)
+def test_edge_grades_match_the_per_activity_calculation(db, values):
+    user_id = createUser(name="Admin")
+    project_id = createProject(user_id)
+    checklist_id = createChecklist(user_id, seed=7, areas=1, subareas=2, items=3)
+    assessment_id = createAssessment(project_id, checklist_id, user_id)
+    createResponses(
+        assessment_id,
+        user_id,
+        randomResponses(getActivityIds(checklist_id), seed=7, values=values),
+    )
+
+    _gradeAssessment(assessment_id, "Submitted")
+    _assertItemScores(
+        assessment_id,
+        _legacyItemScores(assessment_id, checklist_id, "ManagerResponse"),
+    )
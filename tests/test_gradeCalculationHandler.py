@@ -0,0 +1,134 @@
+import json
+from contextlib import nullcontext
+from types import SimpleNamespace
+
+import pytest
+
+from microservices.assessments.handlers.v1 import gradeCalculationHandler as handler
+
+
+class FakeAssessment:
+    """
+    Stand-in of the assessment service with the active task id per assessment,
+    the lookup fails for the assessments of failing_lookups
+    """
+
+    def __init__(self, active_tasks, failing_assessments=(), failing_lookups=()):
+        self.active_tasks = active_tasks
+        self.failing_assessments = failing_assessments
+        self.failing_lookups = failing_lookups
+        self.calculated = []
+
+    def _getActiveTask(self, assessment_id, raise_errors=False):
+        if assessment_id in self.failing_lookups:
+            if raise_errors:
+                raise Exception("Database unavailable")
+            return None
+        task_id = self.active_tasks.get(assessment_id)
+        return None if task_id is None else SimpleNamespace(id=task_id)
+
+    def gradeCalculator(self, **kwargs):
+        if kwargs["assessment_id"] in self.failing_assessments:
+            raise Exception("Grade calculation failed")
+        self.calculated.append(kwargs["grade_calculation_task_id"])
+
+
+@pytest.fixture
+def fake_assessment(monkeypatch):
+    def _install(active_tasks, failing_assessments=(), failing_lookups=()):
+        assessment = FakeAssessment(active_tasks, failing_assessments, failing_lookups)
+        monkeypatch.setattr(handler, "Assessment", lambda: assessment)
+        monkeypatch.setattr(handler, "session_scope", nullcontext)
+        return assessment
+
+    return _install
+
+
+def _record(message_id, assessment_id, task_id, status="Submitted"):
+    return {
+        "messageId": message_id,
+        "body": json.dumps(
+            {
+                "assessment_id": assessment_id,
+                "grade_calculation_task_id": task_id,
+                "status": status,
+            }
+        ),
+    }
+
+
+def _failedMessageIds(response):
+    return sorted(failure["itemIdentifier"] for failure in response["batchItemFailures"])
+
+
+def test_only_the_active_task_of_an_assessment_is_calculated(fake_assessment):
+    assessment = fake_assessment({"a1": "t2", "a2": "t3"})
+    response = handler.gradeCalculationHandler(
+        {
+            "Records": [
+                _record("m1", "a1", "t1"),
+                _record("m2", "a1", "t2", status="Reviewed"),
+                _record("m3", "a2", "t3"),
+            ]
+        },
+        None,
+    )
+    assert sorted(assessment.calculated) == ["t2", "t3"]
+    assert _failedMessageIds(response) == []
+
+
+def test_a_single_message_of_an_inactive_task_is_not_calculated(fake_assessment):
+    assessment = fake_assessment({"a1": "t2"})
+    response = handler.gradeCalculationHandler(
+        {"Records": [_record("m1", "a1", "t1")]}, None
+    )
+    assert assessment.calculated == []
+    assert _failedMessageIds(response) == []
+
+
+def test_messages_without_active_task_are_acknowledged(fake_assessment):
+    assessment = fake_assessment({"a2": "t3"})
+    response = handler.gradeCalculationHandler(
+        {
+            "Records": [
+                _record("m1", "a1", "t1"),
+                _record("m2", "a1", "t2"),
+                _record("m3", "a2", "t3"),
+            ]
+        },
+        None,
+    )
+    assert assessment.calculated == ["t3"]
+    assert _failedMessageIds(response) == []
+
+
+def test_messages_are_failed_when_the_active_task_lookup_fails(fake_assessment):
+    assessment = fake_assessment({"a1": "t2", "a2": "t3"}, failing_lookups={"a1"})
+    response = handler.gradeCalculationHandler(
+        {
+            "Records": [
+                _record("m1", "a1", "t1"),
+                _record("m2", "a1", "t2"),
+                _record("m3", "a2", "t3"),
+            ]
+        },
+        None,
+    )
+    assert assessment.calculated == ["t3"]
+    assert _failedMessageIds(response) == ["m1", "m2"]
+
+
+def test_invalid_and_failed_messages_are_reported(fake_assessment):
+    assessment = fake_assessment({"a1": "t1", "a2": "t2"}, failing_assessments={"a2"})
+    response = handler.gradeCalculationHandler(
+        {
+            "Records": [
+                {"messageId": "m0", "body": json.dumps({"assessment_id": "a1"})},
+                _record("m1", "a1", "t1"),
+                _record("m2", "a2", "t2"),
+            ]
+        },
+        None,
+    )
+    assert assessment.calculated == ["t1"]
+    assert _failedMessageIds(response) == ["m0", "m2"]
@@ -0,0 +1,105 @@
+"""
+EXPLAIN of the hot queries, each one must be answered from its index of
+migration 0001. Sequential scans are disabled in the transaction so that the
+plan shows which index the planner can use, whatever the table sizes are.
+"""
+import uuid
+
+import pytest
+from sqlalchemy import desc
+
+from models.assessmentModels import Assessment as AssessmentModel
+from models.assessmentModels import (
+    AssessmentResponseDelta as AssessmentResponseDeltaModel,
+)
+from models.assessmentModels import GradeCalculationTask as GradeCalculationTaskModel
+from models.assessmentModels import Response as ResponseModel
+from models.database.dbConnection import session
+from models.projectUserModels import ProjectUser as ProjectUserModel
+from models.resultModels import AssessmentItemScore as AssessmentItemScoreModel
+from models.resultModels import AssessmentSubareaScore as AssessmentSubareaScoreModel
+from models.rolePolicyModels import RolePolicy as RolePolicyModel
+from models.userRoleModels import UserRole as UserRoleModel
+
+ASSESSMENT_ID = str(uuid.uuid4())
+PROJECT_ID = str(uuid.uuid4())
+USER_ID = str(uuid.uuid4())
+ACTIVITY_IDS = [str(uuid.uuid4()) for _ in range(3)]
+
+HOT_QUERIES = {
+    "ux_t_tenet_response_assessment_type_activity": lambda: session.query(
+        ResponseModel.activity_id, ResponseModel.value
+    ).filter(
+        ResponseModel.assessment_id == ASSESSMENT_ID,
+        ResponseModel.type == "ReviewerResponse",
+        ResponseModel.activity_id.in_(ACTIVITY_IDS),
+    ),
+    "ix_t_tenet_assessment_response_delta_assessment_type_activity": lambda: session.query(
+        AssessmentResponseDeltaModel.activity_id
+    ).filter(
+        AssessmentResponseDeltaModel.assessment_id == ASSESSMENT_ID,
+        AssessmentResponseDeltaModel.type == "ManagerDelta",
+    ),
+    "ix_t_tenet_assessment_item_score_assessment_item": lambda: session.query(
+        AssessmentItemScoreModel.item_id, AssessmentItemScoreModel.item_grade
+    ).filter(
+        AssessmentItemScoreModel.assessment_id == ASSESSMENT_ID,
+        AssessmentItemScoreModel.item_id == ACTIVITY_IDS[0],
+    ),
+    "ux_t_tenet_assessment_subarea_score_assessment_subarea": lambda: session.query(
+        AssessmentSubareaScoreModel.subarea_id
+    ).filter(AssessmentSubareaScoreModel.assessment_id == ASSESSMENT_ID),
+    "ix_t_tenet_project_user_mapper_project_end_date": lambda: session.query(
+        ProjectUserModel.user_id
+    ).filter(
+        ProjectUserModel.project_id.in_([PROJECT_ID]),
+        ProjectUserModel.end_date == None,
+    ),
+    "ix_t_tenet_project_user_mapper_user_end_date": lambda: session.query(
+        ProjectUserModel.project_id
+    ).filter(
+        ProjectUserModel.user_id == USER_ID,
+        ProjectUserModel.end_date == None,
+    ),
+    "ix_t_tenet_user_role_mapper_user": lambda: session.query(
+        UserRoleModel.role_id
+    ).filter(UserRoleModel.user_id.in_([USER_ID])),
+    "CasbinRule_role_id_resource_action_key": lambda: session.query(
+        RolePolicyModel.id
+    ).filter(
+        RolePolicyModel.role_id == USER_ID,
+        RolePolicyModel.resource == "Project",
+        RolePolicyModel.action == "Read",
+    ),
+    "ix_t_tenet_grade_calculation_status_active_assessment": lambda: session.query(
+        GradeCalculationTaskModel.id
+    ).filter(
+        GradeCalculationTaskModel.assessment_id == ASSESSMENT_ID,
+        GradeCalculationTaskModel.active == True,
+    ),
+    "ix_t_tenet_assessment_project_status_start_date": lambda: session.query(
+        AssessmentModel.id
+    )
+    .filter(
+        AssessmentModel.project_id == PROJECT_ID,
+        AssessmentModel.status == "Reviewed",
+    )
+    .order_by(desc(AssessmentModel.start_date)),
+}
+
+
+def _explain(query):
+    connection = session.connection()
+    statement = query.statement.compile(
+        dialect=connection.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    plan = connection.exec_driver_sql(f"EXPLAIN {statement}", statement.params)
+    return "\n".join(row[0] for row in plan)
+
+
+@pytest.mark.parametrize("index_name", sorted(HOT_QUERIES))
+def test_hot_query_uses_its_index(db, index_name):
+    plan = _explain(HOT_QUERIES[index_name]())
+    assert "Seq Scan" not in plan
+    assert f'"{index_name}"' in plan or f" {index_name} " in f"{plan} ", plan
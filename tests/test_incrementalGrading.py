@@ -0,0 +1,149 @@
+"""
+The incremental grade calculation only regrades the items whose responses
+changed after the last calculation, it must store the same grades as a full one.
+"""
+import time
+
+import pytest
+
+from factories import (
+    createAssessment,
+    createChecklist,
+    createGradeCalculationTask,
+    createProject,
+    createResponses,
+    createUser,
+    getActivityIds,
+    randomResponses,
+)
+from microservices.assessmentResponses.services.assessmentResponses import (
+    AssessmentResponse,
+)
+from microservices.assessments.services.assessmentsService import Assessment
+from microservices.items.services.itemsService import Item
+from models.assessmentModels import Response as ResponseModel
+from models.checklistModels import Item as ItemModel
+from models.checklistModels import Subarea as SubareaModel
+from models.database.dbConnection import session
+from models.resultModels import AssessmentItemScore as AssessmentItemScoreModel
+
+
+@pytest.fixture(params=["UTC", "Etc/GMT+5"])
+def timezone(request, monkeypatch):
+    # Etc/GMT+5 is five hours behind UTC
+    monkeypatch.setenv("TZ", request.param)
+    time.tzset()
+    yield request.param
+    monkeypatch.undo()
+    time.tzset()
+
+
+def _gradeAssessment(assessment_id, status, full_recalculation=False):
+    task_id = createGradeCalculationTask(assessment_id)
+    Assessment().gradeCalculator(
+        assessment_id=assessment_id,
+        grade_calculation_task_id=task_id,
+        status=status,
+        full_recalculation=full_recalculation,
+    )
+
+
+def _storedItemScores(assessment_id):
+    item_scores = session.query(AssessmentItemScoreModel).filter(
+        AssessmentItemScoreModel.assessment_id == assessment_id
+    )
+    return {
+        str(item_score.item_id): (item_score.item_grade.name, item_score.item_score)
+        for item_score in item_scores
+    }
+
+
+def _answerNo(project_id, assessment_id, user_id, activity_ids):
+    responses = session.query(ResponseModel.id).filter(
+        ResponseModel.assessment_id == assessment_id,
+        ResponseModel.type == "ManagerResponse",
+        ResponseModel.activity_id.in_(activity_ids),
+    )
+    AssessmentResponse().updateAssessmentResponses(
+        project_id=project_id,
+        assessment_id=assessment_id,
+        responses=[
+            {"id": str(response.id), "value": "No", "comments": "Changed"}
+            for response in responses
+        ],
+        role="Manager",
+        authenticated_user_id=user_id,
+        authenticated_user_roles=["Admin"],
+    )
+
+
+def test_incremental_grades_match_a_full_recalculation(db, timezone):
+    user_id = createUser(name="Admin")
+    project_id = createProject(user_id)
+    checklist_id = createChecklist(user_id, seed=4, areas=2, subareas=2, items=3)
+    assessment_id = createAssessment(project_id, checklist_id, user_id)
+    activity_ids = getActivityIds(checklist_id)
+    createResponses(
+        assessment_id,
+        user_id,
+        randomResponses(activity_ids, seed=4, values=("Yes", "NA")),
+    )
+    _gradeAssessment(assessment_id, "Submitted")
+    graded_item_scores = _storedItemScores(assessment_id)
+
+    # the manager answers No to a few activities and submits again
+    _answerNo(project_id, assessment_id, user_id, activity_ids[::5])
+    _gradeAssessment(assessment_id, "Submitted")
+    incremental_item_scores = _storedItemScores(assessment_id)
+    assert incremental_item_scores != graded_item_scores
+
+    _gradeAssessment(assessment_id, "Submitted", full_recalculation=True)
+    assert incremental_item_scores == _storedItemScores(assessment_id)
+
+
+def _overrideItemGrade(project_id, assessment_id, user_id, item_id, grade):
+    item, subarea = (
+        session.query(ItemModel, SubareaModel)
+        .join(SubareaModel, SubareaModel.id == ItemModel.subarea_id)
+        .filter(ItemModel.id == item_id)
+        .first()
+    )
+    Item().updateAssessmenItemGrades(
+        project_id=project_id,
+        assessment_id=assessment_id,
+        area_id=str(subarea.area_id),
+        subarea_id=str(subarea.id),
+        item_id=item_id,
+        grade=grade,
+        authenticated_user_id=user_id,
+        authenticated_user_roles=["Admin"],
+    )
+
+
+def test_overridden_grades_are_recalculated_like_a_full_recalculation(db):
+    user_id = createUser(name="Admin")
+    project_id = createProject(user_id)
+    checklist_id = createChecklist(user_id, seed=6, areas=2, subareas=2, items=3)
+    assessment_id = createAssessment(project_id, checklist_id, user_id)
+    createResponses(
+        assessment_id,
+        user_id,
+        randomResponses(getActivityIds(checklist_id), seed=6, values=("Yes", "NA")),
+    )
+    _gradeAssessment(assessment_id, "Submitted")
+    graded_item_scores = _storedItemScores(assessment_id)
+    item_id = next(
+        item_id
+        for item_id, (grade, _) in graded_item_scores.items()
+        if grade != "D"
+    )
+
+    _overrideItemGrade(project_id, assessment_id, user_id, item_id, "D")
+    assert _storedItemScores(assessment_id)[item_id] == ("D", 0)
+    _gradeAssessment(assessment_id, "Submitted")
+    incremental_item_scores = _storedItemScores(assessment_id)
+    assert incremental_item_scores == graded_item_scores
+
+    _overrideItemGrade(project_id, assessment_id, user_id, item_id, "D")
+    _gradeAssessment(assessment_id, "Submitted", full_recalculation=True)
+    assert incremental_item_scores == _storedItemScores(assessment_id)
@@ -0,0 +1,134 @@
+import json
+
+import pytest
+
+from factories import createUser
+from microservices.notifications.services import notificationServices
+from microservices.notifications.services.notificationServices import (
+    NotificationSender,
+)
+from models.database.dbConnection import session
+from models.notificationModels import Notification as NotificationModel
+
+
+class FakeSqs:
+    """
+    Local stand-in of the SQS client, failures are given per user id as
+    {user_id: (sender fault, number of sends that fail, None for all)}
+    """
+
+    def __init__(self, failures=None, unavailable_calls=0):
+        self.failures = failures or {}
+        self.unavailable_calls = unavailable_calls
+        self.calls = []
+        self.queued = []
+
+    def send_message_batch(self, QueueUrl, Entries):
+        self.calls.append([entry["Id"] for entry in Entries])
+        if len(self.calls) <= self.unavailable_calls:
+            raise Exception("Service unavailable")
+        failed = []
+        for entry in Entries:
+            user_id = json.loads(entry["MessageBody"])["user_id"]
+            sender_fault, fail_count = self.failures.get(user_id, (False, 0))
+            if fail_count is None or fail_count > 0:
+                if fail_count is not None:
+                    self.failures[user_id] = (sender_fault, fail_count - 1)
+                failed.append(
+                    {
+                        "Id": entry["Id"],
+                        "SenderFault": sender_fault,
+                        "Code": "InvalidMessage" if sender_fault else "InternalError",
+                        "Message": "Failed",
+                    }
+                )
+            else:
+                self.queued.append(user_id)
+        return {"Failed": failed} if failed else {"Successful": []}
+
+
+@pytest.fixture
+def sqs(monkeypatch):
+    def _install(**kwargs):
+        fake_sqs = FakeSqs(**kwargs)
+        monkeypatch.setattr(
+            notificationServices.boto3, "client", lambda service: fake_sqs
+        )
+        monkeypatch.setenv("EMAIL_QUEUE_URL", "https://sqs.local/emails")
+        return fake_sqs
+
+    return _install
+
+
+def _emails(count):
+    return [
+        {"user_id": f"user-{index}", "message": "Message", "description": "Details"}
+        for index in range(count)
+    ]
+
+
+def _failedUserIds(response):
+    return sorted(failed["email"]["user_id"] for failed in response["failed_emails"])
+
+
+def test_emails_are_queued_in_batches_of_ten(sqs):
+    fake_sqs = sqs()
+    response = NotificationSender()._queueEmails(_emails(25))
+    assert [len(call) for call in fake_sqs.calls] == [10, 10, 5]
+    assert sorted(fake_sqs.queued) == sorted(email["user_id"] for email in _emails(25))
+    assert response == {
+        "notification_count": 25,
+        "queued_count": 25,
+        "failed_emails": [],
+    }
+
+
+def test_only_the_failed_entries_are_sent_again(sqs):
+    fake_sqs = sqs(failures={"user-3": (False, 1), "user-12": (False, 2)})
+    response = NotificationSender()._queueEmails(_emails(25))
+    assert [len(call) for call in fake_sqs.calls] == [10, 10, 5, 2, 1]
+    assert len(fake_sqs.queued) == 25
+    assert response["queued_count"] == 25
+    assert response["failed_emails"] == []
+
+
+def test_entries_still_failing_are_returned(sqs):
+    fake_sqs = sqs(failures={"user-4": (True, None), "user-7": (False, None)})
+    response = NotificationSender()._queueEmails(_emails(12))
+
+    # sender faults are not retried, the others up to the retry count
+    retries = notificationServices.EMAIL_QUEUE_SEND_RETRIES
+    assert [len(call) for call in fake_sqs.calls] == [10, 2] + [1] * retries
+    assert len(fake_sqs.queued) == 10
+    assert response["queued_count"] == 10
+    assert _failedUserIds(response) == ["user-4", "user-7"]
+    assert {failed["code"] for failed in response["failed_emails"]} == {
+        "InvalidMessage",
+        "InternalError",
+    }
+
+
+def test_batches_which_could_not_be_sent_are_retried(sqs):
+    fake_sqs = sqs(unavailable_calls=1)
+    response = NotificationSender()._queueEmails(_emails(15))
+    assert [len(call) for call in fake_sqs.calls] == [10, 5, 10]
+    assert response["queued_count"] == 15
+
+
+def test_notifications_are_stored_when_the_queue_is_down(db, sqs):
+    fake_sqs = sqs(unavailable_calls=100)
+    user_ids = [createUser(name=f"User {index}") for index in range(3)]
+    sender = NotificationSender()
+    notifications = [
+        sender.createNotificationPayload("assessment-created", "Details", user_id)
+        for user_id in user_ids
+    ]
+
+    response = sender.storeNotifications(notifications)
+    assert response["queued_count"] == 0
+    assert _failedUserIds(response) == sorted(user_ids)
+    assert len(fake_sqs.calls) == 1 + notificationServices.EMAIL_QUEUE_SEND_RETRIES
+    stored_user_ids = [
+        notification.user_id for notification in session.query(NotificationModel)
+    ]
+    assert sorted(stored_user_ids) == sorted(user_ids)
@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy import insert
+
+from common.paginate import Paginate
+from models.database.dbConnection import session
+from models.notificationModels import Notification as NotificationModel
+from models.notificationModels import NotificationStatus
+
+# enum members whose names differ from their values, and NULLs
+STATUSES = [
+    NotificationStatus.NEW,
+    None,
+    NotificationStatus.READ,
+    NotificationStatus.ARCHIVED,
+    None,
+    NotificationStatus.NEW,
+    None,
+]
+
+
+@pytest.fixture
+def notifications(db):
+    session.execute(
+        insert(NotificationModel),
+        [
+            {"user_id": "user", "message": f"Message {index}", "status": status}
+            for index, status in enumerate(STATUSES)
+        ],
+    )
+    session.commit()
+
+
+def _getPaginate(sort_key, sort_order, after):
+    return Paginate(
+        NotificationModel,
+        page_size=2,
+        sort_key=sort_key,
+        sort_order=sort_order,
+        after=after,
+    )
+
+
+def _getKeysetPages(sort_key, sort_order):
+    rows = []
+    after = ""
+    while after is not None:
+        paginate = _getPaginate(sort_key, sort_order, after)
+        rows.extend(paginate._getKeysetPage(session.query(NotificationModel)))
+        after = paginate._getResponseAttribute()["nextCursor"]
+    return rows
+
+
+@pytest.mark.parametrize("sort_key", ["status", "id"])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+def test_keyset_pages_list_every_row_once_in_order(
+    notifications, sort_key, sort_order
+):
+    paginate = _getPaginate(sort_key, sort_order, "")
+    ordered_rows = session.query(NotificationModel).order_by(
+        *paginate._getOrderBy()
+    )
+    expected_ids = [row.id for row in ordered_rows]
+    assert len(expected_ids) == len(STATUSES)
+    assert [row.id for row in _getKeysetPages(sort_key, sort_order)] == expected_ids
+
+
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+def test_keyset_page_after_a_null_sort_value(notifications, sort_order):
+    rows = _getKeysetPages("status", sort_order)
+    # postgres sorts NULLs last for asc and first for desc
+    null_rows = [row for row in rows if row.status is None]
+    if sort_order == "asc":
+        assert rows[-len(null_rows):] == null_rows
+    else:
+        assert rows[: len(null_rows)] == null_rows
+    assert len(null_rows) == 3
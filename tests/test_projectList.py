@@ -0,0 +1,87 @@
+from datetime import date
+
+from factories import (
+    addProjectUser,
+    addUserRole,
+    createAssessment,
+    createChecklist,
+    createProject,
+    createRole,
+    createUser,
+)
+from microservices.projects.services.projectsService import Project
+from models.assessmentModels import Assessment as AssessmentModel
+from models.database.dbConnection import session
+
+LIST_PARAMETERS = {
+    "authenticated_user_roles": ["Admin"],
+    "domain_id": None,
+    "account_id": None,
+    "active": None,
+    "audit_frequency": None,
+    "search": None,
+    "page_size": 50,
+    "page_number": 1,
+    "sort_key": None,
+    "sort_order": None,
+    "from_date": None,
+    "to_date": None,
+    "min_overall_score": None,
+    "max_overall_score": None,
+}
+
+
+def _createProjects(admin_id, checklist_id, roles, count):
+    for index in range(count):
+        project_id = createProject(admin_id)
+        for role_id in roles:
+            user_id = createUser(name=f"User {index}", created_by=admin_id)
+            addUserRole(user_id, role_id, admin_id)
+            addProjectUser(project_id, user_id, admin_id)
+        reviewed_id = createAssessment(
+            project_id,
+            checklist_id,
+            admin_id,
+            status="Reviewed",
+            start_date=date(2024, 1, 1),
+        )
+        session.query(AssessmentModel).filter(
+            AssessmentModel.id == reviewed_id
+        ).update({"overall_score": 50 + index, "tech_debt": index})
+        createAssessment(
+            project_id,
+            checklist_id,
+            admin_id,
+            status="InProgress",
+            start_date=date(2024, 2, 1),
+        )
+    session.commit()
+
+
+def _countListStatements(statements):
+    statements.clear()
+    projects, _ = Project().getProjectList(**LIST_PARAMETERS)
+    return projects, len(statements)
+
+
+def test_project_list_runs_a_constant_number_of_queries(db, statements):
+    admin_id = createUser(name="Admin")
+    checklist_id = createChecklist(admin_id, areas=1, subareas=1, items=1)
+    roles = [createRole("Project Manager", admin_id), createRole("Engineer", admin_id)]
+
+    _createProjects(admin_id, checklist_id, roles, 2)
+    projects, small_page_count = _countListStatements(statements)
+    assert len(projects) == 2
+
+    _createProjects(admin_id, checklist_id, roles, 20)
+    projects, large_page_count = _countListStatements(statements)
+    assert len(projects) == 22
+    assert large_page_count == small_page_count
+
+    for project in projects:
+        assert len(project["users"]) == 2
+        assert all(len(user["roles"]) == 1 for user in project["users"])
+        # the latest assessment is in progress, the previous scores are shown
+        assert project["assessment_status"] == "AssessmentStatus.InProgress"
+        assert project["previous_overall_score"] is not None
+        assert project["assessment_id"] is not None
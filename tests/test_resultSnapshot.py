@@ -0,0 +1,227 @@
+"""
+Results of Reviewed assessments are served from the snapshot stored by the grade
+calculation, they must match the live calculation they replaced. The reference
+below is the old getAssessmentResults loop query by query.
+"""
+import json
+from datetime import datetime
+
+import pytest
+
+from factories import (
+    createAssessment,
+    createChecklist,
+    createGradeCalculationTask,
+    createProject,
+    createResponses,
+    createUser,
+    getActivityIds,
+    randomResponses,
+)
+from microservices.assessments.services import assessmentsService
+from microservices.assessments.services.assessmentsService import Assessment
+from microservices.items.services.itemsService import Item
+from microservices.results.services.resultsService import Result
+from models.assessmentModels import Assessment as AssessmentModel
+from models.assessmentModels import Response as ResponseModel
+from models.checklistModels import Area as AreaModel
+from models.checklistModels import Item as ItemModel
+from models.checklistModels import Subarea as SubareaModel
+from models.database.dbConnection import session
+from models.resultModels import AssessmentItemScore as AssessmentItemScoreModel
+from models.resultModels import (
+    AssessmentResultSnapshot as AssessmentResultSnapshotModel,
+)
+from models.resultModels import AssessmentSubareaScore as AssessmentSubareaScoreModel
+
+
+def _legacyResults(assessment_id):
+    assessment = session.query(AssessmentModel).get(assessment_id)
+    areas = session.query(AreaModel).filter(
+        AreaModel.checklist_id == assessment.checklist_id
+    )
+    assessment_result_details = []
+    for area in areas:
+        response = {"area_id": str(area.id), "name": area.name, "subareas": []}
+        subareas = session.query(SubareaModel).filter(
+            SubareaModel.area_id == str(area.id)
+        )
+        for subarea in subareas:
+            assessment_subarea_score = (
+                session.query(AssessmentSubareaScoreModel)
+                .filter(
+                    AssessmentSubareaScoreModel.subarea_id == str(subarea.id),
+                    AssessmentSubareaScoreModel.assessment_id == assessment_id,
+                )
+                .first()
+            )
+            if assessment_subarea_score is not None:
+                response["subareas"].append(
+                    {
+                        "subarea_id": str(subarea.id),
+                        "name": subarea.name,
+                        "subarea_score": assessment_subarea_score.subarea_score,
+                        "subarea_techdebt_count": assessment_subarea_score.subarea_techdebt_count,
+                    }
+                )
+        assessment_result_details.append(response)
+    return {
+        "overall_score": assessment.overall_score,
+        "assessment_result_details": assessment_result_details,
+    }
+
+
+def _sorted(result):
+    # the old queries had no order by, compare areas and subareas by id
+    areas = []
+    for area in result["assessment_result_details"]:
+        area = dict(area)
+        area["subareas"] = sorted(
+            area["subareas"], key=lambda subarea: subarea["subarea_id"]
+        )
+        areas.append(area)
+    return {
+        "overall_score": result["overall_score"],
+        "assessment_result_details": sorted(areas, key=lambda area: area["area_id"]),
+    }
+
+
+def _createReviewedAssessment(seed):
+    user_id = createUser(name="Admin")
+    project_id = createProject(user_id)
+    checklist_id = createChecklist(
+        user_id, seed=seed, areas=3, subareas=2, items=3, activities=4
+    )
+    assessment_id = createAssessment(
+        project_id, checklist_id, user_id, status="Reviewed"
+    )
+    createResponses(
+        assessment_id,
+        user_id,
+        randomResponses(getActivityIds(checklist_id), seed=seed),
+    )
+    return project_id, assessment_id
+
+
+def _gradeAssessment(assessment_id, status):
+    task_id = createGradeCalculationTask(assessment_id)
+    Assessment().gradeCalculator(
+        assessment_id=assessment_id,
+        grade_calculation_task_id=task_id,
+        status=status,
+    )
+
+
+def _getAssessmentResults(project_id, assessment_id):
+    return Result().getAssessmentResults(
+        pathParameters={"project_id": project_id, "assessment_id": assessment_id}
+    )["body"]
+
+
+def test_snapshot_matches_the_live_results(db):
+    project_id, assessment_id = _createReviewedAssessment(seed=0)
+    _gradeAssessment(assessment_id, "Submitted")
+    assert Assessment()._getResultSnapshot(assessment_id) is None
+
+    _gradeAssessment(assessment_id, "Reviewed")
+    snapshot = Assessment()._getResultSnapshot(assessment_id)
+    assert snapshot is not None
+    assert _sorted(snapshot) == _sorted(_legacyResults(assessment_id))
+    assert _getAssessmentResults(project_id, assessment_id) == snapshot
+
+
+def test_recalculation_replaces_the_snapshot(db):
+    project_id, assessment_id = _createReviewedAssessment(seed=1)
+    _gradeAssessment(assessment_id, "Submitted")
+    _gradeAssessment(assessment_id, "Reviewed")
+
+    session.query(ResponseModel).filter(
+        ResponseModel.assessment_id == assessment_id,
+        ResponseModel.type == "ReviewerResponse",
+    ).update({"value": "No", "modified_on": datetime.utcnow()})
+    session.commit()
+    _gradeAssessment(assessment_id, "Reviewed")
+
+    assert session.query(AssessmentResultSnapshotModel).count() == 1
+    snapshot = _getAssessmentResults(project_id, assessment_id)
+    assert snapshot["overall_score"] == 0
+    assert _sorted(snapshot) == _sorted(_legacyResults(assessment_id))
+
+
+def test_results_without_a_current_snapshot_are_calculated_live(db, monkeypatch):
+    project_id, assessment_id = _createReviewedAssessment(seed=2)
+    _gradeAssessment(assessment_id, "Submitted")
+    _gradeAssessment(assessment_id, "Reviewed")
+
+    # a snapshot of an older results document is not served
+    monkeypatch.setattr(
+        assessmentsService,
+        "RESULT_SNAPSHOT_VERSION",
+        assessmentsService.RESULT_SNAPSHOT_VERSION + 1,
+    )
+    assert Assessment()._getResultSnapshot(assessment_id) is None
+    assert _sorted(_getAssessmentResults(project_id, assessment_id)) == _sorted(
+        _legacyResults(assessment_id)
+    )
+
+    session.query(AssessmentResultSnapshotModel).delete()
+    session.commit()
+    assert _sorted(_getAssessmentResults(project_id, assessment_id)) == _sorted(
+        _legacyResults(assessment_id)
+    )
+
+
+def _overrideWithItemsService(project_id, assessment_id, path, grade):
+    Item().updateAssessmenItemGrades(
+        project_id=project_id,
+        assessment_id=assessment_id,
+        **path,
+        grade=grade,
+        authenticated_user_id=None,
+        authenticated_user_roles=["Admin"],
+    )
+
+
+def _overrideWithResultsService(project_id, assessment_id, path, grade):
+    Result().updateAssessmentGrades(
+        pathParameters={
+            "project_id": project_id,
+            "assessment_id": assessment_id,
+            **path,
+        },
+        body=json.dumps({"grade": grade}),
+    )
+
+
+@pytest.mark.parametrize(
+    "override", [_overrideWithItemsService, _overrideWithResultsService]
+)
+def test_grade_override_rebuilds_the_snapshot(db, override):
+    project_id, assessment_id = _createReviewedAssessment(seed=3)
+    _gradeAssessment(assessment_id, "Submitted")
+    _gradeAssessment(assessment_id, "Reviewed")
+    snapshot = Assessment()._getResultSnapshot(assessment_id)
+
+    item_score, item, subarea = (
+        session.query(AssessmentItemScoreModel, ItemModel, SubareaModel)
+        .join(ItemModel, ItemModel.id == AssessmentItemScoreModel.item_id)
+        .join(SubareaModel, SubareaModel.id == ItemModel.subarea_id)
+        .filter(
+            AssessmentItemScoreModel.assessment_id == assessment_id,
+            AssessmentItemScoreModel.item_grade == "A",
+        )
+        .first()
+    )
+    path = {
+        "area_id": str(subarea.area_id),
+        "subarea_id": str(subarea.id),
+        "item_id": str(item.id),
+    }
+    override(project_id, assessment_id, path, "D")
+    session.expire_all()
+
+    item_score = session.query(AssessmentItemScoreModel).get(item_score.id)
+    assert (item_score.item_grade.name, item_score.item_score) == ("D", 0)
+    results = _getAssessmentResults(project_id, assessment_id)
+    assert results["overall_score"] < snapshot["overall_score"]
+    assert _sorted(results) == _sorted(_legacyResults(assessment_id))